@@ -1,58 +1,671 @@
-"""
-Data analysis routes module.
-"""
-import pandas as pd
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlmodel.ext.asyncio.session import AsyncSession as Session
-
-from app.db.postgres import get_async_session
-from app.utils.data_processing import process_dataframe
-
-router = APIRouter()
-
-
-@router.post("/upload-csv/", status_code=status.HTTP_200_OK)
-async def upload_csv_file(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_async_session),
-):
-    """
-    Upload and process CSV file.
-    
-    Args:
-        file (UploadFile): CSV file
-        db (Session): Database session
-        
-    Returns:
-        dict: Processing results
-    """
-    if not file.filename.endswith(".csv"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are allowed",
-        )
-    
-    try:
-        # Read CSV file into pandas DataFrame
-        contents = await file.read()
-        df = pd.read_csv(pd.io.common.BytesIO(contents))
-        
-        # Process DataFrame
-        processed_df = process_dataframe(df)
-        
-        # Return statistics
-        stats = {
-            "row_count": len(processed_df),
-            "column_count": len(processed_df.columns),
-            "columns": list(processed_df.columns),
-            "data_types": {col: str(processed_df[col].dtype) for col in processed_df.columns},
-            "sample_data": processed_df.head(5).to_dict(orient="records"),
-            "summary_stats": processed_df.describe().to_dict(),
-        }
-        
-        return stats
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing file: {str(e)}",
-        )
+"""
+Data analysis routes module.
+
+Services and utilities are imported on first use, so workers that never
+serve a data analysis request do not load pandas.
+"""
+import asyncio
+import itertools
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession as Session
+
+from app.core.config import settings
+from app.core.responses import ORJSONResponse, ORJSONRoute
+from app.db.postgres import async_engine, get_async_session
+from app.models.analysis import GroupBySpec
+from app.models.job import AnalysisJob
+
+if TYPE_CHECKING:
+    from app.services.analysis_jobs import AnalysisJobManager
+    from app.services.batch_analysis import BatchAnalysisService
+    from app.services.data_analysis import DataAnalysisService
+    from app.services.dataset_load import DatasetLoadService
+    from app.utils.process_pool import ProcessPool
+
+router = APIRouter(route_class=ORJSONRoute)
+
+
+@lru_cache(maxsize=None)
+def get_process_pool() -> "ProcessPool":
+    """
+    Get the worker process pool shared by all requests, creating it on first use.
+    
+    Worker processes are only started when work is submitted.
+    
+    Returns:
+        ProcessPool: Process pool sized for the larger of ``CSV_PARALLEL_WORKERS``
+            and ``CSV_BATCH_WORKERS``
+    """
+    from app.utils.process_pool import ProcessPool
+    
+    cpus = os.cpu_count() or 1
+    return ProcessPool(
+        max(settings.CSV_PARALLEL_WORKERS or cpus, settings.CSV_BATCH_WORKERS or cpus)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_data_analysis_service() -> "DataAnalysisService":
+    """
+    Get the data analysis service, creating it on first use.
+    
+    Returns:
+        DataAnalysisService: Data analysis service
+    """
+    from app.services.data_analysis import DataAnalysisService
+    
+    return DataAnalysisService(
+        chunk_size=settings.CSV_CHUNK_SIZE,
+        max_memory_hashes=settings.DEDUP_MAX_MEMORY_HASHES,
+        parallel_workers=settings.CSV_PARALLEL_WORKERS,
+        parallel_min_bytes=settings.CSV_PARALLEL_MIN_BYTES,
+        dataset_cache_bytes=settings.DATASET_CACHE_MAX_BYTES,
+        dataset_cache_ttl=settings.DATASET_CACHE_TTL_SECONDS,
+        executor=get_process_pool(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_analysis_job_manager() -> "AnalysisJobManager":
+    """
+    Get the analysis job manager, creating it on first use.
+    
+    Returns:
+        AnalysisJobManager: Analysis job manager
+    """
+    from app.services.analysis_jobs import AnalysisJobManager
+    
+    return AnalysisJobManager(
+        get_data_analysis_service(),
+        workers=settings.ANALYSIS_JOB_WORKERS,
+        queue_size=settings.ANALYSIS_JOB_QUEUE_SIZE,
+        ttl=settings.ANALYSIS_JOB_TTL_SECONDS,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_batch_analysis_service() -> "BatchAnalysisService":
+    """
+    Get the multi-file analysis service, creating it on first use.
+    
+    Returns:
+        BatchAnalysisService: Multi-file analysis service
+    """
+    from app.services.batch_analysis import BatchAnalysisService
+    
+    return BatchAnalysisService(
+        get_data_analysis_service(),
+        get_analysis_job_manager(),
+        workers=settings.CSV_BATCH_WORKERS,
+        executor=get_process_pool(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_dataset_load_service() -> "DatasetLoadService":
+    """
+    Get the PostgreSQL dataset load service, creating it on first use.
+    
+    Returns:
+        DatasetLoadService: Dataset load service
+    """
+    from app.services.dataset_load import DatasetLoadService
+    
+    return DatasetLoadService(
+        async_engine,
+        batch_size=settings.PG_COPY_BATCH_SIZE,
+        table_prefix=settings.PG_DATASET_TABLE_PREFIX,
+        reserved_tables=SQLModel.metadata.tables.keys(),
+    )
+
+
+async def shutdown() -> None:
+    """
+    Stop background services that were started.
+    """
+    if get_analysis_job_manager.cache_info().currsize:
+        await get_analysis_job_manager().stop()
+    if get_process_pool.cache_info().currsize:
+        await asyncio.to_thread(get_process_pool().shutdown, cancel_futures=True)
+
+
+def _check_input_format(file: UploadFile) -> str:
+    """
+    Detect the format of an uploaded file from its leading bytes.
+    
+    Args:
+        file (UploadFile): Uploaded file
+        
+    Returns:
+        str: Input format
+        
+    Raises:
+        HTTPException: If the file is not CSV, JSON Lines, Parquet or Arrow
+    """
+    from app.utils.input_formats import UnsupportedFormatError, detect_format
+    
+    try:
+        return detect_format(file.file)
+    except UnsupportedFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file format: {str(e)}",
+        )
+
+
+def _get_dataset(dataset_id: str):
+    """
+    Get a cached dataset.
+    
+    Args:
+        dataset_id (str): Dataset ID returned by ``upload-csv``
+        
+    Returns:
+        pd.DataFrame: Processed DataFrame
+        
+    Raises:
+        HTTPException: If the dataset is unknown, evicted or expired
+    """
+    df = get_data_analysis_service().dataset_cache.get(dataset_id)
+    if df is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found, upload the file again",
+        )
+    return df
+
+
+@router.post("/upload-csv/", status_code=status.HTTP_200_OK)
+async def upload_csv_file(
+    request: Request,
+    response: Response,
+    file: UploadFile = File(...),
+    optimize: bool = False,
+    mode: Literal["sync", "job", "sample"] = "sync",
+    sample_size: int = Query(settings.CSV_SAMPLE_SIZE, gt=0),
+    seed: Optional[int] = None,
+    cache: bool = True,
+    db: Session = Depends(get_async_session),
+):
+    """
+    Upload and process CSV file.
+    
+    CSV, JSON Lines, Parquet and Arrow IPC (Feather) files are accepted; the
+    format is detected from the file contents, not its name. In ``job`` mode
+    the file is queued for a background worker and the response only
+    contains the job ID; poll ``/jobs/{job_id}`` for progress
+    and results. In ``sample`` mode only ``sample_size`` randomly drawn rows
+    are parsed; the statistics describe the sample and the response adds the
+    sampling fraction and confidence intervals of the column means.
+    
+    In ``sync`` mode the processed dataset is kept in memory and its
+    ``dataset_id`` is returned for follow-up queries under ``/datasets``.
+    The ID is null if the dataset does not fit the cache.
+    
+    Args:
+        request (Request): Request
+        response (Response): Response
+        file (UploadFile): CSV, JSON Lines, Parquet or Arrow file
+        optimize (bool): Downcast numerics, categorize strings and parse dates
+        mode (Literal["sync", "job", "sample"]): Process in the request, as a
+            background job, or from a random sample
+        sample_size (int): Rows drawn in sample mode
+        seed (Optional[int]): Random seed for reproducible samples
+        cache (bool): Keep the processed dataset for follow-up queries in sync mode
+        db (Session): Database session
+        
+    Returns:
+        dict: Processing results, or the queued job in job mode
+    """
+    from app.services.analysis_jobs import JobQueueFullError
+    
+    _check_input_format(file)
+    
+    if mode == "job":
+        try:
+            job = await get_analysis_job_manager().submit(
+                file.file, filename=file.filename, options={"optimize": optimize}
+            )
+        except JobQueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+            )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": str(request.url_for("read_analysis_job", job_id=job.id)),
+        }
+    
+    try:
+        if mode == "sample":
+            return await asyncio.to_thread(
+                get_data_analysis_service().profile_sample,
+                file.file,
+                sample_size=sample_size,
+                seed=seed,
+            )
+        return await asyncio.to_thread(
+            get_data_analysis_service().analyze_csv, file.file, optimize=optimize, cache=cache
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing file: {str(e)}",
+        )
+
+
+@router.post("/upload-csv/batch/", status_code=status.HTTP_200_OK)
+async def upload_csv_files(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    optimize: bool = False,
+    concatenate: bool = False,
+):
+    """
+    Upload and process several input files concurrently.
+    
+    Each file is processed in its own worker process, up to the number of
+    CPUs at a time. The response has the statistics of every file and a
+    combined view: the union of the columns, the types seen per column, the
+    columns each file lacks, and summary statistics over all files. With
+    ``concatenate`` the processed rows of all files are stored as one dataset
+    that can be exported like a completed job.
+    
+    Args:
+        request (Request): Request
+        files (List[UploadFile]): CSV, JSON Lines, Parquet or Arrow files
+        optimize (bool): Downcast numerics, categorize strings and parse dates
+        concatenate (bool): Store all processed rows as one dataset
+        
+    Returns:
+        dict: Per-file results, combined statistics and the dataset job ID
+    """
+    if len(files) > settings.CSV_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CSV_BATCH_MAX_FILES} files can be uploaded at once",
+        )
+    for file in files:
+        _check_input_format(file)
+    
+    try:
+        result = await asyncio.to_thread(
+            get_batch_analysis_service().analyze_files,
+            [(file.filename, file.file) for file in files],
+            optimize=optimize,
+            concatenate=concatenate,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing files: {str(e)}",
+        )
+    if "dataset_job_id" in result:
+        job_id = result["dataset_job_id"]
+        result["dataset_export_url"] = str(
+            request.url_for("export_analysis_job", job_id=job_id)
+        )
+    return result
+
+
+@router.post("/filter/", status_code=status.HTTP_200_OK)
+async def filter_csv_file(
+    file: UploadFile = File(...),
+    expression: str = Form(...),
+    limit: int = 100,
+):
+    """
+    Upload input file and select rows matching a filter expression.
+    
+    The expression supports comparisons, ``between``, ``in`` lists,
+    ``is [not] null`` and ``and``/``or``/``not``, for example
+    ``amount >= 1000 and account in ('4000', '4100')``.
+    
+    Args:
+        file (UploadFile): CSV, JSON Lines, Parquet or Arrow file
+        expression (str): Filter expression
+        limit (int): Maximum number of matching rows to return
+        
+    Returns:
+        dict: Matching row count and rows
+    """
+    from app.utils.filter_expression import FilterExpressionError
+    
+    _check_input_format(file)
+    
+    try:
+        # Rows are rendered directly, skipping FastAPI's jsonable_encoder pass
+        return ORJSONResponse(await asyncio.to_thread(
+            get_data_analysis_service().filter_csv, file.file, expression, limit=limit
+        ))
+    except FilterExpressionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid filter expression: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing file: {str(e)}",
+        )
+
+
+@router.post("/group-by/", status_code=status.HTTP_200_OK)
+async def group_csv_file(
+    file: UploadFile = File(...),
+    spec: str = Form(...),
+):
+    """
+    Upload input file and aggregate it by several keys.
+    
+    The spec is a JSON document such as
+    ``{"keys": ["entity", "account"], "aggregations": {"amount": ["sum", "p95"]},
+    "named_aggregations": {"lines": ["amount", "count"]}}``.
+    
+    Args:
+        file (UploadFile): CSV, JSON Lines, Parquet or Arrow file
+        spec (str): Group-by specification as JSON
+        
+    Returns:
+        dict: Group count, output columns and one row per group
+    """
+    from app.utils.grouping import AggregationSpecError
+    
+    _check_input_format(file)
+    try:
+        group_by_spec = GroupBySpec.model_validate_json(spec)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid group-by spec: {str(e)}",
+        )
+    
+    try:
+        return ORJSONResponse(await asyncio.to_thread(
+            get_data_analysis_service().group_csv, file.file, group_by_spec
+        ))
+    except AggregationSpecError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid group-by spec: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing file: {str(e)}",
+        )
+
+
+@router.post("/load-postgres/", status_code=status.HTTP_201_CREATED)
+async def load_csv_into_postgres(
+    file: UploadFile = File(...),
+    table_name: str = Form(...),
+    if_exists: Literal["append", "replace", "fail"] = Form("append"),
+    optimize: bool = False,
+):
+    """
+    Upload and process input file, then bulk load it into a PostgreSQL table.
+    
+    Rows are streamed with binary ``COPY`` in batches inside one transaction.
+    A missing table is created from the processed column types; an existing
+    table is appended to, replaced, or refused according to ``if_exists``.
+    The table name is prefixed with ``PG_DATASET_TABLE_PREFIX`` and the
+    application's own tables are refused.
+    
+    Args:
+        file (UploadFile): CSV, JSON Lines, Parquet or Arrow file
+        table_name (str): Target table name, without the prefix
+        if_exists (Literal["append", "replace", "fail"]): Existing table behavior
+        optimize (bool): Downcast numerics, categorize strings and parse dates
+        
+    Returns:
+        dict: Table, row count, duration and rows per second
+    """
+    from app.services.dataset_load import DatasetLoadError
+    
+    _check_input_format(file)
+    dataset_load_service = get_dataset_load_service()
+    if dataset_load_service.engine is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database engine not initialized",
+        )
+    
+    try:
+        df = await asyncio.to_thread(
+            get_data_analysis_service().load_csv, file.file, optimize=optimize
+        )
+        return await dataset_load_service.load(df, table_name, if_exists=if_exists)
+    except DatasetLoadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot load dataset: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error loading file: {str(e)}",
+        )
+
+
+@router.get("/datasets/{dataset_id}", status_code=status.HTTP_200_OK)
+async def describe_dataset(dataset_id: str):
+    """
+    Get statistics of a cached dataset.
+    
+    Args:
+        dataset_id (str): Dataset ID returned by ``upload-csv``
+        
+    Returns:
+        dict: Row and column counts, dtypes, sample rows and summary statistics
+    """
+    df = _get_dataset(dataset_id)
+    return await asyncio.to_thread(get_data_analysis_service().describe, df)
+
+
+@router.post("/datasets/{dataset_id}/filter", status_code=status.HTTP_200_OK)
+async def filter_dataset(
+    dataset_id: str,
+    expression: str = Form(...),
+    limit: int = 100,
+):
+    """
+    Select rows of a cached dataset matching a filter expression.
+    
+    Args:
+        dataset_id (str): Dataset ID returned by ``upload-csv``
+        expression (str): Filter expression, see ``/filter/``
+        limit (int): Maximum number of matching rows to return
+        
+    Returns:
+        dict: Matching row count and rows
+    """
+    from app.utils.filter_expression import FilterExpressionError
+    
+    df = _get_dataset(dataset_id)
+    try:
+        return ORJSONResponse(await asyncio.to_thread(
+            get_data_analysis_service().filter_frame, df, expression, limit=limit
+        ))
+    except FilterExpressionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid filter expression: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing dataset: {str(e)}",
+        )
+
+
+@router.post("/datasets/{dataset_id}/group-by", status_code=status.HTTP_200_OK)
+async def group_dataset(dataset_id: str, spec: GroupBySpec):
+    """
+    Aggregate a cached dataset by several keys.
+    
+    Group indexes are cached per dataset and key set, so further
+    aggregations over the same keys skip hashing the keys again.
+    
+    Args:
+        dataset_id (str): Dataset ID returned by ``upload-csv``
+        spec (GroupBySpec): Group-by keys and aggregations, see ``/group-by/``
+        
+    Returns:
+        dict: Group count, output columns and one row per group
+    """
+    from app.utils.grouping import AggregationSpecError
+    
+    df = _get_dataset(dataset_id)
+    try:
+        return ORJSONResponse(await asyncio.to_thread(
+            get_data_analysis_service().aggregate, df, spec, dataset_key=dataset_id
+        ))
+    except AggregationSpecError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid group-by spec: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing dataset: {str(e)}",
+        )
+
+
+@router.delete("/datasets/{dataset_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_dataset(dataset_id: str):
+    """
+    Remove a dataset from the cache.
+    
+    Args:
+        dataset_id (str): Dataset ID returned by ``upload-csv``
+    """
+    if not get_data_analysis_service().dataset_cache.remove(dataset_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found",
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJob)
+async def read_analysis_job(job_id: str):
+    """
+    Get analysis job by ID.
+    
+    Args:
+        job_id (str): Job ID
+        
+    Returns:
+        AnalysisJob: Job status, progress and results
+    """
+    job = get_analysis_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}/export")
+async def export_analysis_job(
+    job_id: str,
+    format: Literal["csv", "parquet"] = "csv",
+    compression: Literal["gzip", "zstd", "none"] = "gzip",
+):
+    """
+    Download the processed rows of a completed analysis job.
+    
+    The rows are serialized and compressed chunk by chunk while the response
+    is streamed, so memory stays bounded by one chunk. Parquet exports use
+    ``compression`` as the column codec and contain one row group per chunk.
+    The first chunk is serialized before the response starts, so a dataset
+    that cannot be exported fails with an error status.
+    
+    Args:
+        job_id (str): Job ID
+        format (Literal["csv", "parquet"]): Export format
+        compression (Literal["gzip", "zstd", "none"]): Compression codec
+        
+    Returns:
+        StreamingResponse: Processed rows
+    """
+    from app.utils.export import (
+        ExportUnavailableError,
+        check_export_format,
+        export_media_type,
+        export_suffix,
+        iter_frame_parts,
+        stream_csv,
+        stream_parquet,
+    )
+    
+    analysis_job_manager = get_analysis_job_manager()
+    job = analysis_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    export_dir = analysis_job_manager.export_dir(job_id)
+    if export_dir is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}, processed data is not available",
+        )
+    try:
+        check_export_format(format, compression)
+    except ExportUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    frames = iter_frame_parts(export_dir)
+    if format == "parquet":
+        content = stream_parquet(frames, compression=compression)
+    else:
+        content = stream_csv(frames, compression=compression)
+    # Serialize the first chunk before the status line is sent, so data that
+    # cannot be exported still gets an error response
+    try:
+        first = await asyncio.to_thread(next, content, None)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error exporting data: {str(e)}",
+        )
+    if first is not None:
+        content = itertools.chain([first], content)
+    stem = Path(job.filename or job_id).stem.replace('"', "")
+    return StreamingResponse(
+        content,
+        media_type=export_media_type(format, compression),
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{stem}-processed{export_suffix(format, compression)}"'
+            )
+        },
+    )
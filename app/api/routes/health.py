@@ -0,0 +1,52 @@
+"""
+Health check routes module.
+"""
+from fastapi import APIRouter, Request, Response, status
+
+from app.core.config import settings
+from app.core.responses import ORJSONRoute
+from app.db.init_db import DatabaseStatus
+
+router = APIRouter(route_class=ORJSONRoute)
+database_status = DatabaseStatus(
+    timeout=settings.DB_STARTUP_TIMEOUT_SECONDS,
+    warm_connections=settings.DB_WARM_CONNECTIONS,
+)
+
+
+@router.get("/live")
+async def liveness():
+    """
+    Report that the process is running.
+    
+    Returns:
+        dict: Liveness status
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness(request: Request, response: Response):
+    """
+    Report whether the process can serve traffic.
+    
+    The process is ready once startup has completed and every database in
+    ``READINESS_DATABASES`` is reachable. Databases that failed to
+    initialize at startup are initialized again by this check.
+    
+    Args:
+        request (Request): Request
+        response (Response): Response
+        
+    Returns:
+        dict: Readiness status and the error per database, null when healthy
+    """
+    if not getattr(request.app.state, "started", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting", "databases": {}}
+    
+    errors = await database_status.check(settings.READINESS_DATABASES)
+    if any(errors.values()):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "unavailable", "databases": errors}
+    return {"status": "ready", "databases": errors}
@@ -0,0 +1,26 @@
+"""
+Metrics routes module.
+"""
+import asyncio
+
+from fastapi import APIRouter, Response
+
+from app.core.responses import ORJSONRoute
+from app.middleware.metrics import render_metrics
+
+router = APIRouter(route_class=ORJSONRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Get request metrics in the Prometheus text format.
+    
+    With several workers the metric files of all workers are read, so the
+    metrics are rendered in a worker thread.
+    
+    Returns:
+        Response: Metrics of all worker processes
+    """
+    content, media_type = await asyncio.to_thread(render_metrics)
+    return Response(content=content, media_type=media_type)
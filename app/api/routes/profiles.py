@@ -0,0 +1,39 @@
+"""
+Profile routes module.
+"""
+import re
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.responses import ORJSONRoute
+from app.middleware.profiling import PROFILE_SUFFIX, get_profiles_dir
+
+router = APIRouter(route_class=ORJSONRoute)
+
+PROFILE_NAME = re.compile(r"[0-9]{8}-[0-9]{6}-[0-9a-f]{8}" + re.escape(PROFILE_SUFFIX))
+
+
+@router.get("/{name}", name="read_profile", include_in_schema=False)
+async def read_profile(name: str, request: Request):
+    """
+    Download a request profile.
+    
+    Profiles are only served to the addresses allowed to request them.
+    
+    Args:
+        name (str): Profile file name from the ``X-Profile-Url`` header
+        request (Request): Request
+        
+    Returns:
+        FileResponse: Profile in the speedscope file format
+    """
+    client = request.client.host if request.client else None
+    if client not in settings.PROFILING_ALLOWED_HOSTS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    
+    path = get_profiles_dir() / name
+    if not PROFILE_NAME.fullmatch(name) or not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=name)
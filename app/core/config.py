@@ -1,103 +1,235 @@
-"""
-Application configuration module.
-"""
-import os
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-from pydantic import AnyHttpUrl, Field, PostgresDsn, field_validator
-from pydantic_settings import BaseSettings
-
-
-class Settings(BaseSettings):
-    """
-    Application settings class.
-    
-    Attributes:
-        API_V1_STR (str): API version prefix
-        PROJECT_NAME (str): Project name
-        PROJECT_DESCRIPTION (str): Project description
-        PROJECT_VERSION (str): Project version
-        BACKEND_CORS_ORIGINS (List[AnyHttpUrl]): List of allowed CORS origins
-        MONGODB_URI (str): MongoDB connection URI
-        MONGODB_DB_NAME (str): MongoDB database name
-        POSTGRES_SERVER (str): PostgreSQL server hostname
-        POSTGRES_USER (str): PostgreSQL username
-        POSTGRES_PASSWORD (str): PostgreSQL password
-        POSTGRES_DB (str): PostgreSQL database name
-        SQLALCHEMY_DATABASE_URI (Optional[str]): SQLAlchemy database URI
-        DB_ECHO_LOG (bool): Enable SQLAlchemy echo logging
-    """
-    API_V1_STR: str = "/api/v1"
-    PROJECT_NAME: str = "FastAPI Application"
-    PROJECT_DESCRIPTION: str = "FastAPI application with MongoDB and PostgreSQL"
-    PROJECT_VERSION: str = "0.1.0"
-    
-    BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
-
-    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
-    @classmethod
-    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
-        """
-        Validate CORS origins.
-
-        Args:
-            v (Union[str, List[str]]): CORS origins value
-
-        Returns:
-            Union[List[str], str]: Validated CORS origins
-        """
-        if isinstance(v, str) and not v.startswith("["):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
-            return v
-        raise ValueError(v)
-
-    # MongoDB settings
-    MONGODB_URI: str = "mongodb://localhost:27017"
-    MONGODB_DB_NAME: str = "fastapi_app"
-
-    # PostgreSQL settings
-    POSTGRES_SERVER: str = "localhost"
-    POSTGRES_USER: str = "postgres"
-    POSTGRES_PASSWORD: str = "postgres"
-    POSTGRES_DB: str = "fastapi_app"
-    SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
-    DB_ECHO_LOG: bool = True
-
-    @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
-    @classmethod
-    def assemble_db_connection(cls, value: Optional[str], info) -> Any:
-        """
-        Assemble PostgreSQL database connection URI.
-
-        Args:
-            value (Optional[str]): Database URI value
-            info: ValidationInfo object containing field data
-
-        Returns:
-            Any: Assembled database URI
-        """
-        if isinstance(value, str):
-            return value
-        data = info.data
-        return (
-            f"postgresql://{data.get('POSTGRES_USER')}:{data.get('POSTGRES_PASSWORD')}"
-            f"@{data.get('POSTGRES_SERVER')}/{data.get('POSTGRES_DB')}"
-        )
-
-    class Config:
-        """
-        Settings configuration class.
-        """
-        case_sensitive = True
-        env_file = ".env"
-
-        # Handle paths properly for Windows and Linux
-        @classmethod
-        def prepare_env_path(cls, env_file: str) -> Path:
-            """Convert env file string to path object."""
-            return Path(env_file)
-
-
-settings = Settings()
+"""
+Application configuration module.
+"""
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import AnyHttpUrl, Field, PostgresDsn, field_validator
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """
+    Application settings class.
+    
+    Attributes:
+        API_V1_STR (str): API version prefix
+        PROJECT_NAME (str): Project name
+        PROJECT_DESCRIPTION (str): Project description
+        PROJECT_VERSION (str): Project version
+        BACKEND_CORS_ORIGINS (List[AnyHttpUrl]): List of allowed CORS origins
+        MONGODB_URI (str): MongoDB connection URI
+        MONGODB_DB_NAME (str): MongoDB database name
+        MONGODB_MAX_POOL_SIZE (int): Most pooled MongoDB connections per process
+        MONGODB_MIN_POOL_SIZE (int): Pooled MongoDB connections kept open when idle
+        MONGODB_MAX_IDLE_TIME_MS (int): Milliseconds an idle pooled connection is kept
+        MONGODB_WAIT_QUEUE_TIMEOUT_MS (int): Milliseconds an operation waits for a pooled
+            connection when the pool is exhausted
+        MONGODB_SERVER_SELECTION_TIMEOUT_MS (int): Milliseconds an operation waits for a
+            reachable server
+        MONGODB_COMPRESSORS (List[str]): Wire compressors in order of preference; those
+            whose module is not installed are skipped
+        MONGODB_ZLIB_COMPRESSION_LEVEL (int): Compression level when zlib is negotiated
+        POSTGRES_SERVER (str): PostgreSQL server hostname
+        POSTGRES_USER (str): PostgreSQL username
+        POSTGRES_PASSWORD (str): PostgreSQL password
+        POSTGRES_DB (str): PostgreSQL database name
+        SQLALCHEMY_DATABASE_URI (Optional[str]): SQLAlchemy database URI
+        DB_ECHO_LOG (bool): Enable SQLAlchemy echo logging
+        DB_SLOW_QUERY_MS (float): Queries taking at least this many milliseconds are slow
+        DB_SLOW_QUERY_SAMPLE_RATE (float): Fraction of slow queries that are logged
+        DB_QUERY_COUNT_WARNING (int): Requests issuing more database queries are logged,
+            e.g. to find N+1 query patterns; 0 disables the warning
+        SERVER_TIMING_ENABLED (bool): Report database query time and counts in a
+            ``Server-Timing`` response header; off by default because every client
+            can read it
+        CSV_CHUNK_SIZE (int): Rows per chunk when processing uploaded CSV files
+        DEDUP_MAX_MEMORY_HASHES (int): Row hashes kept in memory before spilling to disk
+        ANALYSIS_JOB_WORKERS (int): Concurrent background analysis jobs per process
+        ANALYSIS_JOB_QUEUE_SIZE (int): Maximum queued background analysis jobs per process
+        ANALYSIS_JOB_TTL_SECONDS (int): Seconds finished analysis jobs and their results
+            are kept
+        CSV_SAMPLE_SIZE (int): Rows drawn from a CSV file in sample mode
+        CSV_PARALLEL_WORKERS (Optional[int]): Worker processes for parsing one large CSV
+            file, defaults to the number of CPUs; 1 disables parallel parsing
+        CSV_PARALLEL_MIN_BYTES (int): Smallest CSV file parsed in parallel byte ranges
+        CSV_BATCH_WORKERS (Optional[int]): Worker processes for the files of one
+            multi-file upload, defaults to the number of CPUs; each server process
+            starts one pool, sized for the larger of this and CSV_PARALLEL_WORKERS,
+            that all requests share
+        CSV_BATCH_MAX_FILES (int): Most files accepted in one multi-file upload
+        DATASET_CACHE_MAX_BYTES (int): Memory budget per process for processed datasets
+            kept for follow-up queries; 0 disables the dataset cache
+        DATASET_CACHE_TTL_SECONDS (int): Seconds an unused cached dataset is kept
+        PG_COPY_BATCH_SIZE (int): Rows per COPY batch when loading datasets into PostgreSQL
+        PG_DATASET_TABLE_PREFIX (str): Prefix of every table datasets are loaded into, so
+            uploads cannot touch application tables
+        UPLOAD_MAX_REQUEST_BYTES (int): Largest accepted request body
+        UPLOAD_BUDGET_BYTES (int): Request body bytes in flight per worker process before
+            further uploads are rejected with 429; not shared between workers, so the
+            total across a deployment is this times the number of workers
+        UPLOAD_SPOOL_MAX_SIZE (int): Bytes of each uploaded file kept in memory before
+            spooling to the temp directory
+        TEMP_FILE_MAX_AGE_SECONDS (int): Age after which leftover temp files are removed
+            on startup; directories are kept while anything inside changed more recently
+        DB_STARTUP_TIMEOUT_SECONDS (float): Seconds allowed per database for initialization
+            on startup and for each readiness check
+        DB_WARM_CONNECTIONS (int): Pooled connections opened per database on startup
+        READINESS_DATABASES (List[str]): Databases that must be reachable for
+            ``/health/ready`` to report ready
+        SERVER_HOST (str): Address the production server binds to
+        SERVER_PORT (int): Port the production server listens on
+        SERVER_WORKERS (Optional[int]): Production worker processes, defaults to the
+            CPUs available to the container
+        SERVER_BACKLOG (int): Pending connections queued by the listening socket
+        SERVER_KEEP_ALIVE_SECONDS (int): Idle time before keep-alive connections are
+            closed; kept above the idle timeout of load balancers in front
+        SERVER_GRACEFUL_SHUTDOWN_SECONDS (int): Time in-flight requests get to finish
+            after SIGTERM
+        SERVER_MAX_REQUESTS (int): Requests after which a worker is replaced, bounding
+            memory growth; 0 disables recycling
+        SERVER_MAX_REQUESTS_JITTER (int): Random extra requests per worker so workers
+            are not recycled at the same time
+        SERVER_ACCESS_LOG (bool): Log every request
+        METRICS_ENABLED (bool): Record request metrics and serve them at ``/metrics``
+        METRICS_MULTIPROC_DIR (Optional[str]): Directory where production workers share
+            metric values, defaults to ``metrics`` in the data directory
+        PROFILING_ENABLED (bool): Install the on-demand request profiling middleware
+        PROFILING_ALLOWED_HOSTS (List[str]): Client addresses allowed to profile requests
+            and download profiles
+        PROFILING_INTERVAL_MS (float): Milliseconds between profiler samples
+        PROFILING_MAX_FILES (int): Number of profiles kept in the data directory
+    """
+    API_V1_STR: str = "/api/v1"
+    PROJECT_NAME: str = "FastAPI Application"
+    PROJECT_DESCRIPTION: str = "FastAPI application with MongoDB and PostgreSQL"
+    PROJECT_VERSION: str = "0.1.0"
+    
+    BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
+
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
+    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+        """
+        Validate CORS origins.
+
+        Args:
+            v (Union[str, List[str]]): CORS origins value
+
+        Returns:
+            Union[List[str], str]: Validated CORS origins
+        """
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",")]
+        elif isinstance(v, (list, str)):
+            return v
+        raise ValueError(v)
+
+    # MongoDB settings
+    MONGODB_URI: str = "mongodb://localhost:27017"
+    MONGODB_DB_NAME: str = "fastapi_app"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 5
+    MONGODB_MAX_IDLE_TIME_MS: int = 300_000
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 5_000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGODB_COMPRESSORS: List[Literal["zstd", "snappy", "zlib"]] = ["zstd", "snappy", "zlib"]
+    MONGODB_ZLIB_COMPRESSION_LEVEL: int = 6
+
+    # PostgreSQL settings
+    POSTGRES_SERVER: str = "localhost"
+    POSTGRES_USER: str = "postgres"
+    POSTGRES_PASSWORD: str = "postgres"
+    POSTGRES_DB: str = "fastapi_app"
+    SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
+    DB_ECHO_LOG: bool = False
+    DB_SLOW_QUERY_MS: float = 100.0
+    DB_SLOW_QUERY_SAMPLE_RATE: float = 0.1
+    DB_QUERY_COUNT_WARNING: int = 50
+    SERVER_TIMING_ENABLED: bool = False
+
+    @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
+    @classmethod
+    def assemble_db_connection(cls, value: Optional[str], info) -> Any:
+        """
+        Assemble PostgreSQL database connection URI.
+
+        Args:
+            value (Optional[str]): Database URI value
+            info: ValidationInfo object containing field data
+
+        Returns:
+            Any: Assembled database URI
+        """
+        if isinstance(value, str):
+            return value
+        data = info.data
+        return (
+            f"postgresql://{data.get('POSTGRES_USER')}:{data.get('POSTGRES_PASSWORD')}"
+            f"@{data.get('POSTGRES_SERVER')}/{data.get('POSTGRES_DB')}"
+        )
+
+    # Data processing settings
+    CSV_CHUNK_SIZE: int = 100_000
+    DEDUP_MAX_MEMORY_HASHES: int = 8_000_000
+    ANALYSIS_JOB_WORKERS: int = 2
+    ANALYSIS_JOB_QUEUE_SIZE: int = 16
+    ANALYSIS_JOB_TTL_SECONDS: int = 7 * 24 * 3600
+    CSV_SAMPLE_SIZE: int = 10_000
+    CSV_PARALLEL_WORKERS: Optional[int] = None
+    CSV_PARALLEL_MIN_BYTES: int = 256 * 1024 ** 2
+    CSV_BATCH_WORKERS: Optional[int] = None
+    CSV_BATCH_MAX_FILES: int = 100
+    DATASET_CACHE_MAX_BYTES: int = 1024 ** 3
+    DATASET_CACHE_TTL_SECONDS: int = 1800
+    PG_COPY_BATCH_SIZE: int = 50_000
+    PG_DATASET_TABLE_PREFIX: str = "dataset_"
+
+    # Upload settings
+    UPLOAD_MAX_REQUEST_BYTES: int = 2 * 1024 ** 3
+    UPLOAD_BUDGET_BYTES: int = 8 * 1024 ** 3
+    UPLOAD_SPOOL_MAX_SIZE: int = 1024 ** 2
+    TEMP_FILE_MAX_AGE_SECONDS: int = 24 * 3600
+
+    # Startup and health check settings
+    DB_STARTUP_TIMEOUT_SECONDS: float = 10.0
+    DB_WARM_CONNECTIONS: int = 5
+    READINESS_DATABASES: List[Literal["postgres", "mongodb"]] = ["postgres", "mongodb"]
+
+    # Production server settings
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE_SECONDS: int = 75
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_MAX_REQUESTS: int = 10_000
+    SERVER_MAX_REQUESTS_JITTER: int = 1_000
+    SERVER_ACCESS_LOG: bool = False
+
+    # Metrics settings
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+
+    # Profiling settings
+    PROFILING_ENABLED: bool = False
+    PROFILING_ALLOWED_HOSTS: List[str] = ["127.0.0.1", "::1"]
+    PROFILING_INTERVAL_MS: float = 1.0
+    PROFILING_MAX_FILES: int = 50
+
+    class Config:
+        """
+        Settings configuration class.
+        """
+        case_sensitive = True
+        env_file = ".env"
+
+        # Handle paths properly for Windows and Linux
+        @classmethod
+        def prepare_env_path(cls, env_file: str) -> Path:
+            """Convert env file string to path object."""
+            return Path(env_file)
+
+
+settings = Settings()
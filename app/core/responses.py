@@ -0,0 +1,111 @@
+"""
+JSON response rendering module.
+
+Responses are rendered with orjson, which writes JSON bytes in native code
+and handles datetimes, UUIDs, enums, NumPy arrays and scalars itself; NaN
+and infinity become null. ``ORJSONResponse`` converts the remaining types
+returned by the data layer, such as MongoDB ObjectIds and pandas
+timestamps.
+
+``ORJSONRoute`` makes ``ORJSONResponse`` the default response class of a
+router's routes. For routes with a response model FastAPI then keeps
+serializing the validated model straight to JSON bytes in pydantic-core,
+which is faster than producing Python objects for any JSON library.
+"""
+import datetime
+import decimal
+import sys
+from pathlib import PurePath
+from typing import Any, Callable
+
+import orjson
+from bson import ObjectId
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    # Called by orjson for types it does not serialize natively
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and obj is pandas.NaT:
+        return None
+    if isinstance(obj, datetime.datetime):
+        # pandas.Timestamp is a datetime subclass orjson does not accept
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, decimal.Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    # Remaining NumPy scalars, e.g. numpy.float16
+    if hasattr(obj, "item") and type(obj).__module__ == "numpy":
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    Args:
+        content (Any): Content to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+
+    Raises:
+        TypeError: If the content contains an unsupported type
+    """
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    """
+    def render(self, content: Any) -> bytes:
+        """
+        Render response content.
+
+        Args:
+            content (Any): Response content
+
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        return dumps(content)
+
+
+class ORJSONRoute(APIRoute):
+    """
+    API route that renders responses with ``ORJSONResponse`` by default.
+
+    The default is kept as a placeholder, so FastAPI still treats it as
+    unset; an explicitly chosen response class is used unchanged.
+    """
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        """
+        Initialize route.
+
+        Args:
+            path (str): Route path
+            endpoint (Callable[..., Any]): Endpoint function
+            **kwargs (Any): Further ``APIRoute`` arguments
+        """
+        response_class = kwargs.get("response_class")
+        if response_class is None or isinstance(response_class, DefaultPlaceholder):
+            kwargs["response_class"] = Default(ORJSONResponse)
+        super().__init__(path, endpoint, **kwargs)
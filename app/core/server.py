@@ -0,0 +1,162 @@
+"""
+Server process configuration module.
+
+In production the application runs as several uvicorn worker processes
+behind one listening socket. The default worker count is the number of CPUs
+the process may actually use: the CPU affinity mask, further limited by a
+container CPU quota (cgroup v2 ``cpu.max`` or cgroup v1 ``cpu.cfs_quota_us``),
+since a pod limited to 2 CPUs on a 64-core node gains nothing from 64
+workers but pays 64 times the memory.
+"""
+import importlib.util
+import inspect
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import Settings
+from app.utils.platform import get_data_dir
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """
+    Get the CPU quota of the current cgroup.
+
+    Args:
+        root (Path): cgroup filesystem mount point
+
+    Returns:
+        Optional[float]: CPUs allowed by the quota, or None if unlimited or unknown
+    """
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpu_max = _read(root / "cpu.max")
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota == "max" or not period:
+            return None
+        return int(quota) / int(period)
+
+    # cgroup v1: quota of -1 means unlimited
+    quota = _read(root / "cpu" / "cpu.cfs_quota_us")
+    period = _read(root / "cpu" / "cpu.cfs_period_us")
+    if quota is None or period is None or int(quota) <= 0:
+        return None
+    return int(quota) / int(period)
+
+
+def available_cpus(root: Path = CGROUP_ROOT) -> int:
+    """
+    Get the number of CPUs the process can use.
+
+    Args:
+        root (Path): cgroup filesystem mount point
+
+    Returns:
+        int: CPUs in the affinity mask, limited by the cgroup CPU quota
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit(root)
+    if limit is not None:
+        # A fractional quota still allows bursts on one more CPU
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def default_workers(root: Path = CGROUP_ROOT) -> int:
+    """
+    Get the default number of worker processes.
+
+    ``WEB_CONCURRENCY`` overrides the detected CPU count, as for other
+    Python application servers.
+
+    Args:
+        root (Path): cgroup filesystem mount point
+
+    Returns:
+        int: Worker processes
+    """
+    concurrency = os.environ.get("WEB_CONCURRENCY")
+    if concurrency:
+        return max(int(concurrency), 1)
+    return available_cpus(root)
+
+
+def configure_metrics_dir(settings: Settings) -> Optional[Path]:
+    """
+    Prepare the directory in which worker processes share metric values.
+
+    Sets ``PROMETHEUS_MULTIPROC_DIR``, which must happen before the workers
+    import the metrics client, and removes the values of earlier server runs.
+    An already set ``PROMETHEUS_MULTIPROC_DIR`` is used as is.
+
+    Args:
+        settings (Settings): Application settings
+
+    Returns:
+        Optional[Path]: Metrics directory, or None if metrics are disabled
+    """
+    if not settings.METRICS_ENABLED:
+        return None
+    configured = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if configured:
+        return Path(configured)
+    path = Path(settings.METRICS_MULTIPROC_DIR or get_data_dir() / "metrics")
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.db"):
+        stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
+    return path
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def production_options(settings: Settings, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build ``uvicorn.run`` keyword arguments for multi-worker production serving.
+
+    uvloop and httptools are used when installed (they are part of
+    ``uvicorn[standard]``; uvloop is not available on Windows). Options
+    that the installed uvicorn does not support are left out.
+
+    Args:
+        settings (Settings): Application settings
+        workers (Optional[int]): Worker processes, defaults to ``SERVER_WORKERS``
+            or the available CPUs
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for ``uvicorn.run``
+    """
+    import uvicorn
+
+    options = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": workers or settings.SERVER_WORKERS or default_workers(),
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "limit_max_requests": settings.SERVER_MAX_REQUESTS or None,
+        # Spread restarts so workers are not all recycled at the same moment
+        "limit_max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "proxy_headers": True,
+        "access_log": settings.SERVER_ACCESS_LOG,
+    }
+    supported = inspect.signature(uvicorn.Config).parameters
+    return {name: value for name, value in options.items() if name in supported}
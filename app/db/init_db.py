@@ -1,57 +1,177 @@
-"""
-Database module initialization.
-"""
-import asyncio
-import traceback
-from pathlib import Path
-
-from app.db.mongodb import mongodb
-from app.db.postgres import create_db_and_tables
-from app.utils.platform import get_app_dir, get_data_dir
-
-
-def init_directories():
-    """
-    Initialize required directories for database files.
-    """
-    # Create data directories
-    data_dir = get_data_dir()
-    db_dir = data_dir / "db"
-    db_dir.mkdir(exist_ok=True)
-    
-    # Create subdirectories for different databases
-    postgres_dir = db_dir / "postgres"
-    postgres_dir.mkdir(exist_ok=True)
-    
-    mongodb_dir = db_dir / "mongodb"
-    mongodb_dir.mkdir(exist_ok=True)
-    
-    print(f"Database directories initialized at {db_dir}")
-    return db_dir
-
-
-def init_db():
-    """
-    Initialize database connections and create tables.
-    """
-    # Initialize directories
-    init_directories()
-    # Create PostgreSQL tables
-    try:
-        create_db_and_tables()
-        print("PostgreSQL tables created successfully")
-    except Exception as e:
-        print(f"PostgreSQL connection error: {e}")
-        print(f"Exception details: {traceback.format_exc()}")
-        # Continue even if PostgreSQL is not available
-    
-    # Check MongoDB connection
-    try:
-        mongodb_client = mongodb.client
-        # Await the async ping command
-        asyncio.get_event_loop().run_until_complete(mongodb_client.admin.command('ping'))
-        print("MongoDB connection successful")
-    except Exception as e:
-        print(f"MongoDB connection error: {e}")
-        print(f"Exception details: {traceback.format_exc()}")
-        # Continue even if MongoDB is not available
+"""
+Database module initialization.
+
+PostgreSQL and MongoDB are initialized concurrently, each under a timeout,
+so startup takes at most the timeout no matter how many databases are
+unreachable. Initialization also opens pooled connections ahead of the
+first requests. A database that fails to initialize does not stop the
+application; it is initialized again by the next readiness check.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import text
+
+from app.db.mongodb import get_mongodb_client
+from app.db.postgres import async_engine, create_db_and_tables
+from app.utils.platform import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+POSTGRES = "postgres"
+MONGODB = "mongodb"
+DATABASES = (POSTGRES, MONGODB)
+
+
+def init_directories():
+    """
+    Initialize required directories for database files.
+    """
+    # Create data directories
+    data_dir = get_data_dir()
+    db_dir = data_dir / "db"
+    db_dir.mkdir(exist_ok=True)
+
+    # Create subdirectories for different databases
+    postgres_dir = db_dir / "postgres"
+    postgres_dir.mkdir(exist_ok=True)
+
+    mongodb_dir = db_dir / "mongodb"
+    mongodb_dir.mkdir(exist_ok=True)
+
+    logger.info("Database directories initialized at %s", db_dir)
+    return db_dir
+
+
+async def init_postgres(warm_connections: int) -> None:
+    """
+    Create PostgreSQL tables and open pooled connections.
+
+    Args:
+        warm_connections (int): Connections to open, capped at the pool size
+
+    Raises:
+        RuntimeError: If the database engine could not be created
+    """
+    if async_engine is None:
+        raise RuntimeError("Database engine not initialized")
+    await create_db_and_tables()
+
+    async def checkout() -> None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Concurrent checkouts cannot share a connection, so each opens its own
+    size = min(warm_connections, async_engine.pool.size())
+    await asyncio.gather(*(checkout() for _ in range(max(size, 1))))
+
+
+async def init_mongodb(warm_connections: int) -> None:
+    """
+    Check the MongoDB connection and open pooled connections.
+
+    Args:
+        warm_connections (int): Concurrent pings, each on its own pooled connection
+    """
+    await asyncio.gather(
+        *(get_mongodb_client().admin.command("ping") for _ in range(max(warm_connections, 1)))
+    )
+
+
+async def ping_postgres() -> None:
+    """
+    Check the PostgreSQL connection.
+
+    Raises:
+        RuntimeError: If the database engine could not be created
+    """
+    if async_engine is None:
+        raise RuntimeError("Database engine not initialized")
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def ping_mongodb() -> None:
+    """
+    Check the MongoDB connection.
+    """
+    await get_mongodb_client().admin.command("ping")
+
+
+class DatabaseStatus:
+    """
+    Initialization and health state of the databases.
+
+    Attributes:
+        timeout (float): Seconds allowed per database for initialization or a check
+        warm_connections (int): Pooled connections opened per database
+        errors (Dict[str, Optional[str]]): Last error per database, None when healthy
+    """
+    def __init__(self, *, timeout: float, warm_connections: int):
+        """
+        Initialize database status.
+
+        Args:
+            timeout (float): Seconds allowed per database for initialization or a check
+            warm_connections (int): Pooled connections opened per database
+        """
+        self.timeout = timeout
+        self.warm_connections = warm_connections
+        self.errors: Dict[str, Optional[str]] = {name: "not initialized" for name in DATABASES}
+        self._initialized = set()
+
+    async def initialize(self, names: Iterable[str] = DATABASES) -> Dict[str, Optional[str]]:
+        """
+        Initialize databases concurrently.
+
+        Args:
+            names (Iterable[str]): Databases to initialize
+
+        Returns:
+            Dict[str, Optional[str]]: Error per database, None on success
+        """
+        initializers = {
+            POSTGRES: lambda: init_postgres(self.warm_connections),
+            MONGODB: lambda: init_mongodb(self.warm_connections),
+        }
+        names = list(names)
+        results = await asyncio.gather(*(self._run(initializers[name]) for name in names))
+        for name, error in zip(names, results):
+            self.errors[name] = error
+            if error is None:
+                self._initialized.add(name)
+            else:
+                logger.warning("Could not initialize %s: %s", name, error)
+        return {name: self.errors[name] for name in names}
+
+    async def check(self, names: Iterable[str] = DATABASES) -> Dict[str, Optional[str]]:
+        """
+        Check databases concurrently, initializing those that failed before.
+
+        Args:
+            names (Iterable[str]): Databases to check
+
+        Returns:
+            Dict[str, Optional[str]]: Error per database, None when healthy
+        """
+        names = list(names)
+        uninitialized = [name for name in names if name not in self._initialized]
+        pings = {POSTGRES: ping_postgres, MONGODB: ping_mongodb}
+        initialized = [name for name in names if name in self._initialized]
+        results, _ = await asyncio.gather(
+            asyncio.gather(*(self._run(pings[name]) for name in initialized)),
+            self.initialize(uninitialized),
+        )
+        for name, error in zip(initialized, results):
+            self.errors[name] = error
+        return {name: self.errors[name] for name in names}
+
+    async def _run(self, operation: Callable[[], Awaitable[None]]) -> Optional[str]:
+        try:
+            await asyncio.wait_for(operation(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return f"timed out after {self.timeout:g} seconds"
+        except Exception as e:
+            return str(e) or type(e).__name__
+        return None
@@ -0,0 +1,250 @@
+"""
+Database query instrumentation module.
+
+SQLAlchemy cursor events and pymongo command monitoring time every query
+and attribute it to the request being handled, which is tracked in a
+context variable. Motor runs commands in executor threads and SQLAlchemy's
+asyncio layer runs them in greenlets; both copy the context of the calling
+task, so queries are attributed correctly.
+
+Queries slower than ``DB_SLOW_QUERY_MS`` are logged for a random sample of
+``DB_SLOW_QUERY_SAMPLE_RATE``, so a slow database does not flood the log.
+SQL statements are logged without their parameters and MongoDB commands
+by name and collection only, so no row values reach the log.
+"""
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Callable, Dict, Optional
+
+from pymongo import monitoring
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+POSTGRES = "postgres"
+MONGODB = "mongodb"
+
+# Longest statement text written to the slow query log
+MAX_STATEMENT_LENGTH = 500
+
+
+class QueryStats:
+    """
+    Query counts and durations of one request, per database.
+
+    Attributes:
+        counts (Dict[str, int]): Queries per database
+        seconds (Dict[str, float]): Total query time per database
+    """
+    def __init__(self):
+        """
+        Initialize query statistics.
+        """
+        self.counts: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        # MongoDB commands of one request may run in several executor threads
+        self._lock = threading.Lock()
+
+    @property
+    def total_count(self) -> int:
+        """
+        Get the number of queries across databases.
+
+        Returns:
+            int: Number of queries
+        """
+        return sum(self.counts.values())
+
+    def record(self, database: str, seconds: float) -> None:
+        """
+        Record a query.
+
+        Args:
+            database (str): Database name, ``postgres`` or ``mongodb``
+            seconds (float): Query duration
+        """
+        with self._lock:
+            self.counts[database] = self.counts.get(database, 0) + 1
+            self.seconds[database] = self.seconds.get(database, 0.0) + seconds
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request_stats() -> "Token[Optional[QueryStats]]":
+    """
+    Start collecting query statistics for the current request.
+
+    Returns:
+        Token[Optional[QueryStats]]: Token for ``stop_request_stats``
+    """
+    return _request_stats.set(QueryStats())
+
+
+def stop_request_stats(token: "Token[Optional[QueryStats]]") -> None:
+    """
+    Stop collecting query statistics for the current request.
+
+    Args:
+        token (Token[Optional[QueryStats]]): Token from ``start_request_stats``
+    """
+    _request_stats.reset(token)
+
+
+def current_request_stats() -> Optional[QueryStats]:
+    """
+    Get the query statistics of the current request.
+
+    Returns:
+        Optional[QueryStats]: Statistics, or None outside of a request
+    """
+    return _request_stats.get()
+
+
+class SlowQueryLog:
+    """
+    Sampled log of queries slower than a threshold.
+
+    Attributes:
+        threshold_seconds (float): Queries taking at least this long are slow
+        sample_rate (float): Fraction of slow queries that are logged
+    """
+    def __init__(
+        self,
+        threshold_seconds: float,
+        sample_rate: float,
+        *,
+        sample: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize slow query log.
+
+        Args:
+            threshold_seconds (float): Queries taking at least this long are slow
+            sample_rate (float): Fraction of slow queries that are logged
+            sample (Callable[[], float]): Source of uniform random numbers in [0, 1)
+        """
+        self.threshold_seconds = threshold_seconds
+        self.sample_rate = sample_rate
+        self._sample = sample
+
+    def observe(self, database: str, statement: Callable[[], str], seconds: float) -> bool:
+        """
+        Log a query if it is slow and sampled.
+
+        Args:
+            database (str): Database name
+            statement (Callable[[], str]): Builds the statement text, only
+                called for logged queries
+            seconds (float): Query duration
+
+        Returns:
+            bool: True if the query was logged
+        """
+        if seconds < self.threshold_seconds or self._sample() >= self.sample_rate:
+            return False
+        text = " ".join(statement().split())
+        if len(text) > MAX_STATEMENT_LENGTH:
+            text = text[:MAX_STATEMENT_LENGTH] + "..."
+        logger.warning("Slow %s query (%.1f ms): %s", database, seconds * 1000, text)
+        return True
+
+
+slow_query_log = SlowQueryLog(
+    settings.DB_SLOW_QUERY_MS / 1000, settings.DB_SLOW_QUERY_SAMPLE_RATE
+)
+
+
+def record_query(database: str, statement: Callable[[], str], seconds: float) -> None:
+    """
+    Record a query for the current request and the slow query log.
+
+    Args:
+        database (str): Database name
+        statement (Callable[[], str]): Builds the statement text
+        seconds (float): Query duration
+    """
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(database, seconds)
+    slow_query_log.observe(database, statement, seconds)
+
+
+def instrument_engine(engine) -> None:
+    """
+    Time the statements executed by a SQLAlchemy engine.
+
+    Args:
+        engine (Union[Engine, AsyncEngine]): Engine to instrument
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_start"].pop()
+        record_query(POSTGRES, lambda: statement, seconds)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    pymongo command listener timing MongoDB commands.
+    """
+    def __init__(self):
+        """
+        Initialize listener.
+        """
+        # Collection names of running commands by request ID, for the slow query log
+        self._collections: Dict[int, str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """
+        Remember the collection of a started command.
+
+        Args:
+            event (monitoring.CommandStartedEvent): Command started event
+        """
+        collection = event.command.get(event.command_name)
+        self._collections[event.request_id] = (
+            collection if isinstance(collection, str) else ""
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """
+        Record a completed command.
+
+        Args:
+            event (monitoring.CommandSucceededEvent): Command succeeded event
+        """
+        self._record(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """
+        Record a failed command.
+
+        Args:
+            event (monitoring.CommandFailedEvent): Command failed event
+        """
+        self._record(event)
+
+    def _record(self, event) -> None:
+        collection = self._collections.pop(event.request_id, "")
+        record_query(
+            MONGODB,
+            lambda: f"{event.command_name} {event.database_name}.{collection}".rstrip("."),
+            event.duration_micros / 1_000_000,
+        )
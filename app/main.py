@@ -1,47 +1,131 @@
-"""
-Main application module for FastAPI application.
-"""
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from app.api.routes import router as api_router
-from app.core.config import settings
-from app.db.init_db import init_db
-
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description=settings.PROJECT_DESCRIPTION,
-    version=settings.PROJECT_VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-)
-
-# Set all CORS enabled origins
-if settings.BACKEND_CORS_ORIGINS:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-# Include API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
-
-
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {"message": "Welcome to the API. Go to /docs for API documentation."}
-
-
-@app.on_event("startup")
-async def startup_event():
-    """
-    Initialize services on startup.
-    """
-    try:
-        init_db()
-    except Exception as e:
-        print(f"Error initializing database: {e}")
-        # Continue even if database initialization fails
+"""
+Main application module for FastAPI application.
+"""
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.api.routes import data_analysis, health, metrics, profiles
+from app.api.routes import router as api_router
+from app.core.config import settings
+from app.core.responses import ORJSONRoute
+from app.db.init_db import init_directories
+from app.db.mongodb import close_mongodb
+from app.db.postgres import async_engine
+from app.middleware.metrics import MetricsMiddleware, mark_process_stopped
+from app.middleware.profiling import ProfilingMiddleware, get_profiles_dir
+from app.middleware.query_timing import QueryTimingMiddleware
+from app.middleware.uploads import (
+    UploadLimitMiddleware,
+    remove_stale_temp_files,
+    upload_spooling,
+)
+from app.utils.platform import get_temp_dir
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize services on startup and release them on shutdown.
+    
+    The server accepts connections only after startup has finished, so
+    databases are initialized and their pools warmed before the first
+    request. Databases are initialized concurrently under
+    ``DB_STARTUP_TIMEOUT_SECONDS``; an unreachable database is logged and
+    retried by the readiness check instead of failing startup.
+    
+    Args:
+        app (FastAPI): Application
+    """
+    app.state.started = False
+    init_directories()
+    try:
+        remove_stale_temp_files(get_temp_dir(), settings.TEMP_FILE_MAX_AGE_SECONDS)
+    except OSError as e:
+        logger.warning("Error cleaning temp directory: %s", e)
+    await health.database_status.initialize()
+    with upload_spooling(settings.UPLOAD_SPOOL_MAX_SIZE, get_temp_dir()):
+        app.state.started = True
+        try:
+            yield
+        finally:
+            app.state.started = False
+            await data_analysis.shutdown()
+            if async_engine is not None:
+                await async_engine.dispose()
+            close_mongodb()
+            mark_process_stopped()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    description=settings.PROJECT_DESCRIPTION,
+    version=settings.PROJECT_VERSION,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+)
+
+# Render responses with orjson; see app.core.responses
+app.router.route_class = ORJSONRoute
+
+# Profile single requests on demand; innermost, so the profile covers the handler
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        allowed_hosts=settings.PROFILING_ALLOWED_HOSTS,
+        output_dir=get_profiles_dir(),
+        interval=settings.PROFILING_INTERVAL_MS / 1000,
+        max_files=settings.PROFILING_MAX_FILES,
+    )
+
+# Count and time the database queries of each request
+app.add_middleware(
+    QueryTimingMiddleware,
+    server_timing=settings.SERVER_TIMING_ENABLED,
+    query_count_warning=settings.DB_QUERY_COUNT_WARNING,
+)
+
+# Reject oversized uploads and limit upload bytes in flight per process;
+# added first so CORS headers are also set on its rejections
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_request_bytes=settings.UPLOAD_MAX_REQUEST_BYTES,
+    budget_bytes=settings.UPLOAD_BUDGET_BYTES,
+)
+
+# Set all CORS enabled origins
+if settings.BACKEND_CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# Record request metrics per route; added last so it also times the other
+# middleware and counts their rejections
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Include API router
+app.include_router(api_router, prefix=settings.API_V1_STR)
+
+# Health checks are outside the API prefix for load balancers and orchestrators
+app.include_router(health.router, prefix="/health", tags=["health"])
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
+
+if settings.PROFILING_ENABLED:
+    app.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
+
+
+@app.get("/")
+async def root():
+    """Root endpoint."""
+    return {"message": "Welcome to the API. Go to /docs for API documentation."}
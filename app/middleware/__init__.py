@@ -0,0 +1,9 @@
+"""
+ASGI middleware package.
+"""
+from app.middleware.uploads import UploadBudget, UploadLimitMiddleware
+
+__all__ = [
+    "UploadBudget",
+    "UploadLimitMiddleware",
+]
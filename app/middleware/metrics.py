@@ -0,0 +1,230 @@
+"""
+Request metrics middleware module.
+
+Every HTTP request is counted per method, route template and status code,
+and its latency and response size are observed in histograms; requests in
+progress are tracked in a gauge. Routes are labelled by their path template
+such as ``/api/v1/logs/{log_id}``, so label cardinality is bounded by the
+number of routes. Requests that match no route share one label.
+
+With several server workers each process keeps its own values. When
+``PROMETHEUS_MULTIPROC_DIR`` is set before the workers start, as the
+production launcher does, every worker writes its values to memory-mapped
+files in that directory and ``/metrics`` aggregates the files of all
+workers, whichever worker serves the scrape.
+"""
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Mount, compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Route lookups are cached per method and path, up to this many entries
+ROUTE_CACHE_SIZE = 4096
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route and status code",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response has been sent",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being processed",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+
+
+def is_multiprocess() -> bool:
+    """
+    Check whether metric values are shared through files between workers.
+
+    Returns:
+        bool: True if ``PROMETHEUS_MULTIPROC_DIR`` is set
+    """
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Tuple[bytes, str]: Metrics and their content type
+    """
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_stopped() -> None:
+    """
+    Remove the in-progress gauge values of this worker process.
+
+    Counters and histograms of stopped workers are kept, so totals do not
+    drop when a worker is recycled.
+    """
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def _flatten_routes(routes: Iterable, prefix: str = "") -> Iterable[Tuple[str, Optional[set]]]:
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            # Newer FastAPI versions keep an included router as one route
+            yield from _flatten_routes(included.routes, prefix + route.include_context.prefix)
+        elif isinstance(route, Mount):
+            yield from _flatten_routes(route.routes or [], prefix + route.path)
+        elif hasattr(route, "path"):
+            yield prefix + route.path, getattr(route, "methods", None)
+
+
+class RouteTemplates:
+    """
+    Resolver of request paths to route templates.
+
+    Attributes:
+        routes (list): Path pattern, methods and template of every route,
+            in routing order
+    """
+    def __init__(self, routes: Iterable):
+        """
+        Initialize resolver.
+
+        Args:
+            routes (Iterable): Application routes
+        """
+        self.routes = []
+        for template, methods in _flatten_routes(routes):
+            regex, _, _ = compile_path(template)
+            self.routes.append((regex, methods, template))
+        self._cache: Dict[Tuple[str, str], str] = {}
+
+    def resolve(self, method: str, path: str) -> str:
+        """
+        Get the template of the route handling a request.
+
+        Args:
+            method (str): Request method
+            path (str): Request path
+
+        Returns:
+            str: Route template; the template of a route matching the path
+                but not the method, or ``UNMATCHED_ROUTE``
+        """
+        key = (method, path)
+        template = self._cache.get(key)
+        if template is None:
+            template = self._match(method, path)
+            if len(self._cache) >= ROUTE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = template
+        return template
+
+    def _match(self, method: str, path: str) -> str:
+        partial = None
+        for regex, methods, template in self.routes:
+            if regex.match(path):
+                if methods is None or method in methods:
+                    return template
+                partial = partial or template
+        return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request metrics per route.
+
+    Attributes:
+        app (ASGIApp): Wrapped application
+    """
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+        """
+        self.app = app
+        self._templates: Optional[RouteTemplates] = None
+        self._children: Dict[Tuple[str, str], tuple] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope)
+        duration, size, in_progress = self._metrics(method, route)
+        status = 500
+        body_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration.observe(time.perf_counter() - start)
+            size.observe(body_bytes)
+            in_progress.dec()
+            REQUESTS.labels(method, route, str(status)).inc()
+
+    def _route(self, scope: Scope) -> str:
+        # Routes are complete once the application serves requests
+        if self._templates is None:
+            self._templates = RouteTemplates(scope["app"].routes)
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        return self._templates.resolve(scope["method"], path)
+
+    def _metrics(self, method: str, route: str) -> tuple:
+        key = (method, route)
+        children = self._children.get(key)
+        if children is None:
+            children = (
+                REQUEST_DURATION.labels(method, route),
+                RESPONSE_SIZE.labels(method, route),
+                REQUESTS_IN_PROGRESS.labels(method, route),
+            )
+            self._children[key] = children
+        return children
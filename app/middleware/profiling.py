@@ -0,0 +1,147 @@
+"""
+On-demand request profiling middleware module.
+
+A request carrying an ``X-Profile: 1`` header or a ``profile=1`` query
+parameter from an address in ``PROFILING_ALLOWED_HOSTS`` is run under the
+sampling profiler of ``app.utils.profiling``. The profile is written to the
+profiles directory once the request has completed, and its URL is returned
+in the ``X-Profile-Url`` response header. The middleware is only installed
+when ``PROFILING_ENABLED`` is set, so other deployments pay nothing.
+
+The profiler samples every thread of the process, so work of concurrent
+requests shows up as well; profile on a quiet instance where possible. One
+request per process is profiled at a time; further profiling requests are
+served without a profile.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.platform import get_data_dir
+from app.utils.profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".speedscope.json"
+
+
+def get_profiles_dir() -> Path:
+    """
+    Get the directory profiles are written to.
+
+    Returns:
+        Path: ``profiles`` in the data directory
+    """
+    return get_data_dir() / "profiles"
+
+
+def remove_old_profiles(directory: Path, keep: int) -> None:
+    """
+    Remove all but the newest profiles.
+
+    Args:
+        directory (Path): Profiles directory
+        keep (int): Number of profiles to keep
+    """
+    profiles = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda path: path.name)
+    for path in profiles[:max(len(profiles) - keep, 0)]:
+        path.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that ask for it.
+
+    Attributes:
+        app (ASGIApp): Wrapped application
+        allowed_hosts (set): Client addresses allowed to request profiles
+        output_dir (Path): Directory the profiles are written to
+        interval (float): Seconds between profiler samples
+        max_files (int): Number of profiles kept
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        allowed_hosts: Iterable[str],
+        output_dir: Path,
+        interval: float,
+        max_files: int,
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+            allowed_hosts (Iterable[str]): Client addresses allowed to request profiles
+            output_dir (Path): Directory the profiles are written to
+            interval (float): Seconds between profiler samples
+            max_files (int): Number of profiles kept
+        """
+        self.app = app
+        self.allowed_hosts = set(allowed_hosts)
+        self.output_dir = output_dir
+        self.interval = interval
+        self.max_files = max_files
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        if client is None or client[0] not in self.allowed_hosts:
+            logger.warning("Profiling request from %s denied", client[0] if client else None)
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            logger.info("Profiler busy, serving %s without a profile", scope["path"])
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}"
+        url = scope["app"].url_path_for("read_profile", name=name).make_absolute_url(
+            Request(scope).base_url
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Url", str(url))
+            await send(message)
+
+        self._active = True
+        profiler = SamplingProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            self._active = False
+            await asyncio.to_thread(
+                self._write, profiler, name, f"{scope['method']} {scope['path']}"
+            )
+
+    def _requested(self, scope: Scope) -> bool:
+        query = scope["query_string"]
+        if b"profile" in query and parse_qs(query.decode("latin-1")).get("profile") == ["1"]:
+            return True
+        for key, value in scope["headers"]:
+            if key == PROFILE_HEADER:
+                return value == b"1"
+        return False
+
+    def _write(self, profiler: SamplingProfiler, name: str, title: str) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        profiler.write(self.output_dir / name, title)
+        remove_old_profiles(self.output_dir, self.max_files)
+        logger.info("Wrote profile of %s (%.3f s) to %s", title, profiler.duration, name)
@@ -0,0 +1,100 @@
+"""
+Database query timing middleware module.
+
+Collects the database queries issued while handling each request, see
+``app.db.instrumentation``, and reports their count and total time per
+database in a ``Server-Timing`` header, which browser developer tools
+show next to the request. The header is sent with the response start, so
+queries issued while a streaming response is being sent are not included.
+Requests issuing many queries are logged, which points at N+1 query
+patterns.
+"""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.instrumentation import (
+    QueryStats,
+    current_request_stats,
+    start_request_stats,
+    stop_request_stats,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    """
+    Format query statistics as a ``Server-Timing`` header value.
+
+    Args:
+        stats (QueryStats): Query statistics of the request
+        total_seconds (float): Time spent on the request so far
+
+    Returns:
+        str: Header value with one metric per database and the total time
+    """
+    metrics = []
+    for database in sorted(stats.counts):
+        count = stats.counts[database]
+        metrics.append(
+            f'{database};dur={stats.seconds[database] * 1000:.3f};'
+            f'desc="{count} {"query" if count == 1 else "queries"}"'
+        )
+    metrics.append(f"total;dur={total_seconds * 1000:.3f}")
+    return ", ".join(metrics)
+
+
+class QueryTimingMiddleware:
+    """
+    ASGI middleware reporting database queries per request.
+
+    Attributes:
+        app (ASGIApp): Wrapped application
+        server_timing (bool): Add a ``Server-Timing`` header to responses
+        query_count_warning (int): Requests issuing more queries are logged;
+            0 disables the warning
+    """
+    def __init__(self, app: ASGIApp, *, server_timing: bool, query_count_warning: int):
+        """
+        Initialize middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+            server_timing (bool): Add a ``Server-Timing`` header to responses
+            query_count_warning (int): Requests issuing more queries are logged;
+                0 disables the warning
+        """
+        self.app = app
+        self.server_timing = server_timing
+        self.query_count_warning = query_count_warning
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = start_request_stats()
+        stats = current_request_stats()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_request_stats(token)
+            if self.query_count_warning and stats.total_count > self.query_count_warning:
+                logger.warning(
+                    "%s %s issued %d database queries: %s",
+                    scope["method"],
+                    scope["path"],
+                    stats.total_count,
+                    stats.counts,
+                )
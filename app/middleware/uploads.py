@@ -0,0 +1,263 @@
+"""
+Upload admission control middleware module.
+
+Every request with a body reserves its size from a per-process upload
+budget before the body is read. The budget is not shared between worker
+processes, so with several workers the total is the budget times the
+number of workers. Requests larger than the per-request limit
+are rejected with 413, and requests that do not fit into the remaining
+budget with 429, so the memory and disk taken by concurrent uploads stays
+bounded. Requests without a ``Content-Length`` reserve the per-request
+limit, and the bytes actually received are counted, so a client cannot
+exceed the limit by sending more than it declared.
+
+Uploaded files are spooled by the multipart parser: each file stays in
+memory up to ``spool_max_size`` bytes and then rolls over to an anonymous
+temporary file under the application temp directory, which the operating
+system removes when the file is closed or the process exits. Both settings
+are process-wide, so they are applied for the lifetime of the application
+rather than on import.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from starlette.formparsers import MultiPartParser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class UploadBudget:
+    """
+    Per-process budget of request body bytes in flight.
+
+    Attributes:
+        limit_bytes (int): Total bytes that may be reserved at once
+        in_use_bytes (int): Bytes currently reserved
+    """
+    def __init__(self, limit_bytes: int):
+        """
+        Initialize budget.
+
+        Args:
+            limit_bytes (int): Total bytes that may be reserved at once
+        """
+        self.limit_bytes = limit_bytes
+        self.in_use_bytes = 0
+
+    def try_acquire(self, size: int) -> bool:
+        """
+        Reserve bytes if they fit into the remaining budget.
+
+        Args:
+            size (int): Bytes to reserve
+
+        Returns:
+            bool: True if the bytes were reserved
+        """
+        # Runs on the event loop without awaiting, so the check and update are atomic
+        if self.in_use_bytes + size > self.limit_bytes:
+            return False
+        self.in_use_bytes += size
+        return True
+
+    def release(self, size: int) -> None:
+        """
+        Return reserved bytes to the budget.
+
+        Args:
+            size (int): Bytes to release
+        """
+        self.in_use_bytes = max(self.in_use_bytes - size, 0)
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware enforcing per-request and per-process upload limits.
+
+    Attributes:
+        app (ASGIApp): Wrapped application
+        max_request_bytes (int): Largest accepted request body
+        budget (UploadBudget): Bytes in flight across concurrent requests
+    """
+    def __init__(self, app: ASGIApp, *, max_request_bytes: int, budget_bytes: int):
+        """
+        Initialize middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+            max_request_bytes (int): Largest accepted request body
+            budget_bytes (int): Bytes in flight across concurrent requests
+        """
+        self.app = app
+        self.max_request_bytes = max_request_bytes
+        self.budget = UploadBudget(budget_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        chunked = b"chunked" in headers.get(b"transfer-encoding", b"").lower()
+        if content_length is None and not chunked:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            declared = int(content_length) if content_length is not None else None
+        except ValueError:
+            await _send_error(send, 400, "Invalid Content-Length header")
+            return
+        if declared == 0:
+            await self.app(scope, receive, send)
+            return
+        if declared is not None and declared > self.max_request_bytes:
+            await _send_error(send, 413, self._too_large_detail())
+            return
+
+        reserved = declared if declared is not None else self.max_request_bytes
+        if not self.budget.try_acquire(reserved):
+            await _send_error(
+                send,
+                429,
+                "Too many concurrent uploads, retry later",
+                headers=[(b"retry-after", b"1")],
+            )
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > min(reserved, self.max_request_bytes):
+                    exceeded = True
+                    # Stop the application from reading the rest of the body
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                # Replace whatever error the application reports with 413
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await _send_error(send, 413, self._too_large_detail())
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            if not exceeded:
+                raise
+            if not response_started:
+                await _send_error(send, 413, self._too_large_detail())
+        finally:
+            self.budget.release(reserved)
+
+    def _too_large_detail(self) -> str:
+        return f"Request body exceeds the limit of {self.max_request_bytes} bytes"
+
+
+async def _send_error(
+    send: Send,
+    status_code: int,
+    detail: str,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None,
+) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            *(headers or []),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+@contextmanager
+def upload_spooling(spool_max_size: int, directory: Path) -> Iterator[None]:
+    """
+    Configure where and when uploaded files are spooled to disk.
+
+    ``tempfile.tempdir`` is the documented process-wide default directory for
+    temporary files, which the multipart parser uses for spooled uploads.
+    The previous settings are restored on exit.
+
+    Args:
+        spool_max_size (int): Bytes of each uploaded file kept in memory
+        directory (Path): Directory for spooled upload files
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    previous = (MultiPartParser.spool_max_size, tempfile.tempdir)
+    MultiPartParser.spool_max_size = spool_max_size
+    tempfile.tempdir = str(directory)
+    try:
+        yield
+    finally:
+        MultiPartParser.spool_max_size, tempfile.tempdir = previous
+
+
+def remove_stale_temp_files(directory: Path, max_age_seconds: float) -> int:
+    """
+    Remove files and directories left in the temp directory by crashed processes.
+
+    The temp directory is shared by all worker processes, so a directory is
+    only removed if nothing inside it changed for ``max_age_seconds`` either;
+    spill directories of running analyses keep getting new files.
+
+    Args:
+        directory (Path): Temp directory
+        max_age_seconds (float): Minimum age of removed entries
+
+    Returns:
+        int: Number of removed entries
+    """
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in directory.iterdir() if directory.is_dir() else []:
+        try:
+            if _modified_since(entry, cutoff):
+                continue
+            if entry.is_dir() and not entry.is_symlink():
+                shutil.rmtree(entry)
+            else:
+                os.unlink(entry)
+            removed += 1
+        except OSError as e:
+            logger.warning("Could not remove stale temp entry %s: %s", entry, e)
+    return removed
+
+
+def _modified_since(entry: Path, cutoff: float) -> bool:
+    if entry.lstat().st_mtime >= cutoff:
+        return True
+    if not entry.is_dir() or entry.is_symlink():
+        return False
+    for root, dirs, files in os.walk(entry):
+        for name in [*dirs, *files]:
+            try:
+                if os.lstat(os.path.join(root, name)).st_mtime >= cutoff:
+                    return True
+            except FileNotFoundError:
+                continue
+    return False
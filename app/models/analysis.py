@@ -0,0 +1,22 @@
+"""
+Data analysis request models module.
+"""
+from typing import Dict, List, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+
+class GroupBySpec(BaseModel):
+    """
+    Group-by request model.
+
+    Attributes:
+        keys (List[str]): Group-by columns
+        aggregations (Dict[str, Union[str, List[str]]]): Column to function(s)
+            mapping, e.g. ``{"amount": ["sum", "p95"]}``
+        named_aggregations (Dict[str, Tuple[str, str]]): Output name to
+            (column, function) mapping, e.g. ``{"total": ["amount", "sum"]}``
+    """
+    keys: List[str] = Field(min_length=1)
+    aggregations: Dict[str, Union[str, List[str]]] = Field(default_factory=dict)
+    named_aggregations: Dict[str, Tuple[str, str]] = Field(default_factory=dict)
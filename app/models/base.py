@@ -1,20 +1,38 @@
-"""
-Base models module for SQLModel models.
-"""
-from datetime import datetime
-from typing import Optional
-
-from pydantic import Field
-from sqlmodel import Field, SQLModel
-
-
-class TimestampMixin(SQLModel):
-    """
-    Timestamp mixin for models.
-    
-    Attributes:
-        created_at (datetime): Creation timestamp
-        updated_at (datetime): Last update timestamp
-    """
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+"""
+Base models module for SQLModel models.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import Field
+from sqlalchemy import DateTime
+from sqlmodel import Field, SQLModel
+
+
+def utc_now() -> datetime:
+    """
+    Get the current time as a timezone-aware UTC datetime.
+    
+    Returns:
+        datetime: Current UTC time
+    """
+    return datetime.now(timezone.utc)
+
+
+class TimestampMixin(SQLModel):
+    """
+    Timestamp mixin for models.
+    
+    Timestamps are timezone-aware and stored as ``TIMESTAMP WITH TIME ZONE``,
+    which SQLModel requires for ``datetime`` fields.
+    
+    Attributes:
+        created_at (datetime): Creation timestamp
+        updated_at (datetime): Last update timestamp
+    """
+    created_at: datetime = Field(
+        default_factory=utc_now, nullable=False, sa_type=DateTime(timezone=True)
+    )
+    updated_at: datetime = Field(
+        default_factory=utc_now, nullable=False, sa_type=DateTime(timezone=True)
+    )
@@ -0,0 +1,46 @@
+"""
+Analysis job models module.
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    """
+    Analysis job status.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisJob(BaseModel):
+    """
+    Analysis job model.
+
+    Attributes:
+        id (str): Job ID
+        status (JobStatus): Job status
+        filename (Optional[str]): Uploaded file name
+        options (Dict[str, Any]): Analysis options
+        rows_processed (int): Input rows processed so far
+        created_at (datetime): Creation timestamp
+        started_at (Optional[datetime]): Start timestamp
+        finished_at (Optional[datetime]): Completion timestamp
+        error (Optional[str]): Error message if the job failed
+        result (Optional[Dict[str, Any]]): Analysis results if the job completed
+    """
+    id: str
+    status: JobStatus = JobStatus.QUEUED
+    filename: Optional[str] = None
+    options: Dict[str, Any] = Field(default_factory=dict)
+    rows_processed: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
@@ -0,0 +1,357 @@
+"""
+Background analysis job service module.
+
+Uploads submitted in job mode are written under the data directory and
+queued on a bounded queue. A fixed number of worker tasks run the analysis
+in threads and persist status, progress and results as JSON, so any worker
+process sharing the data directory can report on a job. The processed rows
+are kept next to the job file for streaming export.
+
+The owning process refreshes the modification time of its unfinished jobs
+periodically. Queued or running jobs that have not been refreshed for a
+while belong to a process that stopped and are marked as failed, and
+finished jobs are removed once they are older than the retention period.
+"""
+import asyncio
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from app.models.job import AnalysisJob, JobStatus
+from app.services.data_analysis import DataAnalysisService
+from app.utils.platform import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Seconds between refreshes of unfinished jobs and cleanup passes
+HEARTBEAT_INTERVAL_SECONDS = 60.0
+
+# Unfinished jobs not refreshed for this many heartbeat intervals are orphaned
+ORPHAN_AFTER_HEARTBEATS = 5
+
+UNFINISHED_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when the analysis job queue has no free slots.
+    """
+
+
+class AnalysisJobManager:
+    """
+    Analysis job manager.
+
+    Attributes:
+        service (DataAnalysisService): Data analysis service
+        workers (int): Number of concurrent worker tasks
+        queue_size (int): Maximum number of queued jobs
+        ttl (Optional[float]): Seconds finished jobs are kept, None keeps them
+        heartbeat_interval (float): Seconds between refreshes of unfinished jobs
+    """
+    def __init__(
+        self,
+        service: DataAnalysisService,
+        *,
+        workers: int,
+        queue_size: int,
+        jobs_dir: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize job manager.
+
+        Args:
+            service (DataAnalysisService): Data analysis service
+            workers (int): Number of concurrent worker tasks
+            queue_size (int): Maximum number of queued jobs
+            jobs_dir (Optional[Path]): Directory for job files, defaults to
+                ``jobs`` under the data directory
+            ttl (Optional[float]): Seconds finished jobs are kept, None keeps them
+            heartbeat_interval (float): Seconds between refreshes of unfinished jobs
+        """
+        self.service = service
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self.heartbeat_interval = heartbeat_interval
+        self._jobs_dir = jobs_dir
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._active: Dict[str, AnalysisJob] = {}
+        # Progress is saved from worker threads while the event loop saves too
+        self._save_lock = threading.Lock()
+
+    @property
+    def jobs_dir(self) -> Path:
+        """
+        Get job files directory, creating it if needed.
+
+        Returns:
+            Path: Job files directory
+        """
+        if self._jobs_dir is None:
+            self._jobs_dir = get_data_dir() / "jobs"
+        self._jobs_dir.mkdir(parents=True, exist_ok=True)
+        return self._jobs_dir
+
+    async def start(self) -> None:
+        """
+        Start worker tasks if they are not running.
+
+        Orphaned and expired jobs are cleaned up first.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        await asyncio.to_thread(self.cleanup)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        """
+        Cancel worker tasks.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def submit(
+        self, upload: IO[bytes], *, filename: str, options: Dict[str, Any]
+    ) -> AnalysisJob:
+        """
+        Store an upload and queue it for analysis.
+
+        Args:
+            upload (IO[bytes]): Uploaded file object
+            filename (str): Uploaded file name
+            options (Dict[str, Any]): Keyword arguments for ``analyze_csv``
+
+        Returns:
+            AnalysisJob: Queued job
+
+        Raises:
+            JobQueueFullError: If the queue has no free slots
+        """
+        await self.start()
+        if self._queue.full():
+            raise JobQueueFullError("Analysis job queue is full")
+
+        job = AnalysisJob(id=uuid.uuid4().hex, filename=filename, options=options)
+        job_dir = self.jobs_dir / job.id
+        job_dir.mkdir()
+        try:
+            await asyncio.to_thread(self._copy_upload, upload, job_dir / "upload")
+            self._save(job)
+            self._active[job.id] = job
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            self._active.pop(job.id, None)
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise JobQueueFullError("Analysis job queue is full")
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        return job
+
+    def record_completed(
+        self,
+        *,
+        filename: str,
+        options: Dict[str, Any],
+        result: Dict[str, Any],
+        write_rows: Callable[[Path], None],
+    ) -> AnalysisJob:
+        """
+        Record an analysis that ran outside the queue as a completed job.
+
+        The job can then be read and exported like a queued job.
+
+        Args:
+            filename (str): Name describing the analyzed input
+            options (Dict[str, Any]): Analysis options
+            result (Dict[str, Any]): Analysis results
+            write_rows (Callable[[Path], None]): Stores the processed rows in the
+                given directory, see ``app.utils.export.write_frame_parts``
+
+        Returns:
+            AnalysisJob: Completed job
+        """
+        now = datetime.utcnow()
+        job = AnalysisJob(
+            id=uuid.uuid4().hex,
+            status=JobStatus.COMPLETED,
+            filename=filename,
+            options=options,
+            started_at=now,
+            finished_at=now,
+            result=result,
+        )
+        job_dir = self.jobs_dir / job.id
+        job_dir.mkdir()
+        try:
+            write_rows(job_dir / "processed")
+            self._save(job)
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        return job
+
+    def cleanup(self) -> None:
+        """
+        Fail orphaned jobs and remove expired ones.
+
+        Queued or running jobs of other processes count as orphaned once they
+        have not been refreshed for ``ORPHAN_AFTER_HEARTBEATS`` heartbeat
+        intervals. Finished jobs are removed once they are older than ``ttl``.
+        """
+        now = time.time()
+        orphaned_before = now - self.heartbeat_interval * ORPHAN_AFTER_HEARTBEATS
+        expired_before = None if self.ttl is None else now - self.ttl
+        active = set(self._active)
+
+        for job_dir in self.jobs_dir.iterdir():
+            if not job_dir.is_dir() or job_dir.name in active:
+                continue
+            path = job_dir / "job.json"
+            try:
+                job = AnalysisJob.model_validate_json(path.read_text(encoding="utf-8"))
+                modified = path.stat().st_mtime
+            except (OSError, ValueError):
+                # Directories of uploads that never got a job file
+                if (
+                    expired_before is not None
+                    and not path.exists()
+                    and job_dir.stat().st_mtime < expired_before
+                ):
+                    shutil.rmtree(job_dir, ignore_errors=True)
+                continue
+
+            if job.status in UNFINISHED_STATUSES:
+                if modified < orphaned_before:
+                    logger.warning("Failing orphaned analysis job %s", job.id)
+                    job.status = JobStatus.FAILED
+                    job.error = "Job was interrupted because its server process stopped"
+                    job.finished_at = datetime.utcnow()
+                    self._save(job)
+                    (job_dir / "upload").unlink(missing_ok=True)
+            elif expired_before is not None:
+                finished_at = job.finished_at or job.created_at
+                if finished_at.replace(tzinfo=timezone.utc).timestamp() < expired_before:
+                    shutil.rmtree(job_dir, ignore_errors=True)
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """
+        Get job by ID.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Optional[AnalysisJob]: Job instance or None
+        """
+        if job_id in self._active:
+            return self._active[job_id]
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        path = self.jobs_dir / job_id / "job.json"
+        if not path.exists():
+            return None
+        return AnalysisJob.model_validate_json(path.read_text(encoding="utf-8"))
+
+    def export_dir(self, job_id: str) -> Optional[Path]:
+        """
+        Get the directory with a completed job's processed rows.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Optional[Path]: Processed rows directory, or None if the job has
+                not completed or has no stored rows
+        """
+        job = self.get(job_id)
+        if job is None or job.status != JobStatus.COMPLETED:
+            return None
+        path = self.jobs_dir / job_id / "processed"
+        return path if path.is_dir() else None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await asyncio.to_thread(self._touch_active)
+                await asyncio.to_thread(self.cleanup)
+            except OSError as e:
+                logger.warning("Error cleaning up analysis jobs: %s", e)
+
+    def _touch_active(self) -> None:
+        for job_id in list(self._active):
+            try:
+                os.utime(self.jobs_dir / job_id / "job.json")
+            except FileNotFoundError:
+                pass
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(self._active[job_id])
+            except Exception:
+                logger.exception("Analysis job %s crashed", job_id)
+            finally:
+                self._active.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _run(self, job: AnalysisJob) -> None:
+        upload_path = self.jobs_dir / job.id / "upload"
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        self._save(job)
+
+        def on_progress(rows_processed: int) -> None:
+            job.rows_processed = rows_processed
+            self._save(job)
+
+        try:
+            job.result = await asyncio.to_thread(
+                self.service.analyze_csv,
+                upload_path,
+                on_progress=on_progress,
+                export_dir=self.jobs_dir / job.id / "processed",
+                **job.options,
+            )
+            job.status = JobStatus.COMPLETED
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = f"Error processing file: {str(e)}"
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._save(job)
+            upload_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _copy_upload(upload: IO[bytes], path: Path) -> None:
+        upload.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(upload, f, length=1024 * 1024)
+
+    def _save(self, job: AnalysisJob) -> None:
+        # Write to a temporary file first so readers never see a partial document
+        path = self.jobs_dir / job.id / "job.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with self._save_lock:
+            tmp_path.write_text(job.model_dump_json(), encoding="utf-8")
+            os.replace(tmp_path, path)
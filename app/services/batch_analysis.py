@@ -0,0 +1,240 @@
+"""
+Multi-file analysis service module.
+
+Each file of a batch is processed in its own worker process, so a batch
+takes about as long as its largest file instead of the sum of all files.
+Uploads are copied to temporary files first because worker processes can
+only open files by path. Workers return the usual per-file statistics plus
+mergeable column statistics, from which the combined view is built without
+holding all files in memory at once. When the files are concatenated, each
+worker stores its processed rows as export parts, and the parts are moved
+into one dataset in upload order.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from app.services.analysis_jobs import AnalysisJobManager
+from app.services.data_analysis import DataAnalysisService
+from app.utils.export import write_frame_parts
+from app.utils.parallel_csv import ColumnStats, frame_stats, merge_frame_stats
+
+
+def _analyze_file(
+    path: Path,
+    chunk_size: int,
+    max_memory_hashes: int,
+    optimize: bool,
+    parts_dir: Optional[Path],
+) -> Dict[str, Any]:
+    # Files already run in parallel, so each one is parsed by a single process
+    service = DataAnalysisService(chunk_size, max_memory_hashes, parallel_workers=1)
+    df = service.load_csv(path, optimize=optimize)
+    if parts_dir is not None:
+        write_frame_parts(df, parts_dir, rows_per_part=chunk_size)
+    return {
+        "result": service.describe(df),
+        "column_stats": frame_stats(df),
+        "data_types": {column: str(df[column].dtype) for column in df.columns},
+    }
+
+
+class BatchAnalysisService:
+    """
+    Multi-file analysis service.
+
+    Attributes:
+        service (DataAnalysisService): Data analysis service
+        job_manager (AnalysisJobManager): Job manager recording concatenated datasets
+        workers (int): Maximum worker processes per batch
+        executor (Optional[Executor]): Process pool shared by all batches
+    """
+    def __init__(
+        self,
+        service: DataAnalysisService,
+        job_manager: AnalysisJobManager,
+        *,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize service.
+
+        Args:
+            service (DataAnalysisService): Data analysis service
+            job_manager (AnalysisJobManager): Job manager recording concatenated datasets
+            workers (Optional[int]): Maximum worker processes per batch, defaults
+                to the number of CPUs
+            executor (Optional[Executor]): Process pool shared by all batches,
+                defaults to a pool of ``workers`` processes per batch
+        """
+        self.service = service
+        self.job_manager = job_manager
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+
+    def analyze_files(
+        self,
+        files: Sequence[Tuple[str, IO[bytes]]],
+        *,
+        optimize: bool = False,
+        concatenate: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Process several input files concurrently and compute their statistics.
+
+        A file that fails to process is reported with its error and left out of
+        the combined view and the concatenated dataset.
+
+        Args:
+            files (Sequence[Tuple[str, IO[bytes]]]): File names and binary file objects
+            optimize (bool): Downcast numerics, categorize strings and parse dates
+            concatenate (bool): Store the processed rows of all files as one
+                dataset, recorded as a completed analysis job
+
+        Returns:
+            Dict[str, Any]: Per-file results, the combined schema and statistics,
+                and the concatenated dataset's job ID when requested
+        """
+        with tempfile.TemporaryDirectory(prefix="batch-") as work_dir:
+            work_dir = Path(work_dir)
+            tasks = []
+            for index, (_, upload) in enumerate(files):
+                path = work_dir / f"upload-{index}"
+                upload.seek(0)
+                with open(path, "wb") as f:
+                    shutil.copyfileobj(upload, f, length=1024 * 1024)
+                parts_dir = work_dir / f"parts-{index}" if concatenate else None
+                tasks.append((
+                    path, self.service.chunk_size, self.service.max_memory_hashes,
+                    optimize, parts_dir,
+                ))
+
+            outcomes = self._run(tasks)
+
+            file_results = []
+            completed = []
+            for (filename, _), task, outcome in zip(files, tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    file_results.append({
+                        "filename": filename,
+                        "status": "failed",
+                        "error": f"Error processing file: {str(outcome)}",
+                    })
+                    continue
+                file_results.append({
+                    "filename": filename,
+                    "status": "completed",
+                    "result": outcome["result"],
+                })
+                completed.append((filename, task[4], outcome))
+
+            response = {
+                "file_count": len(files),
+                "files": file_results,
+                "combined": self._combine(completed),
+            }
+            if concatenate and completed:
+                job = self.job_manager.record_completed(
+                    filename=f"batch of {len(completed)} files",
+                    options={"optimize": optimize, "concatenate": True},
+                    result=response["combined"],
+                    write_rows=lambda directory: self._concatenate_parts(
+                        [
+                            (parts_dir, list(outcome["data_types"]))
+                            for _, parts_dir, outcome in completed
+                        ],
+                        response["combined"]["columns"],
+                        directory,
+                    ),
+                )
+                response["dataset_job_id"] = job.id
+            return response
+
+    def _run(self, tasks: List[tuple]) -> List[Any]:
+        workers = min(self.workers, len(tasks))
+        if workers <= 1:
+            outcomes = []
+            for task in tasks:
+                try:
+                    outcomes.append(_analyze_file(*task))
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+
+        if self.executor is not None:
+            return self._run_in(self.executor, tasks)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return self._run_in(executor, tasks)
+
+    @staticmethod
+    def _run_in(executor: Executor, tasks: List[tuple]) -> List[Any]:
+        # Larger files start first so they do not end up last in the schedule
+        order = sorted(range(len(tasks)), key=lambda i: -tasks[i][0].stat().st_size)
+        futures: Dict[int, Future] = {}
+        try:
+            for i in order:
+                futures[i] = executor.submit(_analyze_file, *tasks[i])
+            outcomes = []
+            for i in range(len(tasks)):
+                try:
+                    outcomes.append(futures[i].result())
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+        finally:
+            for future in futures.values():
+                future.cancel()
+
+    @staticmethod
+    def _combine(completed: List[Tuple[str, Optional[Path], Dict[str, Any]]]) -> Dict[str, Any]:
+        columns: List[str] = []
+        data_types: Dict[str, List[str]] = {}
+        stats: Dict[str, ColumnStats] = {}
+        for _, _, outcome in completed:
+            for column, dtype in outcome["data_types"].items():
+                if column not in data_types:
+                    columns.append(column)
+                    data_types[column] = []
+                if dtype not in data_types[column]:
+                    data_types[column].append(dtype)
+            stats = merge_frame_stats(stats, outcome["column_stats"])
+
+        missing_columns = {}
+        for filename, _, outcome in completed:
+            missing = [column for column in columns if column not in outcome["data_types"]]
+            if missing:
+                missing_columns[filename] = missing
+        return {
+            "row_count": sum(outcome["result"]["row_count"] for _, _, outcome in completed),
+            "column_count": len(columns),
+            "columns": columns,
+            # Columns whose type differs between files list every type seen
+            "data_types": {
+                column: types[0] if len(types) == 1 else types
+                for column, types in data_types.items()
+            },
+            "missing_columns": missing_columns,
+            "summary_stats": {column: stats[column].as_dict() for column in stats},
+        }
+
+    @staticmethod
+    def _concatenate_parts(
+        parts: List[Tuple[Path, List[str]]], columns: List[str], directory: Path
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for parts_dir, file_columns in parts:
+            for part in sorted(parts_dir.glob("part-*.pkl")):
+                target = directory / f"part-{count:06d}.pkl"
+                if file_columns == columns:
+                    # Parts with the combined columns are moved without being read
+                    shutil.move(part, target)
+                else:
+                    pd.read_pickle(part).reindex(columns=columns).to_pickle(target)
+                count += 1
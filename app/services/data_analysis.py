@@ -0,0 +1,436 @@
+"""
+Data analysis service module.
+
+Inputs may be CSV, JSON Lines, Parquet or Arrow IPC; the reader is chosen
+from the leading bytes of the file.
+"""
+import os
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.models.analysis import GroupBySpec
+from app.utils.data_processing import process_dataframe_chunks
+from app.utils.dataset_cache import DatasetCache
+from app.utils.dtype_optimization import (
+    concat_optimized,
+    memory_usage_bytes,
+    optimize_dtypes,
+)
+from app.utils.export import write_frame_parts
+from app.utils.filter_expression import compile_filter
+from app.utils.grouping import GroupIndexCache, aggregate_groups
+from app.utils.input_formats import CSV, detect_format, read_input_chunks
+from app.utils.parallel_csv import ColumnStats, ParallelCSVReader
+from app.utils.sampling import (
+    DEFAULT_SAMPLE_SIZE,
+    confidence_intervals,
+    sample_chunks,
+    sample_csv,
+)
+
+
+class DataAnalysisService:
+    """
+    Data analysis service.
+
+    Attributes:
+        chunk_size (int): Rows per chunk when reading input files
+        max_memory_hashes (int): Row hashes kept in memory before spilling
+        parallel_workers (int): Worker processes for parsing large CSV files
+        parallel_min_bytes (int): Smallest CSV file parsed in parallel
+        executor (Optional[Executor]): Process pool shared by parallel reads
+        group_index_cache (GroupIndexCache): Group indexes per dataset and key set
+        dataset_cache (DatasetCache): Processed DataFrames kept for follow-up queries
+    """
+    def __init__(
+        self,
+        chunk_size: int,
+        max_memory_hashes: int,
+        *,
+        parallel_workers: Optional[int] = None,
+        parallel_min_bytes: int = 256 * 1024 ** 2,
+        dataset_cache_bytes: int = 0,
+        dataset_cache_ttl: float = 1800,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize service.
+
+        Args:
+            chunk_size (int): Rows per chunk when reading input files
+            max_memory_hashes (int): Row hashes kept in memory before spilling
+            parallel_workers (Optional[int]): Worker processes for parsing large
+                CSV files, defaults to the number of CPUs; 1 disables parallel parsing
+            parallel_min_bytes (int): Smallest CSV file parsed in parallel
+            dataset_cache_bytes (int): Byte budget of cached datasets; 0 disables caching
+            dataset_cache_ttl (float): Seconds an unused dataset stays cached
+            executor (Optional[Executor]): Process pool shared by parallel reads,
+                defaults to a pool per read
+        """
+        self.chunk_size = chunk_size
+        self.max_memory_hashes = max_memory_hashes
+        self.parallel_workers = parallel_workers or os.cpu_count() or 1
+        self.parallel_min_bytes = parallel_min_bytes
+        self.executor = executor
+        self.group_index_cache = GroupIndexCache()
+        # Group indexes of a dataset are useless once the dataset is gone
+        self.dataset_cache = DatasetCache(
+            dataset_cache_bytes, dataset_cache_ttl, on_evict=self.group_index_cache.invalidate
+        )
+
+    def load_csv(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        *,
+        optimize: bool = False,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read and process a CSV, JSON Lines, Parquet or Arrow file in chunks.
+
+        Args:
+            source (Union[str, Path, IO[bytes]]): Path to input file or binary file object
+            optimize (bool): Downcast numerics, categorize strings and parse dates
+            on_progress (Optional[Callable[[int], None]]): Called with the number
+                of input rows processed so far after each chunk
+
+        Returns:
+            pd.DataFrame: Processed DataFrame
+        """
+        return self._load_csv(source, optimize=optimize, on_progress=on_progress)[0]
+
+    def analyze_csv(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        *,
+        optimize: bool = False,
+        on_progress: Optional[Callable[[int], None]] = None,
+        export_dir: Optional[Path] = None,
+        cache: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Process an input file in chunks and compute its statistics.
+
+        Args:
+            source (Union[str, Path, IO[bytes]]): Path to input file or binary file object
+            optimize (bool): Downcast numerics, categorize strings and parse dates
+            on_progress (Optional[Callable[[int], None]]): Called with the number
+                of input rows processed so far after each chunk
+            export_dir (Optional[Path]): Directory to store the processed rows in
+                for a later streaming export
+            cache (bool): Keep the processed DataFrame in the dataset cache and
+                add its ``dataset_id`` to the results; the ID is None if the
+                DataFrame does not fit the cache
+
+        Returns:
+            Dict[str, Any]: Processing results
+        """
+        processed_df, memory_before, column_stats = self._load_csv(
+            source, optimize=optimize, on_progress=on_progress
+        )
+        if export_dir is not None:
+            write_frame_parts(processed_df, export_dir, rows_per_part=self.chunk_size)
+        stats = self.describe(processed_df, column_stats)
+        if optimize:
+            stats["memory_usage"] = {
+                "before_bytes": memory_before,
+                "after_bytes": memory_usage_bytes(processed_df),
+            }
+        if cache:
+            stats["dataset_id"] = self.dataset_cache.put(processed_df)
+        return stats
+
+    def profile_sample(
+        self,
+        source: IO[bytes],
+        *,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Profile an input file from a random sample of its rows.
+
+        The sample is processed like a full upload and the response has the
+        same fields as ``analyze_csv``, computed from the sample, plus the
+        sampling details and confidence intervals of the numeric column means.
+
+        Args:
+            source (IO[bytes]): Binary file object
+            sample_size (int): Number of rows to draw
+            seed (Optional[int]): Random seed for reproducible samples
+
+        Returns:
+            Dict[str, Any]: Sample statistics, sampling details and confidence intervals
+        """
+        input_format = detect_format(source)
+        if input_format == CSV:
+            sample, sampling = sample_csv(
+                source, sample_size, seed=seed, chunksize=self.chunk_size
+            )
+        else:
+            sample, sampling = sample_chunks(
+                read_input_chunks(source, chunksize=self.chunk_size, format=input_format),
+                sample_size,
+                seed=seed,
+            )
+        processed_df = pd.concat(
+            process_dataframe_chunks([sample], max_memory_hashes=self.max_memory_hashes),
+            ignore_index=True,
+        )
+        stats = self.describe(processed_df)
+        stats["sampling"] = sampling
+        stats["confidence_intervals"] = confidence_intervals(
+            processed_df, sampling["estimated_row_count"]
+        )
+        return stats
+
+    def filter_csv(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        expression: str,
+        *,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Process an input file in chunks and select rows matching a filter expression.
+
+        Args:
+            source (Union[str, Path, IO[bytes]]): Path to input file or binary file object
+            expression (str): Filter expression
+            limit (int): Maximum number of matching rows to return
+
+        Returns:
+            Dict[str, Any]: Matching row count and the first ``limit`` matching rows
+
+        Raises:
+            FilterExpressionError: If the expression is invalid
+        """
+        compiled = compile_filter(expression)
+        chunks = process_dataframe_chunks(
+            read_input_chunks(source, chunksize=self.chunk_size),
+            max_memory_hashes=self.max_memory_hashes,
+        )
+        return self._filter_chunks(chunks, expression, compiled, limit)
+
+    def filter_frame(
+        self, df: pd.DataFrame, expression: str, *, limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Select rows of a processed DataFrame matching a filter expression.
+
+        Args:
+            df (pd.DataFrame): Processed DataFrame
+            expression (str): Filter expression
+            limit (int): Maximum number of matching rows to return
+
+        Returns:
+            Dict[str, Any]: Matching row count and the first ``limit`` matching rows
+
+        Raises:
+            FilterExpressionError: If the expression is invalid
+        """
+        return self._filter_chunks([df], expression, compile_filter(expression), limit)
+
+    @staticmethod
+    def _filter_chunks(chunks, expression: str, compiled, limit: int) -> Dict[str, Any]:
+        row_count = 0
+        match_count = 0
+        columns = []
+        rows = []
+        for chunk in chunks:
+            columns = list(chunk.columns)
+            mask = compiled.mask(chunk)
+            row_count += len(chunk)
+            match_count += int(mask.sum())
+            if len(rows) < limit:
+                positions = np.flatnonzero(mask)[: limit - len(rows)]
+                rows.extend(chunk.iloc[positions].to_dict(orient="records"))
+        return {
+            "expression": expression,
+            "row_count": row_count,
+            "match_count": match_count,
+            "columns": columns,
+            "rows": rows,
+        }
+
+    def group_csv(self, source: Union[str, Path, IO[bytes]], spec: GroupBySpec) -> Dict[str, Any]:
+        """
+        Process an input file and aggregate it by several keys.
+
+        Args:
+            source (Union[str, Path, IO[bytes]]): Path to input file or binary file object
+            spec (GroupBySpec): Group-by keys and aggregations
+
+        Returns:
+            Dict[str, Any]: Group count, output columns and one row per group
+
+        Raises:
+            AggregationSpecError: If the specification is invalid
+        """
+        return self.aggregate(self.load_csv(source), spec)
+
+    def aggregate(
+        self,
+        df: pd.DataFrame,
+        spec: GroupBySpec,
+        *,
+        dataset_key: Optional[Hashable] = None,
+    ) -> Dict[str, Any]:
+        """
+        Aggregate a processed DataFrame by several keys.
+
+        Args:
+            df (pd.DataFrame): Processed DataFrame
+            spec (GroupBySpec): Group-by keys and aggregations
+            dataset_key (Optional[Hashable]): Dataset identifier; when given, the
+                group index is cached and reused by later aggregations
+
+        Returns:
+            Dict[str, Any]: Group count, output columns and one row per group
+
+        Raises:
+            AggregationSpecError: If the specification is invalid
+        """
+        result = aggregate_groups(
+            df,
+            spec.keys,
+            spec.aggregations,
+            spec.named_aggregations,
+            cache=self.group_index_cache,
+            dataset_key=dataset_key,
+        )
+        result = result.astype(object).where(result.notna(), None)
+        return {
+            "group_count": len(result),
+            "columns": list(result.columns),
+            "rows": result.to_dict(orient="records"),
+        }
+
+    def describe(
+        self, df: pd.DataFrame, column_stats: Optional[Dict[str, ColumnStats]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute statistics of a processed DataFrame.
+
+        Args:
+            df (pd.DataFrame): Processed DataFrame
+            column_stats (Optional[Dict[str, ColumnStats]]): Statistics of the numeric
+                columns merged while parsing in parallel; only the quantiles are
+                then computed from the DataFrame
+
+        Returns:
+            Dict[str, Any]: Row and column counts, dtypes, sample rows and summary statistics
+        """
+        if column_stats:
+            summary = self._summary_from_stats(df, column_stats)
+        else:
+            summary = df.describe()
+        # Statistics such as std are undefined for single rows and are not valid JSON as NaN
+        summary = summary.astype(object).where(summary.notna(), None)
+        return {
+            "row_count": len(df),
+            "column_count": len(df.columns),
+            "columns": list(df.columns),
+            "data_types": {col: str(df[col].dtype) for col in df.columns},
+            "sample_data": df.head(5).to_dict(orient="records"),
+            "summary_stats": summary.to_dict(),
+        }
+
+    @staticmethod
+    def _summary_from_stats(
+        df: pd.DataFrame, column_stats: Dict[str, ColumnStats]
+    ) -> pd.DataFrame:
+        # A column numeric in some byte ranges only is not numeric after concatenation
+        numeric = {
+            column: column_stats[column]
+            for column in df.select_dtypes(include="number").columns
+            if column in column_stats
+        }
+        if not numeric:
+            return df.describe()
+        quantiles = df[list(numeric)].quantile([0.25, 0.5, 0.75])
+        return pd.DataFrame(
+            {
+                column: [
+                    stats.count, stats.mean, stats.std, stats.min,
+                    *quantiles[column].tolist(), stats.max,
+                ]
+                for column, stats in numeric.items()
+            },
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+        )
+
+    def _parallel_reader(
+        self, source: Union[str, Path, IO[bytes]]
+    ) -> Optional[ParallelCSVReader]:
+        if self.parallel_workers < 2 or detect_format(source) != CSV:
+            return None
+        if isinstance(source, (str, Path)):
+            size = os.path.getsize(source)
+        else:
+            size = source.seek(0, os.SEEK_END)
+            source.seek(0)
+        if size < self.parallel_min_bytes:
+            return None
+        return ParallelCSVReader(
+            source,
+            processes=self.parallel_workers,
+            max_memory_hashes=self.max_memory_hashes,
+            executor=self.executor,
+        )
+
+    def _load_csv(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        *,
+        optimize: bool,
+        on_progress: Optional[Callable[[int], None]],
+    ) -> Tuple[pd.DataFrame, Optional[int], Optional[Dict[str, ColumnStats]]]:
+        reader = self._parallel_reader(source)
+        if reader is not None:
+            def progress(frames):
+                for frame in frames:
+                    yield frame
+                    if on_progress is not None:
+                        on_progress(reader.rows_read)
+
+            # Large CSV files are parsed and processed in parallel byte ranges
+            chunks = progress(reader)
+        else:
+            chunks = self._process_chunks(source, on_progress)
+        if not optimize:
+            df = pd.concat(chunks, ignore_index=True)
+            return df, None, reader.stats if reader is not None else None
+
+        memory_before = 0
+        optimized_chunks = []
+        for chunk in chunks:
+            memory_before += memory_usage_bytes(chunk)
+            optimized_chunks.append(optimize_dtypes(chunk))
+        df = optimize_dtypes(concat_optimized(optimized_chunks))
+        return df, memory_before, reader.stats if reader is not None else None
+
+    def _process_chunks(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        on_progress: Optional[Callable[[int], None]],
+    ):
+        rows_processed = 0
+
+        def counted(chunks):
+            nonlocal rows_processed
+            for chunk in chunks:
+                yield chunk
+                rows_processed += len(chunk)
+                if on_progress is not None:
+                    on_progress(rows_processed)
+
+        # Read and process input file in chunks, dropping duplicates across chunks
+        return process_dataframe_chunks(
+            counted(read_input_chunks(source, chunksize=self.chunk_size)),
+            max_memory_hashes=self.max_memory_hashes,
+        )
@@ -0,0 +1,254 @@
+"""
+Dataset bulk load service module.
+
+Processed DataFrames are loaded into PostgreSQL with asyncpg's binary
+``COPY``, which avoids building an INSERT statement and an ORM object per
+row. Rows are converted to Python tuples one batch at a time in a worker
+thread, so memory stays bounded by the batch size and the event loop is
+not blocked.
+
+Target tables are given a configurable name prefix and tables owned by the
+application are refused, so uploads can never replace or write into them.
+"""
+import asyncio
+import re
+import time
+from typing import Any, Collection, Dict, Iterator, List, Literal, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+
+# PostgreSQL truncates longer identifiers
+MAX_IDENTIFIER_LENGTH = 63
+
+IfExists = Literal["append", "replace", "fail"]
+
+
+class DatasetLoadError(ValueError):
+    """
+    Raised when a dataset cannot be mapped to the target table.
+    """
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a PostgreSQL identifier.
+
+    Args:
+        name (str): Identifier
+
+    Returns:
+        str: Quoted identifier
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def postgres_type(dtype: Any) -> str:
+    """
+    Get the PostgreSQL column type for a pandas dtype.
+
+    Args:
+        dtype (Any): pandas dtype
+
+    Returns:
+        str: PostgreSQL column type
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        itemsize = pd.api.types.pandas_dtype(dtype).itemsize
+        if pd.api.types.is_unsigned_integer_dtype(dtype):
+            itemsize *= 2
+        if itemsize <= 2:
+            return "SMALLINT"
+        if itemsize <= 4:
+            return "INTEGER"
+        if itemsize <= 8:
+            return "BIGINT"
+        return "NUMERIC"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL" if pd.api.types.pandas_dtype(dtype).itemsize <= 4 else "DOUBLE PRECISION"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return "TIMESTAMPTZ"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def iter_record_batches(df: pd.DataFrame, batch_size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Convert DataFrame rows to batches of Python tuples for ``COPY``.
+
+    Missing values become None; numpy scalars become native Python values.
+    Values of text columns become strings, as ``fillna`` may have put numbers
+    into them.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        batch_size (int): Rows per batch
+
+    Yields:
+        List[Tuple[Any, ...]]: Batch of records
+    """
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        columns = []
+        for position in range(batch.shape[1]):
+            series = batch.iloc[:, position]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = [None if pd.isna(v) else v.to_pydatetime() for v in series]
+            elif not pd.api.types.is_numeric_dtype(series):
+                text = series.astype(str).astype(object)
+                values = text.where(series.notna(), None).tolist()
+            elif series.hasnans:
+                values = series.astype(object).where(series.notna(), None).tolist()
+            else:
+                values = series.tolist()
+            columns.append(values)
+        yield list(zip(*columns))
+
+
+class DatasetLoadService:
+    """
+    Dataset bulk load service.
+
+    Attributes:
+        engine (Optional[AsyncEngine]): Async PostgreSQL engine
+        batch_size (int): Rows per COPY batch
+        table_prefix (str): Prefix added to every target table name
+        reserved_tables (FrozenSet[str]): Table names owned by the application
+    """
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine],
+        batch_size: int,
+        *,
+        table_prefix: str = "",
+        reserved_tables: Collection[str] = (),
+    ):
+        """
+        Initialize service.
+
+        Args:
+            engine (Optional[AsyncEngine]): Async PostgreSQL engine
+            batch_size (int): Rows per COPY batch
+            table_prefix (str): Prefix added to every target table name
+            reserved_tables (Collection[str]): Table names owned by the application
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+        self.table_prefix = table_prefix
+        self.reserved_tables = frozenset(name.lower() for name in reserved_tables)
+
+    async def load(
+        self, df: pd.DataFrame, table_name: str, *, if_exists: IfExists = "append"
+    ) -> Dict[str, Any]:
+        """
+        Load a DataFrame into a PostgreSQL table.
+
+        Args:
+            df (pd.DataFrame): Processed DataFrame
+            table_name (str): Target table name, without the table prefix
+            if_exists (IfExists): Append to, replace, or refuse an existing table
+
+        Returns:
+            Dict[str, Any]: Table, row count, duration and throughput
+
+        Raises:
+            DatasetLoadError: If the table or columns cannot be mapped
+            RuntimeError: If the database engine is not initialized
+        """
+        if self.engine is None:
+            raise RuntimeError("Database engine not initialized")
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            return await self.load_with_connection(
+                raw.driver_connection, df, table_name, if_exists=if_exists
+            )
+
+    async def load_with_connection(
+        self, connection: Any, df: pd.DataFrame, table_name: str, *, if_exists: IfExists = "append"
+    ) -> Dict[str, Any]:
+        """
+        Load a DataFrame into a PostgreSQL table over an asyncpg connection.
+
+        Args:
+            connection (Any): asyncpg connection
+            df (pd.DataFrame): Processed DataFrame
+            table_name (str): Target table name, without the table prefix
+            if_exists (IfExists): Append to, replace, or refuse an existing table
+
+        Returns:
+            Dict[str, Any]: Table, row count, duration and throughput
+
+        Raises:
+            DatasetLoadError: If the table or columns cannot be mapped
+        """
+        if not IDENTIFIER_PATTERN.match(table_name):
+            raise DatasetLoadError(
+                "Table name must start with a letter or underscore and contain only "
+                "letters, digits and underscores"
+            )
+        table_name = f"{self.table_prefix}{table_name}"
+        if len(table_name) > MAX_IDENTIFIER_LENGTH:
+            raise DatasetLoadError(
+                f"Table name {table_name!r} is longer than {MAX_IDENTIFIER_LENGTH} characters"
+            )
+        if table_name.lower() in self.reserved_tables:
+            raise DatasetLoadError(f"Table {table_name!r} belongs to the application")
+        columns = [str(column) for column in df.columns]
+        if len(set(columns)) != len(columns):
+            raise DatasetLoadError("Column names must be unique")
+
+        started = time.perf_counter()
+        async with connection.transaction():
+            existing = await self._existing_columns(connection, table_name)
+            if existing and if_exists == "fail":
+                raise DatasetLoadError(f"Table {table_name!r} already exists")
+            if existing and if_exists == "replace":
+                await connection.execute(f"DROP TABLE {quote_identifier(table_name)}")
+                existing = []
+            if existing:
+                unknown = sorted(set(columns) - set(existing))
+                if unknown:
+                    raise DatasetLoadError(
+                        f"Columns {unknown} do not exist in table {table_name!r}"
+                    )
+            else:
+                definitions = ", ".join(
+                    f"{quote_identifier(column)} {postgres_type(dtype)}"
+                    for column, dtype in zip(columns, df.dtypes)
+                )
+                await connection.execute(
+                    f"CREATE TABLE {quote_identifier(table_name)} ({definitions})"
+                )
+
+            batches = iter_record_batches(df, self.batch_size)
+            while True:
+                records = await asyncio.to_thread(next, batches, None)
+                if records is None:
+                    break
+                await connection.copy_records_to_table(
+                    table_name, records=records, columns=columns
+                )
+        seconds = time.perf_counter() - started
+
+        return {
+            "table": table_name,
+            "rows": len(df),
+            "columns": columns,
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(len(df) / seconds, 1) if seconds > 0 else None,
+        }
+
+    @staticmethod
+    async def _existing_columns(connection: Any, table_name: str) -> List[str]:
+        rows = await connection.fetch(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = $1 "
+            "ORDER BY ordinal_position",
+            table_name,
+        )
+        return [row["column_name"] for row in rows]
@@ -1,58 +1,63 @@
 """
 Utility modules package.
+
+Names are imported from their modules on first access (PEP 562), so
+importing one utility module does not load pandas or passlib for the
+others.
 """
-from app.utils.data_dir import (
-    ensure_directories,
-    get_app_data_dirs,
-    get_project_data_dir,
-    get_system_data_dir,
-)
-from app.utils.data_processing import (
-    filter_dataframe,
-    group_and_aggregate,
-    merge_dataframes,
-    process_dataframe,
-    read_csv_file,
-    save_csv_file,
-)
-from app.utils.platform import (
-    get_app_dir,
-    get_data_dir,
-    get_db_path,
-    get_platform_name,
-    get_temp_dir,
-    is_linux,
-    is_macos,
-    is_windows,
-)
-from app.utils.security import get_password_hash, verify_password
-
-__all__ = [
+import importlib
+from typing import Any, List
+
+_EXPORTS = {
     # Data processing
-    "process_dataframe",
-    "merge_dataframes",
-    "filter_dataframe",
-    "group_and_aggregate",
-    "read_csv_file",
-    "save_csv_file",
-    
+    "process_dataframe": "app.utils.data_processing",
+    "process_dataframe_chunks": "app.utils.data_processing",
+    "merge_dataframes": "app.utils.data_processing",
+    "merge_csv_files": "app.utils.data_processing",
+    "filter_dataframe": "app.utils.data_processing",
+    "filter_dataframe_by_expression": "app.utils.data_processing",
+    "group_and_aggregate": "app.utils.data_processing",
+    "aggregate_groups": "app.utils.grouping",
+    "GroupIndexCache": "app.utils.grouping",
+    "Pipeline": "app.utils.pipeline",
+    "default_pipeline": "app.utils.pipeline",
+    "read_csv_file": "app.utils.data_processing",
+    "read_csv_chunks": "app.utils.data_processing",
+    "save_csv_file": "app.utils.data_processing",
+
     # Platform utilities
-    "get_platform_name",
-    "is_windows",
-    "is_linux",
-    "is_macos",
-    "get_app_dir",
-    "get_data_dir",
-    "get_temp_dir",
-    "get_db_path",
-    
+    "get_platform_name": "app.utils.platform",
+    "is_windows": "app.utils.platform",
+    "is_linux": "app.utils.platform",
+    "is_macos": "app.utils.platform",
+    "get_app_dir": "app.utils.platform",
+    "get_data_dir": "app.utils.platform",
+    "get_temp_dir": "app.utils.platform",
+    "get_db_path": "app.utils.platform",
+
     # Data directories
-    "get_system_data_dir",
-    "get_project_data_dir",
-    "ensure_directories",
-    "get_app_data_dirs",
-    
+    "get_system_data_dir": "app.utils.data_dir",
+    "get_project_data_dir": "app.utils.data_dir",
+    "ensure_directories": "app.utils.data_dir",
+    "get_app_data_dirs": "app.utils.data_dir",
+
     # Security
-    "get_password_hash",
-    "verify_password",
-]
\ No newline at end of file
+    "get_password_hash": "app.utils.security",
+    "verify_password": "app.utils.security",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # Cache the name so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
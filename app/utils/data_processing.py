@@ -1,109 +1,215 @@
-"""
-Data processing utilities module.
-"""
-import os
-from pathlib import Path
-from typing import Optional, Union
-
-import pandas as pd
-
-
-def process_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Process pandas DataFrame.
-    
-    Args:
-        df (pd.DataFrame): Input DataFrame
-        
-    Returns:
-        pd.DataFrame: Processed DataFrame
-    """
-    # Example processing logic
-    # Drop duplicates
-    df = df.drop_duplicates()
-    
-    # Handle missing values
-    df = df.fillna(0)
-    
-    # Convert data types
-    # df['column'] = df['column'].astype(int)
-    
-    return df
-
-
-def read_csv_file(file_path: Union[str, Path], **kwargs) -> pd.DataFrame:
-    """
-    Read CSV file with platform-independent path handling.
-    
-    Args:
-        file_path (Union[str, Path]): Path to CSV file
-        **kwargs: Additional arguments for pd.read_csv
-        
-    Returns:
-        pd.DataFrame: DataFrame from CSV
-    """
-    # Convert string path to Path object for cross-platform compatibility
-    path = Path(file_path) if isinstance(file_path, str) else file_path
-    return pd.read_csv(path, **kwargs)
-
-
-def save_csv_file(df: pd.DataFrame, file_path: Union[str, Path], **kwargs) -> None:
-    """
-    Save DataFrame to CSV with platform-independent path handling.
-    
-    Args:
-        df (pd.DataFrame): DataFrame to save
-        file_path (Union[str, Path]): Path to save CSV file
-        **kwargs: Additional arguments for df.to_csv
-    """
-    # Convert string path to Path object for cross-platform compatibility
-    path = Path(file_path) if isinstance(file_path, str) else file_path
-    # Ensure directory exists
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, **kwargs)
-
-
-def merge_dataframes(df1: pd.DataFrame, df2: pd.DataFrame, on: str) -> pd.DataFrame:
-    """
-    Merge two DataFrames.
-    
-    Args:
-        df1 (pd.DataFrame): First DataFrame
-        df2 (pd.DataFrame): Second DataFrame
-        on (str): Column to merge on
-        
-    Returns:
-        pd.DataFrame: Merged DataFrame
-    """
-    return pd.merge(df1, df2, on=on)
-
-
-def filter_dataframe(df: pd.DataFrame, column: str, value: any) -> pd.DataFrame:
-    """
-    Filter DataFrame by column value.
-    
-    Args:
-        df (pd.DataFrame): Input DataFrame
-        column (str): Column to filter on
-        value (any): Value to filter for
-        
-    Returns:
-        pd.DataFrame: Filtered DataFrame
-    """
-    return df[df[column] == value]
-
-
-def group_and_aggregate(df: pd.DataFrame, group_by: str, agg_column: str, agg_func: str) -> pd.DataFrame:
-    """
-    Group and aggregate DataFrame.
-    
-    Args:
-        df (pd.DataFrame): Input DataFrame
-        group_by (str): Column to group by
-        agg_column (str): Column to aggregate
-        agg_func (str): Aggregation function
-        
-    Returns:
-        pd.DataFrame: Aggregated DataFrame
-    """
-    return df.groupby(group_by)[agg_column].agg(agg_func).reset_index()
+"""
+Data processing utilities module.
+"""
+import os
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional, Union
+
+import pandas as pd
+
+from app.utils.deduplication import DEFAULT_MAX_MEMORY_HASHES
+from app.utils.filter_expression import compile_filter
+from app.utils.partitioned_join import (
+    DEFAULT_NUM_PARTITIONS,
+    JoinKey,
+    partitioned_merge,
+)
+from app.utils.pipeline import default_pipeline
+
+# Default number of rows per chunk for chunked CSV reading
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def process_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Process pandas DataFrame with the default pipeline.
+    
+    Drops duplicate rows and fills missing values with 0 in a single pass;
+    see ``app.utils.pipeline`` to compose other stages.
+    
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        
+    Returns:
+        pd.DataFrame: Processed DataFrame
+    """
+    return default_pipeline().run(df)
+
+
+def process_dataframe_chunks(
+    chunks: Iterable[pd.DataFrame],
+    max_memory_hashes: int = DEFAULT_MAX_MEMORY_HASHES,
+) -> Iterator[pd.DataFrame]:
+    """
+    Process a stream of DataFrame chunks with the default pipeline.
+    
+    Applies the same steps as ``process_dataframe``, but drops duplicates
+    across chunk boundaries using an out-of-core row hash set, so files
+    larger than memory can be processed.
+    
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks
+        max_memory_hashes (int): Row hashes kept in memory before spilling
+        
+    Yields:
+        pd.DataFrame: Processed chunks
+    """
+    return default_pipeline(max_memory_hashes=max_memory_hashes).run_chunks(chunks)
+
+
+def read_csv_file(file_path: Union[str, Path], **kwargs) -> pd.DataFrame:
+    """
+    Read CSV file with platform-independent path handling.
+    
+    Args:
+        file_path (Union[str, Path]): Path to CSV file
+        **kwargs: Additional arguments for pd.read_csv
+        
+    Returns:
+        pd.DataFrame: DataFrame from CSV
+    """
+    # Convert string path to Path object for cross-platform compatibility
+    path = Path(file_path) if isinstance(file_path, str) else file_path
+    return pd.read_csv(path, **kwargs)
+
+
+def read_csv_chunks(
+    source: Union[str, Path, IO[bytes]],
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read CSV file in chunks with platform-independent path handling.
+    
+    Args:
+        source (Union[str, Path, IO[bytes]]): Path to CSV file or binary file object
+        chunksize (int): Number of rows per chunk
+        **kwargs: Additional arguments for pd.read_csv
+        
+    Yields:
+        pd.DataFrame: DataFrame chunks
+    """
+    source = Path(source) if isinstance(source, str) else source
+    with pd.read_csv(source, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def save_csv_file(df: pd.DataFrame, file_path: Union[str, Path], **kwargs) -> None:
+    """
+    Save DataFrame to CSV with platform-independent path handling.
+    
+    Args:
+        df (pd.DataFrame): DataFrame to save
+        file_path (Union[str, Path]): Path to save CSV file
+        **kwargs: Additional arguments for df.to_csv
+    """
+    # Convert string path to Path object for cross-platform compatibility
+    path = Path(file_path) if isinstance(file_path, str) else file_path
+    # Ensure directory exists
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, **kwargs)
+
+
+def merge_dataframes(df1: pd.DataFrame, df2: pd.DataFrame, on: str) -> pd.DataFrame:
+    """
+    Merge two DataFrames.
+    
+    Args:
+        df1 (pd.DataFrame): First DataFrame
+        df2 (pd.DataFrame): Second DataFrame
+        on (str): Column to merge on
+        
+    Returns:
+        pd.DataFrame: Merged DataFrame
+    """
+    return pd.merge(df1, df2, on=on)
+
+
+def merge_csv_files(
+    left_path: Union[str, Path],
+    right_path: Union[str, Path],
+    on: JoinKey,
+    output_path: Union[str, Path],
+    how: str = "inner",
+    num_partitions: int = DEFAULT_NUM_PARTITIONS,
+    processes: Optional[int] = None,
+) -> int:
+    """
+    Merge two CSV files that do not fit in memory.
+    
+    Partitioned hash-join counterpart of ``merge_dataframes``: both files are
+    hash-partitioned by the join key under the temp directory, partition
+    pairs are joined one at a time (optionally across ``processes`` worker
+    processes) and the result is streamed to ``output_path``.
+    
+    Args:
+        left_path (Union[str, Path]): Left CSV file
+        right_path (Union[str, Path]): Right CSV file
+        on (JoinKey): Column or columns to merge on
+        output_path (Union[str, Path]): Path to save merged CSV file
+        how (str): Join type: inner, left, right or outer
+        num_partitions (int): Number of partitions per input
+        processes (Optional[int]): Worker processes joining partitions
+        
+    Returns:
+        int: Number of merged rows written
+    """
+    return partitioned_merge(
+        left_path,
+        right_path,
+        on,
+        output_path,
+        how=how,
+        num_partitions=num_partitions,
+        processes=processes,
+    )
+
+
+def filter_dataframe(df: pd.DataFrame, column: str, value: any) -> pd.DataFrame:
+    """
+    Filter DataFrame by column value.
+    
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        column (str): Column to filter on
+        value (any): Value to filter for
+        
+    Returns:
+        pd.DataFrame: Filtered DataFrame
+    """
+    return df[df[column] == value]
+
+
+def filter_dataframe_by_expression(df: pd.DataFrame, expression: str) -> pd.DataFrame:
+    """
+    Filter DataFrame by a filter expression.
+    
+    The expression is evaluated into a single boolean mask, so chaining
+    several conditions costs one copy of the matching rows instead of one
+    copy per condition. See ``app.utils.filter_expression`` for the syntax.
+    
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        expression (str): Filter expression, e.g. ``amount > 100 and account in ('4000')``
+        
+    Returns:
+        pd.DataFrame: Filtered DataFrame
+    """
+    return compile_filter(expression).apply(df)
+
+
+def group_and_aggregate(df: pd.DataFrame, group_by: str, agg_column: str, agg_func: str) -> pd.DataFrame:
+    """
+    Group and aggregate DataFrame.
+    
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        group_by (str): Column to group by
+        agg_column (str): Column to aggregate
+        agg_func (str): Aggregation function
+        
+    Returns:
+        pd.DataFrame: Aggregated DataFrame
+    """
+    return df.groupby(group_by)[agg_column].agg(agg_func).reset_index()
@@ -0,0 +1,141 @@
+"""
+Processed dataset cache module.
+
+Processed DataFrames are kept in memory under a random dataset ID so that
+follow-up queries such as filtering or grouping do not parse the upload
+again. The cache is bounded by the deep memory usage of the cached frames:
+least recently used datasets are evicted once the byte budget is exceeded,
+and datasets not used within the TTL expire.
+
+The cache lives in the memory of one worker process. With several server
+workers, a dataset ID is only known to the worker that processed the
+upload; requests reaching another worker get a "not found" response.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+from app.utils.dtype_optimization import memory_usage_bytes
+
+
+class DatasetCache:
+    """
+    LRU cache of processed DataFrames bounded by bytes and idle time.
+
+    Attributes:
+        max_bytes (int): Byte budget of all cached DataFrames
+        ttl_seconds (float): Idle time after which a dataset expires
+        total_bytes (int): Bytes currently cached
+    """
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float,
+        *,
+        on_evict: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes (int): Byte budget of all cached DataFrames
+            ttl_seconds (float): Idle time after which a dataset expires
+            on_evict (Optional[Callable[[str], None]]): Called with the ID of every
+                dataset leaving the cache, e.g. to drop derived caches
+            clock (Callable[[], float]): Time source in seconds
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self._on_evict = on_evict
+        self._clock = clock
+        # Datasets are used from worker threads
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[pd.DataFrame, int, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, df: pd.DataFrame) -> Optional[str]:
+        """
+        Cache a DataFrame under a new dataset ID.
+
+        Args:
+            df (pd.DataFrame): Processed DataFrame; it must not be modified afterwards
+
+        Returns:
+            Optional[str]: Dataset ID, or None if caching is disabled or the
+                DataFrame exceeds the byte budget
+        """
+        size = memory_usage_bytes(df)
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return None
+        dataset_id = uuid.uuid4().hex
+        with self._lock:
+            evicted = self._expire()
+            self._entries[dataset_id] = (df, size, self._clock())
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                evicted.append(self._pop_oldest())
+        self._notify(evicted)
+        return dataset_id
+
+    def get(self, dataset_id: str) -> Optional[pd.DataFrame]:
+        """
+        Get a cached DataFrame and mark it as recently used.
+
+        Args:
+            dataset_id (str): Dataset ID
+
+        Returns:
+            Optional[pd.DataFrame]: Cached DataFrame, or None if unknown, evicted or expired
+        """
+        with self._lock:
+            evicted = self._expire()
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                self._entries[dataset_id] = (entry[0], entry[1], self._clock())
+                self._entries.move_to_end(dataset_id)
+        self._notify(evicted)
+        return entry[0] if entry is not None else None
+
+    def remove(self, dataset_id: str) -> bool:
+        """
+        Remove a dataset from the cache.
+
+        Args:
+            dataset_id (str): Dataset ID
+
+        Returns:
+            bool: True if the dataset was cached
+        """
+        with self._lock:
+            entry = self._entries.pop(dataset_id, None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+        if entry is not None:
+            self._notify([dataset_id])
+        return entry is not None
+
+    def _expire(self) -> list:
+        # Entries are ordered by last use, so expired entries are at the front
+        evicted = []
+        deadline = self._clock() - self.ttl_seconds
+        while self._entries and next(iter(self._entries.values()))[2] <= deadline:
+            evicted.append(self._pop_oldest())
+        return evicted
+
+    def _pop_oldest(self) -> str:
+        dataset_id, (_, size, _) = self._entries.popitem(last=False)
+        self.total_bytes -= size
+        return dataset_id
+
+    def _notify(self, evicted: list) -> None:
+        if self._on_evict is not None:
+            for dataset_id in evicted:
+                self._on_evict(dataset_id)
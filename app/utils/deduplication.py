@@ -0,0 +1,215 @@
+"""
+Out-of-core duplicate removal module.
+
+Rows are reduced to 64-bit hashes with ``pd.util.hash_pandas_object`` and
+kept in a compact hash set that spills sorted runs to disk once it grows
+past a configurable size. This lets duplicates be dropped across chunk
+boundaries for files that do not fit in memory.
+
+Two distinct rows are only treated as duplicates if their 64-bit hashes
+collide. For ``n`` distinct rows the probability of any collision is
+approximately ``n**2 / 2**65`` (about 2.7e-4 for 100 million rows), so the
+result matches ``DataFrame.drop_duplicates`` apart from that probability.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from app.utils.platform import get_temp_dir
+
+# Number of hashes (8 bytes each) kept in memory before spilling to disk
+DEFAULT_MAX_MEMORY_HASHES = 8_000_000
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def hash_rows(df: pd.DataFrame, subset: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Hash DataFrame rows into 64-bit values.
+
+    Integral numeric values are hashed as int64 and other numeric values as
+    float64, so that a column inferred as ``int64`` in one chunk and
+    ``float64`` in another (e.g. because of missing values) produces the
+    same hash for the same value without losing precision above 2**53.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        subset (Optional[Sequence[str]]): Columns to consider, defaults to all
+
+    Returns:
+        np.ndarray: Array of uint64 row hashes
+    """
+    frame = df if subset is None else df[list(subset)]
+    if frame.shape[1] == 0:
+        return np.zeros(len(frame), dtype=np.uint64)
+
+    columns = {}
+    for position in range(frame.shape[1]):
+        series = frame.iloc[:, position]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            series = pd.Series(_hash_numeric(series), index=frame.index, copy=False)
+        columns[position] = series
+    normalized = pd.DataFrame(columns, index=frame.index, copy=False)
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+
+def _hash_numeric(series: pd.Series) -> np.ndarray:
+    missing = series.isna().to_numpy()
+    if pd.api.types.is_integer_dtype(series):
+        dtype = "uint64" if series.dtype.kind == "u" and series.max() > INT64_MAX else "int64"
+        hashes = pd.util.hash_array(series.to_numpy(dtype=dtype, na_value=0))
+    else:
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        hashes = pd.util.hash_array(values)
+        with np.errstate(invalid="ignore"):
+            integral = (values == np.floor(values)) & (values >= -2.0**63) & (values < 2.0**63)
+        hashes[integral] = pd.util.hash_array(values[integral].astype("int64"))
+    hashes[missing] = pd.util.hash_array(np.array([np.nan]))[0]
+    return hashes
+
+
+class RowHashSet:
+    """
+    Fixed-width hash set that spills sorted runs to disk.
+
+    Attributes:
+        max_memory_hashes (int): Hashes kept in memory before spilling
+        spill_dir (Optional[Path]): Directory holding spilled runs
+    """
+    def __init__(
+        self,
+        max_memory_hashes: int = DEFAULT_MAX_MEMORY_HASHES,
+        spill_dir: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize hash set.
+
+        Args:
+            max_memory_hashes (int): Hashes kept in memory before spilling
+            spill_dir (Optional[Union[str, Path]]): Parent directory for spill
+                files, defaults to the application temp directory
+        """
+        if max_memory_hashes <= 0:
+            raise ValueError("max_memory_hashes must be positive")
+        self.max_memory_hashes = max_memory_hashes
+        self._spill_parent = Path(spill_dir) if spill_dir is not None else None
+        self.spill_dir: Optional[Path] = None
+        self._memory = np.empty(0, dtype=np.uint64)
+        self._runs: List[np.ndarray] = []
+        self._run_paths: List[Path] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        """
+        Get number of stored hashes.
+
+        Returns:
+            int: Number of stored hashes
+        """
+        return self._size
+
+    def __enter__(self) -> "RowHashSet":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def spilled_runs(self) -> int:
+        """
+        Get number of runs spilled to disk.
+
+        Returns:
+            int: Number of spilled runs
+        """
+        return len(self._run_paths)
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add hashes to the set and report which ones were new.
+
+        A hash is new if it was not stored before and it is the first
+        occurrence within ``hashes``.
+
+        Args:
+            hashes (np.ndarray): Array of uint64 hashes
+
+        Returns:
+            np.ndarray: Boolean mask, True where the hash was new
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return np.zeros(0, dtype=bool)
+
+        is_new = ~pd.Series(hashes).duplicated(keep="first").to_numpy()
+        for stored in [self._memory, *self._runs]:
+            if len(stored):
+                is_new &= ~self._contains(stored, hashes)
+
+        new_hashes = np.sort(hashes[is_new])
+        if len(new_hashes):
+            self._memory = np.concatenate([self._memory, new_hashes])
+            self._memory.sort(kind="stable")
+            self._size += len(new_hashes)
+            if len(self._memory) >= self.max_memory_hashes:
+                self._spill()
+        return is_new
+
+    def close(self) -> None:
+        """
+        Release memory and remove spilled runs.
+        """
+        self._memory = np.empty(0, dtype=np.uint64)
+        self._runs = []
+        self._run_paths = []
+        self._size = 0
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    @staticmethod
+    def _contains(stored: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        positions = np.searchsorted(stored, hashes)
+        positions[positions == len(stored)] = 0
+        return stored[positions] == hashes
+
+    def _spill(self) -> None:
+        if self.spill_dir is None:
+            parent = self._spill_parent or get_temp_dir()
+            parent.mkdir(parents=True, exist_ok=True)
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="dedupe-", dir=parent))
+        path = self.spill_dir / f"run-{len(self._run_paths):05d}.npy"
+        np.save(path, self._memory)
+        self._run_paths.append(path)
+        self._runs.append(np.load(path, mmap_mode="r"))
+        self._memory = np.empty(0, dtype=np.uint64)
+
+
+def drop_duplicates_chunked(
+    chunks: Iterable[pd.DataFrame],
+    subset: Optional[Sequence[str]] = None,
+    max_memory_hashes: int = DEFAULT_MAX_MEMORY_HASHES,
+    spill_dir: Optional[Union[str, Path]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Drop duplicate rows across a stream of DataFrame chunks.
+
+    Keeps the first occurrence of each row, like ``drop_duplicates()``.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks
+        subset (Optional[Sequence[str]]): Columns to consider, defaults to all
+        max_memory_hashes (int): Hashes kept in memory before spilling
+        spill_dir (Optional[Union[str, Path]]): Parent directory for spill files
+
+    Yields:
+        pd.DataFrame: Chunks with previously seen rows removed
+    """
+    with RowHashSet(max_memory_hashes=max_memory_hashes, spill_dir=spill_dir) as seen:
+        for chunk in chunks:
+            mask = seen.add_new(hash_rows(chunk, subset))
+            yield chunk if mask.all() else chunk[mask]
@@ -0,0 +1,142 @@
+"""
+DataFrame dtype optimization module.
+
+CSV parsing defaults to ``int64``, ``float64`` and string/object columns,
+and filling missing values widens integer columns to ``float64``. The
+helpers here shrink a DataFrame by downcasting numerics, converting
+low-cardinality strings to ``category`` and parsing date-like strings.
+"""
+import warnings
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Maximum ratio of unique values to rows for a string column to become a category
+DEFAULT_CATEGORY_THRESHOLD = 0.5
+
+# Number of non-null values inspected before attempting to parse a column as dates
+DATE_SAMPLE_SIZE = 100
+
+# Float bounds of the int64 range (the upper bound itself is not representable)
+INT64_LOWER = -(2.0**63)
+INT64_UPPER = 2.0**63
+
+
+def memory_usage_bytes(df: pd.DataFrame) -> int:
+    """
+    Get total memory usage of DataFrame columns, including object contents.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+
+    Returns:
+        int: Memory usage in bytes
+    """
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+def _is_text(series: pd.Series) -> bool:
+    return (
+        pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+    ) and not isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def _downcast_numeric(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy()
+        # Integral floats (e.g. integer columns widened by fillna) become integers again
+        if not np.isfinite(values).all() or not np.array_equal(values, np.trunc(values)):
+            return series
+        # Integral floats beyond the int64 range would wrap around when cast
+        if len(values) and (values.min() < INT64_LOWER or values.max() >= INT64_UPPER):
+            return series
+        series = series.astype("int64")
+    if series.min() >= 0:
+        return pd.to_numeric(series, downcast="unsigned")
+    return pd.to_numeric(series, downcast="integer")
+
+
+def _parse_dates(series: pd.Series) -> pd.Series:
+    non_null = series.dropna()
+    sample = non_null.head(DATE_SAMPLE_SIZE)
+    if sample.empty:
+        return series
+    sample = sample.astype(str)
+    # Plain numbers are not dates, even though they may be parseable as such
+    if pd.to_numeric(sample, errors="coerce").notna().any():
+        return series
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if pd.to_datetime(sample, errors="coerce").isna().any():
+            return series
+        parsed = pd.to_datetime(series, errors="coerce")
+    if parsed.notna().sum() != len(non_null):
+        return series
+    return parsed
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    category_threshold: float = DEFAULT_CATEGORY_THRESHOLD,
+    parse_dates: bool = True,
+) -> pd.DataFrame:
+    """
+    Shrink DataFrame dtypes without changing values.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        category_threshold (float): Maximum unique-to-row ratio for string
+            columns to be converted to ``category``
+        parse_dates (bool): Whether to parse date-like string columns
+
+    Returns:
+        pd.DataFrame: DataFrame with optimized dtypes
+    """
+    columns: Dict[int, pd.Series] = {}
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        if _is_text(series):
+            if parse_dates:
+                series = _parse_dates(series)
+            if _is_text(series) and len(series):
+                if series.nunique(dropna=True) <= category_threshold * len(series):
+                    series = series.astype("category")
+        else:
+            series = _downcast_numeric(series)
+        columns[position] = series
+
+    optimized = pd.DataFrame(columns, index=df.index, copy=False)
+    optimized.columns = df.columns
+    return optimized
+
+
+def concat_optimized(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate optimized DataFrame chunks without losing categories.
+
+    ``pd.concat`` falls back to ``object`` when categorical chunks have
+    different categories, so the categories are unified before concatenating.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): Optimized DataFrame chunks
+
+    Returns:
+        pd.DataFrame: Concatenated DataFrame
+    """
+    frames: List[pd.DataFrame] = [frame.copy(deep=False) for frame in frames]
+    if not frames:
+        return pd.DataFrame()
+
+    for position in range(frames[0].shape[1]):
+        parts = [frame.iloc[:, position] for frame in frames]
+        if not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        categories = parts[0].cat.categories
+        for part in parts[1:]:
+            categories = categories.union(part.cat.categories, sort=False)
+        for frame, part in zip(frames, parts):
+            frame.isetitem(position, part.cat.set_categories(categories))
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,283 @@
+"""
+Streaming export module.
+
+Processed datasets are stored as a directory of pickled row chunks and
+exported chunk by chunk, so memory is bounded by one chunk and the first
+compressed bytes are ready long before the whole dataset is serialized.
+CSV is compressed incrementally with gzip or zstd; Parquet is written one
+row group per chunk, with object columns written as strings so that chunks
+mixing text and numbers (e.g. after ``fillna(0)``) share one schema.
+
+zstd compression requires the ``zstandard`` package and Parquet requires
+``pyarrow``; both are imported only when those formats are requested.
+"""
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+# Default number of rows serialized at a time
+DEFAULT_EXPORT_CHUNK_SIZE = 50_000
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_COMPRESSIONS = ("gzip", "zstd", "none")
+
+MEDIA_TYPES = {
+    ("csv", "gzip"): "application/gzip",
+    ("csv", "zstd"): "application/zstd",
+    ("csv", "none"): "text/csv",
+}
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+class ExportUnavailableError(ValueError):
+    """
+    Raised when an export format or compression is unknown or its package is missing.
+    """
+
+
+def check_export_format(format: str, compression: str) -> None:
+    """
+    Check that an export format and compression can be produced.
+
+    Args:
+        format (str): ``csv`` or ``parquet``
+        compression (str): ``gzip``, ``zstd`` or ``none``
+
+    Raises:
+        ExportUnavailableError: If the format or compression is unsupported
+    """
+    if format not in EXPORT_FORMATS:
+        raise ExportUnavailableError(f"Unknown export format {format!r}")
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ExportUnavailableError(f"Unknown compression {compression!r}")
+    if format == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ExportUnavailableError("Parquet export requires the pyarrow package")
+    elif compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ExportUnavailableError("zstd compression requires the zstandard package")
+
+
+def export_media_type(format: str, compression: str) -> str:
+    """
+    Get the media type of an export.
+
+    Args:
+        format (str): ``csv`` or ``parquet``
+        compression (str): ``gzip``, ``zstd`` or ``none``
+
+    Returns:
+        str: Media type
+    """
+    if format == "parquet":
+        return PARQUET_MEDIA_TYPE
+    return MEDIA_TYPES[(format, compression)]
+
+
+def export_suffix(format: str, compression: str) -> str:
+    """
+    Get the file name suffix of an export.
+
+    Args:
+        format (str): ``csv`` or ``parquet``
+        compression (str): ``gzip``, ``zstd`` or ``none``
+
+    Returns:
+        str: File name suffix, e.g. ``.csv.gz``
+    """
+    if format == "parquet":
+        return ".parquet"
+    return {"gzip": ".csv.gz", "zstd": ".csv.zst", "none": ".csv"}[compression]
+
+
+def write_frame_parts(
+    df: pd.DataFrame, directory: Path, rows_per_part: int = DEFAULT_EXPORT_CHUNK_SIZE
+) -> int:
+    """
+    Store a DataFrame as numbered pickle files of at most ``rows_per_part`` rows.
+
+    Args:
+        df (pd.DataFrame): DataFrame to store
+        directory (Path): Target directory, created if needed
+        rows_per_part (int): Rows per file
+
+    Returns:
+        int: Number of files written
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    parts = 0
+    # An empty DataFrame still gets one part so its columns can be exported
+    for start in range(0, max(len(df), 1), rows_per_part):
+        df.iloc[start:start + rows_per_part].to_pickle(directory / f"part-{parts:06d}.pkl")
+        parts += 1
+    return parts
+
+
+def iter_frame_parts(directory: Path) -> Iterator[pd.DataFrame]:
+    """
+    Read the pickle files written by ``write_frame_parts`` one at a time.
+
+    Args:
+        directory (Path): Directory with stored parts
+
+    Yields:
+        pd.DataFrame: Stored part
+    """
+    for path in sorted(directory.glob("part-*.pkl")):
+        yield pd.read_pickle(path)
+
+
+def _slices(frames: Iterable[pd.DataFrame], rows_per_chunk: int) -> Iterator[pd.DataFrame]:
+    for frame in frames:
+        if len(frame) <= rows_per_chunk:
+            yield frame
+            continue
+        for start in range(0, len(frame), rows_per_chunk):
+            yield frame.iloc[start:start + rows_per_chunk]
+
+
+class _Uncompressed:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _compressor(compression: str):
+    if compression == "gzip":
+        # wbits=31 writes a gzip header and trailer instead of a raw zlib stream
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compressobj()
+    return _Uncompressed()
+
+
+def stream_csv(
+    frames: Iterable[pd.DataFrame],
+    *,
+    compression: str = "gzip",
+    rows_per_chunk: int = DEFAULT_EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Serialize DataFrames to one compressed CSV stream, chunk by chunk.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): DataFrames with the same columns
+        compression (str): ``gzip``, ``zstd`` or ``none``
+        rows_per_chunk (int): Rows serialized at a time
+
+    Yields:
+        bytes: Compressed CSV data
+    """
+    compressor = _compressor(compression)
+    header = True
+    for chunk in _slices(frames, rows_per_chunk):
+        data = compressor.compress(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+        if data:
+            yield data
+    tail = compressor.flush()
+    if tail:
+        yield tail
+
+
+def _stringify_objects(chunk: pd.DataFrame) -> pd.DataFrame:
+    converted = None
+    for position in range(chunk.shape[1]):
+        series = chunk.iloc[:, position]
+        if not pd.api.types.is_object_dtype(series):
+            continue
+        if pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            continue
+        if converted is None:
+            converted = chunk.copy(deep=False)
+        converted.isetitem(
+            position, series.astype(str).astype(object).where(series.notna(), None)
+        )
+    return chunk if converted is None else converted
+
+
+class _ByteSink:
+    """
+    Write-only file object whose contents are drained after each write batch.
+    """
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_parquet(
+    frames: Iterable[pd.DataFrame],
+    *,
+    compression: str = "zstd",
+    rows_per_chunk: int = DEFAULT_EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Serialize DataFrames to one Parquet file stream, one row group per chunk.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): DataFrames with the same columns and dtypes
+        compression (str): ``gzip``, ``zstd`` or ``none``
+        rows_per_chunk (int): Rows per row group
+
+    Yields:
+        bytes: Parquet file data
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ByteSink()
+    writer: Optional[pq.ParquetWriter] = None
+    try:
+        for chunk in _slices(frames, rows_per_chunk):
+            chunk = _stringify_objects(chunk)
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                for position, dtype in enumerate(chunk.dtypes):
+                    if pd.api.types.is_object_dtype(dtype):
+                        schema = schema.set(position, schema.field(position).with_type(pa.string()))
+                writer = pq.ParquetWriter(
+                    pa.PythonFile(sink, mode="w"), schema, compression=compression
+                )
+            # Reuse the first schema so all-null chunks keep the column types
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table, row_group_size=max(len(chunk), 1))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        if writer is not None:
+            writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
@@ -0,0 +1,371 @@
+"""
+Filter expression engine module.
+
+Filters are written in a small expression language and compiled once into a
+tree that evaluates to a single boolean row mask. Each referenced column is
+read once per predicate as a view, the masks are combined in place, and the
+DataFrame itself is only copied when the final mask is applied.
+
+Grammar::
+
+    expression := term ("or" term)*
+    term       := factor ("and" factor)*
+    factor     := "not" factor | "(" expression ")" | predicate
+    predicate  := column ("=" | "==" | "!=" | "<>" | "<" | "<=" | ">" | ">=") literal
+                | column ["not"] "between" literal "and" literal
+                | column ["not"] "in" "(" literal ("," literal)* ")"
+                | column "is" ["not"] "null"
+    column     := identifier | `quoted identifier`
+    literal    := number | 'string' | "string" | true | false
+
+Keywords are case-insensitive. ``between`` is inclusive on both ends. A
+comparison against a missing value is false, so ``not`` of a comparison
+matches missing values.
+
+Example::
+
+    amount >= 1000 and account in ('4000', '4100') and not memo is null
+"""
+import operator
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+COMPARISON_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+KEYWORDS = {"and", "or", "not", "in", "between", "is", "null", "true", "false"}
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<number>[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)
+    | (?P<string>'(?:[^']|'')*'|"(?:[^"]|"")*")
+    | (?P<quoted>`(?:[^`]|``)+`)
+    | (?P<op><=|>=|==|!=|<>|=|<|>)
+    | (?P<punct>[(),])
+    | (?P<name>[A-Za-z_][A-Za-z0-9_.]*)
+    """,
+    re.VERBOSE,
+)
+
+
+class FilterExpressionError(ValueError):
+    """
+    Raised when a filter expression cannot be parsed or evaluated.
+    """
+
+
+Token = Tuple[str, Any, int]
+
+
+def _tokenize(expression: str) -> List[Token]:
+    tokens: List[Token] = []
+    position = 0
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise FilterExpressionError(
+                f"Unexpected character {expression[position]!r} at position {position}"
+            )
+        kind, text = match.lastgroup, match.group()
+        if kind == "number":
+            value = float(text) if any(c in text for c in ".eE") else int(text)
+            tokens.append(("literal", value, position))
+        elif kind == "string":
+            quote = text[0]
+            tokens.append(("literal", text[1:-1].replace(quote * 2, quote), position))
+        elif kind == "quoted":
+            tokens.append(("column", text[1:-1].replace("``", "`"), position))
+        elif kind == "name":
+            lowered = text.lower()
+            if lowered in ("true", "false"):
+                tokens.append(("literal", lowered == "true", position))
+            elif lowered in KEYWORDS:
+                tokens.append(("keyword", lowered, position))
+            else:
+                tokens.append(("column", text, position))
+        elif kind != "ws":
+            tokens.append((kind, text, position))
+        position = match.end()
+    tokens.append(("end", None, position))
+    return tokens
+
+
+class Node(ABC):
+    """
+    Compiled filter expression node.
+    """
+    @abstractmethod
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate node into a boolean row mask.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame
+
+        Returns:
+            np.ndarray: Boolean mask, owned by the caller
+        """
+
+    @abstractmethod
+    def columns(self) -> FrozenSet[str]:
+        """
+        Get columns referenced by the node.
+
+        Returns:
+            FrozenSet[str]: Column names
+        """
+
+
+class Predicate(Node):
+    """
+    Predicate on a single column.
+
+    Attributes:
+        column (str): Column name
+    """
+    def __init__(self, column: str, evaluate: Callable[[pd.Series], Any], text: str):
+        """
+        Initialize predicate.
+
+        Args:
+            column (str): Column name
+            evaluate (Callable[[pd.Series], Any]): Vectorized predicate on the column
+            text (str): Predicate description for error messages
+        """
+        self.column = column
+        self._evaluate = evaluate
+        self._text = text
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        if self.column not in df.columns:
+            raise FilterExpressionError(f"Unknown column {self.column!r}")
+        try:
+            result = self._evaluate(df[self.column])
+        except TypeError as e:
+            raise FilterExpressionError(f"Cannot evaluate {self._text}: {e}") from e
+        # Nullable dtypes yield <NA> for missing values, which do not match
+        mask = pd.Series(result).to_numpy(dtype=bool, na_value=False)
+        return mask if mask.flags.writeable else mask.copy()
+
+    def columns(self) -> FrozenSet[str]:
+        return frozenset([self.column])
+
+
+class Not(Node):
+    """
+    Logical negation.
+    """
+    def __init__(self, operand: Node):
+        self.operand = operand
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        result = self.operand.mask(df)
+        np.logical_not(result, out=result)
+        return result
+
+    def columns(self) -> FrozenSet[str]:
+        return self.operand.columns()
+
+
+class BoolOp(Node):
+    """
+    Logical conjunction or disjunction of several operands.
+    """
+    def __init__(self, combine: Callable, operands: Sequence[Node]):
+        self.combine = combine
+        self.operands = list(operands)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        result = self.operands[0].mask(df)
+        for operand in self.operands[1:]:
+            # Combine into the first mask in place instead of allocating per operand
+            self.combine(result, operand.mask(df), out=result)
+        return result
+
+    def columns(self) -> FrozenSet[str]:
+        return frozenset().union(*(operand.columns() for operand in self.operands))
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.index = 0
+
+    def parse(self) -> Node:
+        node = self._expression()
+        self._expect("end")
+        return node
+
+    def _peek(self) -> Token:
+        return self.tokens[self.index]
+
+    def _next(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _accept(self, kind: str, value: Optional[str] = None) -> bool:
+        token = self._peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.index += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Optional[str] = None) -> Token:
+        token = self._next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            expected = value or kind
+            found = "end of expression" if token[0] == "end" else repr(token[1])
+            raise FilterExpressionError(
+                f"Expected {expected} but found {found} at position {token[2]}"
+            )
+        return token
+
+    def _expression(self) -> Node:
+        operands = [self._term()]
+        while self._accept("keyword", "or"):
+            operands.append(self._term())
+        return operands[0] if len(operands) == 1 else BoolOp(np.logical_or, operands)
+
+    def _term(self) -> Node:
+        operands = [self._factor()]
+        while self._accept("keyword", "and"):
+            operands.append(self._factor())
+        return operands[0] if len(operands) == 1 else BoolOp(np.logical_and, operands)
+
+    def _factor(self) -> Node:
+        if self._accept("keyword", "not"):
+            return Not(self._factor())
+        if self._accept("punct", "("):
+            node = self._expression()
+            self._expect("punct", ")")
+            return node
+        return self._predicate()
+
+    def _literal(self) -> Any:
+        return self._expect("literal")[1]
+
+    def _predicate(self) -> Node:
+        column = self._expect("column")[1]
+
+        if self._accept("op"):
+            symbol = self.tokens[self.index - 1][1]
+            value = self._literal()
+            compare = COMPARISON_OPERATORS[symbol]
+            if compare is operator.ne:
+                # Missing values compare unequal to everything, but should not match
+                return Predicate(
+                    column, lambda s: (s != value) & s.notna(), f"{column} {symbol} {value!r}"
+                )
+            return Predicate(column, lambda s: compare(s, value), f"{column} {symbol} {value!r}")
+
+        if self._accept("keyword", "is"):
+            negated = self._accept("keyword", "not")
+            self._expect("keyword", "null")
+            if negated:
+                return Predicate(column, lambda s: s.notna(), f"{column} is not null")
+            return Predicate(column, lambda s: s.isna(), f"{column} is null")
+
+        negated = self._accept("keyword", "not")
+        if self._accept("keyword", "between"):
+            low = self._literal()
+            self._expect("keyword", "and")
+            high = self._literal()
+            node = Predicate(
+                column,
+                lambda s: s.between(low, high, inclusive="both"),
+                f"{column} between {low!r} and {high!r}",
+            )
+        elif self._accept("keyword", "in"):
+            self._expect("punct", "(")
+            values = [self._literal()]
+            while self._accept("punct", ","):
+                values.append(self._literal())
+            self._expect("punct", ")")
+            node = Predicate(column, lambda s: s.isin(values), f"{column} in {values!r}")
+        else:
+            token = self._peek()
+            found = "end of expression" if token[0] == "end" else repr(token[1])
+            raise FilterExpressionError(
+                f"Expected a condition on {column!r} but found {found} at position {token[2]}"
+            )
+        return Not(node) if negated else node
+
+
+class FilterExpression:
+    """
+    Compiled filter expression.
+
+    Attributes:
+        expression (str): Source expression
+        columns (FrozenSet[str]): Columns referenced by the expression
+    """
+    def __init__(self, expression: str):
+        """
+        Compile filter expression.
+
+        Args:
+            expression (str): Source expression
+
+        Raises:
+            FilterExpressionError: If the expression is invalid
+        """
+        self.expression = expression
+        self._root = _Parser(expression).parse()
+        self.columns = self._root.columns()
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate expression into a boolean row mask.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame
+
+        Returns:
+            np.ndarray: Boolean mask
+
+        Raises:
+            FilterExpressionError: If a column is missing or a comparison is invalid
+        """
+        return self._root.mask(df)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select rows matching the expression.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame
+
+        Returns:
+            pd.DataFrame: Matching rows
+        """
+        return df[self.mask(df)]
+
+
+def compile_filter(expression: str) -> FilterExpression:
+    """
+    Compile filter expression.
+
+    Args:
+        expression (str): Source expression
+
+    Returns:
+        FilterExpression: Compiled expression
+
+    Raises:
+        FilterExpressionError: If the expression is invalid
+    """
+    return FilterExpression(expression)
@@ -0,0 +1,242 @@
+"""
+Multi-key group-by and aggregation module.
+
+Aggregations for several columns, including named aggregations and
+percentiles such as ``p95``, are computed from one ``GroupBy`` object, so
+the group keys are hashed once per request. A ``GroupIndexCache`` keeps
+those objects per dataset and key set, so later requests with different
+aggregations skip hashing the keys again.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from pandas.core.groupby import DataFrameGroupBy
+
+PERCENTILE_PATTERN = re.compile(r"^p(\d{1,2}(?:\.\d+)?|100)$")
+
+AGGREGATION_FUNCTIONS = {
+    "count",
+    "size",
+    "sum",
+    "mean",
+    "median",
+    "min",
+    "max",
+    "std",
+    "var",
+    "first",
+    "last",
+    "nunique",
+}
+
+AggregationSpec = Mapping[str, Union[str, Sequence[str]]]
+NamedAggregationSpec = Mapping[str, Tuple[str, str]]
+
+
+class AggregationSpecError(ValueError):
+    """
+    Raised when a group-by or aggregation specification is invalid.
+    """
+
+
+def _percentile(func: str) -> Optional[float]:
+    match = PERCENTILE_PATTERN.match(func)
+    return float(match.group(1)) / 100 if match else None
+
+
+def resolve_aggregations(
+    aggregations: Optional[AggregationSpec] = None,
+    named_aggregations: Optional[NamedAggregationSpec] = None,
+) -> Dict[str, Tuple[str, str]]:
+    """
+    Combine column aggregations and named aggregations into output columns.
+
+    Column aggregations such as ``{"amount": ["sum", "p95"]}`` produce output
+    columns named ``amount_sum`` and ``amount_p95``. Named aggregations such
+    as ``{"total": ("amount", "sum")}`` produce the given output names.
+
+    Args:
+        aggregations (Optional[AggregationSpec]): Column to function(s) mapping
+        named_aggregations (Optional[NamedAggregationSpec]): Output name to
+            (column, function) mapping
+
+    Returns:
+        Dict[str, Tuple[str, str]]: Output column to (column, function) mapping
+
+    Raises:
+        AggregationSpecError: If a function is unknown or an output name repeats
+    """
+    resolved: Dict[str, Tuple[str, str]] = {}
+
+    def add(output: str, column: str, func: str) -> None:
+        if func not in AGGREGATION_FUNCTIONS and _percentile(func) is None:
+            raise AggregationSpecError(
+                f"Unknown aggregation {func!r}, expected one of "
+                f"{sorted(AGGREGATION_FUNCTIONS)} or a percentile such as 'p95'"
+            )
+        if output in resolved:
+            raise AggregationSpecError(f"Duplicate output column {output!r}")
+        resolved[output] = (column, func)
+
+    for column, funcs in (aggregations or {}).items():
+        for func in [funcs] if isinstance(funcs, str) else funcs:
+            add(f"{column}_{func}", column, func)
+    for output, (column, func) in (named_aggregations or {}).items():
+        add(output, column, func)
+
+    if not resolved:
+        raise AggregationSpecError("At least one aggregation is required")
+    return resolved
+
+
+def _groupby(df: pd.DataFrame, keys: List[str]) -> DataFrameGroupBy:
+    return df.groupby(keys, sort=True, observed=True)
+
+
+class GroupIndexCache:
+    """
+    LRU cache of ``GroupBy`` objects per dataset and key set.
+
+    ``GroupBy`` objects compute the group codes of their keys once and reuse
+    them for every aggregation, so caching them avoids re-hashing the keys.
+    The cache is used from worker threads, so its entries are guarded by a
+    lock, and group codes are computed before a ``GroupBy`` is shared.
+
+    Attributes:
+        max_entries (int): Maximum number of cached group indexes
+    """
+    def __init__(self, max_entries: int = 32):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries (int): Maximum number of cached group indexes
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, Tuple[str, ...]], DataFrameGroupBy]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, dataset_key: Hashable, df: pd.DataFrame, keys: Sequence[str]) -> DataFrameGroupBy:
+        """
+        Get cached group index or build it.
+
+        Args:
+            dataset_key (Hashable): Dataset identifier
+            df (pd.DataFrame): Dataset the group index is built from
+            keys (Sequence[str]): Group-by columns
+
+        Returns:
+            DataFrameGroupBy: Grouped dataset
+        """
+        cache_key = (dataset_key, tuple(keys))
+        with self._lock:
+            grouped = self._entries.get(cache_key)
+            # A dataset replaced under the same key must not reuse the old index
+            if grouped is not None and grouped.obj is df:
+                self._entries.move_to_end(cache_key)
+                return grouped
+
+        grouped = _groupby(df, list(keys))
+        # Group codes are computed lazily; compute them before other threads see them
+        grouped.ngroups
+        with self._lock:
+            self._entries[cache_key] = grouped
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return grouped
+
+    def invalidate(self, dataset_key: Optional[Hashable] = None) -> None:
+        """
+        Drop cached group indexes.
+
+        Args:
+            dataset_key (Optional[Hashable]): Dataset identifier, or None for all datasets
+        """
+        with self._lock:
+            if dataset_key is None:
+                self._entries.clear()
+                return
+            for cache_key in [key for key in self._entries if key[0] == dataset_key]:
+                del self._entries[cache_key]
+
+
+def aggregate_groups(
+    df: pd.DataFrame,
+    keys: Sequence[str],
+    aggregations: Optional[AggregationSpec] = None,
+    named_aggregations: Optional[NamedAggregationSpec] = None,
+    *,
+    cache: Optional[GroupIndexCache] = None,
+    dataset_key: Optional[Hashable] = None,
+) -> pd.DataFrame:
+    """
+    Group DataFrame by several keys and compute several aggregations.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        keys (Sequence[str]): Group-by columns
+        aggregations (Optional[AggregationSpec]): Column to function(s) mapping,
+            e.g. ``{"amount": ["sum", "mean", "p95"]}``
+        named_aggregations (Optional[NamedAggregationSpec]): Output name to
+            (column, function) mapping, e.g. ``{"total": ("amount", "sum")}``
+        cache (Optional[GroupIndexCache]): Group index cache
+        dataset_key (Optional[Hashable]): Dataset identifier for the cache
+
+    Returns:
+        pd.DataFrame: One row per group with key columns and aggregated columns
+
+    Raises:
+        AggregationSpecError: If the specification is invalid or a function
+            does not apply to the dtype of its column
+    """
+    keys = list(keys)
+    if not keys:
+        raise AggregationSpecError("At least one group-by column is required")
+    resolved = resolve_aggregations(aggregations, named_aggregations)
+    referenced = set(keys) | {column for column, _ in resolved.values()}
+    missing = sorted(referenced - set(df.columns))
+    if missing:
+        raise AggregationSpecError(f"Unknown columns: {missing}")
+
+    if cache is not None and dataset_key is not None:
+        grouped = cache.get(dataset_key, df, keys)
+    else:
+        grouped = _groupby(df, keys)
+
+    parts = []
+    standard = {
+        output: (column, func)
+        for output, (column, func) in resolved.items()
+        if _percentile(func) is None
+    }
+    if standard:
+        try:
+            parts.append(grouped.agg(**standard))
+        except TypeError as e:
+            raise AggregationSpecError(f"Cannot aggregate: {e}") from e
+
+    # Compute each percentile once for all columns that request it
+    by_quantile: Dict[float, List[Tuple[str, str]]] = {}
+    for output, (column, func) in resolved.items():
+        quantile = _percentile(func)
+        if quantile is not None:
+            by_quantile.setdefault(quantile, []).append((output, column))
+    for quantile, outputs in by_quantile.items():
+        columns = list(dict.fromkeys(column for _, column in outputs))
+        try:
+            values = grouped[columns].quantile(quantile)
+        except TypeError as e:
+            raise AggregationSpecError(f"Cannot compute p{quantile * 100:g}: {e}") from e
+        parts.append(pd.DataFrame({output: values[column] for output, column in outputs}))
+
+    result = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+    return result[list(resolved)].reset_index()
@@ -0,0 +1,191 @@
+"""
+Input format detection and chunked reading module.
+
+The reader for an input is chosen from its first bytes rather than its file
+name: Parquet files start with ``PAR1``, Arrow IPC files (Feather v2) with
+``ARROW1``, Feather v1 files with ``FEA1`` and Arrow IPC streams with the
+``0xFFFFFFFF`` continuation marker. Text whose first line is a JSON object
+is read as JSON Lines and any other UTF-8 text as CSV.
+
+Parquet and Arrow inputs are read record batch by record batch. Arrow IPC
+files on disk are memory-mapped and converted with ``split_blocks=True``, so
+numeric columns without missing values reference the mapped buffers instead
+of being copied. These formats require ``pyarrow``, which is imported only
+when such an input is read.
+"""
+import json
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+import pandas as pd
+
+from app.utils.data_processing import DEFAULT_CHUNK_SIZE, read_csv_chunks
+
+CSV = "csv"
+JSONL = "jsonl"
+PARQUET = "parquet"
+ARROW = "arrow"
+ARROW_STREAM = "arrow_stream"
+FEATHER_V1 = "feather_v1"
+
+INPUT_FORMATS = (CSV, JSONL, PARQUET, ARROW, ARROW_STREAM, FEATHER_V1)
+
+# Number of leading bytes inspected when sniffing the format
+SNIFF_BYTES = 64 * 1024
+
+Source = Union[str, Path, IO[bytes]]
+
+
+class UnsupportedFormatError(ValueError):
+    """
+    Raised when the format of an input cannot be detected or read.
+    """
+
+
+def sniff_format(head: bytes) -> str:
+    """
+    Detect an input format from its leading bytes.
+
+    Args:
+        head (bytes): Leading bytes of the input
+
+    Returns:
+        str: One of ``INPUT_FORMATS``
+
+    Raises:
+        UnsupportedFormatError: If the bytes match no supported format
+    """
+    if head.startswith(b"PAR1"):
+        return PARQUET
+    if head.startswith(b"ARROW1"):
+        return ARROW
+    if head.startswith(b"FEA1"):
+        return FEATHER_V1
+    if head.startswith(b"\xff\xff\xff\xff"):
+        return ARROW_STREAM
+    if not head.strip():
+        raise UnsupportedFormatError("Input is empty")
+
+    try:
+        text = head.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        # A multi-byte character may be cut off at the end of a full sniff window
+        if len(head) < SNIFF_BYTES or e.start < len(head) - 3:
+            raise UnsupportedFormatError(
+                "Input is neither a supported binary format nor UTF-8 text"
+            )
+        text = head[:e.start].decode("utf-8-sig")
+    if "\x00" in text:
+        raise UnsupportedFormatError("Input is binary and not a supported format")
+    first_line = text.lstrip().split("\n", 1)[0].strip()
+    if first_line.startswith("{"):
+        try:
+            if isinstance(json.loads(first_line), dict):
+                return JSONL
+        except ValueError:
+            pass
+    return CSV
+
+
+def detect_format(source: Source) -> str:
+    """
+    Detect the format of a file or binary file object.
+
+    File objects are rewound to their start position afterwards.
+
+    Args:
+        source (Source): Path or binary file object
+
+    Returns:
+        str: One of ``INPUT_FORMATS``
+
+    Raises:
+        UnsupportedFormatError: If the input matches no supported format
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return sniff_format(f.read(SNIFF_BYTES))
+    position = source.tell()
+    try:
+        return sniff_format(source.read(SNIFF_BYTES))
+    finally:
+        source.seek(position)
+
+
+def _arrow_input(source: Source):
+    import pyarrow as pa
+
+    if isinstance(source, (str, Path)):
+        return pa.memory_map(str(source), "r")
+    return pa.PythonFile(source, mode="r")
+
+
+def _batches_to_frames(batches, chunksize: int) -> Iterator[pd.DataFrame]:
+    import pyarrow as pa
+
+    pending = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield table.to_pandas(split_blocks=True)
+            pending, pending_rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending).to_pandas(split_blocks=True)
+
+
+def read_input_chunks(
+    source: Source,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    *,
+    format: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read CSV, JSON Lines, Parquet or Arrow input in chunks.
+
+    Args:
+        source (Source): Path or binary file object
+        chunksize (int): Approximate number of rows per chunk; Arrow inputs
+            are cut at record batch boundaries
+        format (Optional[str]): Input format, detected from the leading bytes when None
+
+    Yields:
+        pd.DataFrame: DataFrame chunks
+
+    Raises:
+        UnsupportedFormatError: If the input matches no supported format
+    """
+    source = Path(source) if isinstance(source, str) else source
+    format = format or detect_format(source)
+
+    if format == CSV:
+        yield from read_csv_chunks(source, chunksize=chunksize)
+        return
+    if format == JSONL:
+        with pd.read_json(source, lines=True, chunksize=chunksize) as reader:
+            yield from reader
+        return
+    if format not in INPUT_FORMATS:
+        raise UnsupportedFormatError(f"Unknown input format {format!r}")
+
+    try:
+        import pyarrow.feather as feather
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise UnsupportedFormatError(f"Reading {format} input requires the pyarrow package")
+
+    if format == PARQUET:
+        parquet_file = pq.ParquetFile(_arrow_input(source), memory_map=True)
+        yield from _batches_to_frames(parquet_file.iter_batches(batch_size=chunksize), chunksize)
+    elif format == ARROW:
+        reader = ipc.open_file(_arrow_input(source))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        yield from _batches_to_frames(batches, chunksize)
+    elif format == ARROW_STREAM:
+        yield from _batches_to_frames(ipc.open_stream(_arrow_input(source)), chunksize)
+    else:
+        # Feather v1 has no record batches and is read whole
+        yield feather.read_table(_arrow_input(source)).to_pandas(split_blocks=True)
@@ -0,0 +1,431 @@
+"""
+Parallel byte-range CSV reader module.
+
+A single CSV file is split into byte ranges that start and end on record
+boundaries, and the ranges are parsed concurrently in worker processes.
+Boundaries are placed on a newline outside quoted fields: CSV escapes a
+quote inside a quoted field by doubling it, so a position is outside quotes
+exactly when the number of quote characters before it is even. The quotes
+are counted once, segment by segment, over a memory map of the file.
+
+Every worker parses its range, applies the processing pipeline and computes
+mergeable partial statistics for its rows. The parent process yields the
+ranges in file order, drops rows that duplicate rows of earlier ranges, and
+merges the partial statistics with the parallel variance formula of Chan
+et al., so the result equals a sequential read with the same pipeline.
+"""
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from app.utils.deduplication import DEFAULT_MAX_MEMORY_HASHES, RowHashSet, hash_rows
+from app.utils.pipeline import Dedupe, Pipeline, default_pipeline
+
+# Smallest byte range worth a separate task
+MIN_RANGE_BYTES = 16 * 1024 * 1024
+
+# Byte ranges per worker process, for load balancing
+RANGES_PER_PROCESS = 4
+
+
+class ColumnStats:
+    """
+    Mergeable statistics of one numeric column.
+
+    Attributes:
+        count (int): Number of non-missing values
+        mean (float): Mean of the values
+        m2 (float): Sum of squared deviations from the mean
+        min (Optional[float]): Smallest value
+        max (Optional[float]): Largest value
+    """
+    def __init__(
+        self,
+        count: int = 0,
+        mean: float = 0.0,
+        m2: float = 0.0,
+        min: Optional[float] = None,
+        max: Optional[float] = None,
+    ):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "ColumnStats":
+        """
+        Compute statistics of a numeric column.
+
+        Args:
+            series (pd.Series): Numeric column
+
+        Returns:
+            ColumnStats: Column statistics
+        """
+        values = series.dropna().to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(
+            count=len(values),
+            mean=mean,
+            m2=float(((values - mean) ** 2).sum()),
+            min=float(values.min()),
+            max=float(values.max()),
+        )
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        """
+        Combine statistics of two disjoint sets of rows.
+
+        Args:
+            other (ColumnStats): Statistics of the other rows
+
+        Returns:
+            ColumnStats: Combined statistics
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return ColumnStats(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+        )
+
+    @property
+    def std(self) -> Optional[float]:
+        """
+        Get the sample standard deviation.
+
+        Returns:
+            Optional[float]: Standard deviation, None for fewer than two values
+        """
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else None
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """
+        Get the statistics in the layout of ``DataFrame.describe``.
+
+        Returns:
+            Dict[str, Optional[float]]: Count, mean, std, min and max
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+def frame_stats(df: pd.DataFrame) -> Dict[str, ColumnStats]:
+    """
+    Compute statistics of all numeric columns.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+
+    Returns:
+        Dict[str, ColumnStats]: Statistics per numeric column
+    """
+    return {
+        column: ColumnStats.from_series(df[column])
+        for column in df.select_dtypes(include="number").columns
+    }
+
+
+def merge_frame_stats(
+    left: Dict[str, ColumnStats], right: Dict[str, ColumnStats]
+) -> Dict[str, ColumnStats]:
+    """
+    Combine per-column statistics of two disjoint sets of rows.
+
+    Args:
+        left (Dict[str, ColumnStats]): Statistics of the first rows
+        right (Dict[str, ColumnStats]): Statistics of the other rows
+
+    Returns:
+        Dict[str, ColumnStats]: Combined statistics
+    """
+    merged = dict(left)
+    for column, stats in right.items():
+        merged[column] = merged[column].merge(stats) if column in merged else stats
+    return merged
+
+
+def _buffer(source: Union[Path, IO[bytes]]):
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        fileno = source.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is not None and os.fstat(fileno).st_size > 0:
+        source.flush()
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    source.seek(0)
+    return source.read()
+
+
+def _record_end(buffer, position: int, size: int, quotechar: bytes, in_quotes: bool) -> int:
+    # Find the first newline at or after position that is outside quotes
+    while True:
+        newline = buffer.find(b"\n", position)
+        if newline == -1:
+            return size
+        if buffer[position:newline].count(quotechar) % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            return newline + 1
+        position = newline + 1
+
+
+def split_byte_ranges(
+    buffer, num_ranges: int, *, quotechar: bytes = b'"'
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Split CSV data into byte ranges that start and end on record boundaries.
+
+    Args:
+        buffer: CSV data supporting ``find``, slicing and ``len``
+        num_ranges (int): Desired number of ranges
+        quotechar (bytes): Quote character
+
+    Returns:
+        Tuple[int, List[Tuple[int, int]]]: End of the header record and the
+            (start, end) byte ranges of the data records
+    """
+    size = len(buffer)
+    has_quotes = buffer.find(quotechar) != -1
+    header_end = _record_end(buffer, 0, size, quotechar, False)
+    boundaries = [header_end]
+    data_bytes = size - header_end
+    for i in range(1, num_ranges):
+        target = header_end + data_bytes * i // num_ranges
+        previous = boundaries[-1]
+        if target <= previous:
+            continue
+        # Boundaries are outside quotes, so parity since the previous one decides
+        in_quotes = has_quotes and buffer[previous:target].count(quotechar) % 2 == 1
+        boundary = _record_end(buffer, target, size, quotechar, in_quotes)
+        if boundary >= size:
+            break
+        if boundary > previous:
+            boundaries.append(boundary)
+    boundaries.append(size)
+    ranges = [
+        (start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) if end > start
+    ]
+    return header_end, ranges
+
+
+def _parse_range(
+    path: Optional[str],
+    start: int,
+    end: int,
+    data: Optional[bytes],
+    header: bytes,
+    pipeline: Pipeline,
+    dedupe_subset: Optional[Sequence[str]],
+    dedupe: bool,
+    read_kwargs: Dict[str, Any],
+) -> Tuple[pd.DataFrame, Optional[np.ndarray], Dict[str, ColumnStats], int]:
+    if data is None:
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + data), **read_kwargs)
+    rows = len(df)
+    hashes = hash_rows(df, dedupe_subset) if dedupe else None
+    processed = pipeline.run(df)
+    if hashes is not None:
+        # The pipeline keeps the parsed RangeIndex labels of the surviving rows
+        hashes = hashes[processed.index.to_numpy()]
+    processed = processed.reset_index(drop=True)
+    return processed, hashes, frame_stats(processed), rows
+
+
+class ParallelCSVReader:
+    """
+    Read and process one CSV file in parallel byte ranges.
+
+    Iterating the reader yields the processed ranges in file order; after the
+    iteration, ``stats`` holds the merged statistics of the yielded rows.
+
+    Attributes:
+        processes (int): Worker processes
+        pipeline (Pipeline): Processing pipeline applied to every range
+        rows_read (int): Parsed input rows so far
+        stats (Dict[str, ColumnStats]): Statistics of the yielded rows so far
+    """
+    def __init__(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        *,
+        processes: int,
+        num_ranges: Optional[int] = None,
+        pipeline: Optional[Pipeline] = None,
+        max_memory_hashes: int = DEFAULT_MAX_MEMORY_HASHES,
+        quotechar: str = '"',
+        read_kwargs: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize reader.
+
+        Args:
+            source (Union[str, Path, IO[bytes]]): Path to CSV file or binary file object
+            processes (int): Worker processes
+            num_ranges (Optional[int]): Byte ranges, defaults to a few per process
+                with at least ``MIN_RANGE_BYTES`` each
+            pipeline (Optional[Pipeline]): Processing pipeline, defaults to the
+                default pipeline; a ``Dedupe`` stage must come first and
+                stages must be picklable
+            max_memory_hashes (int): Row hashes kept in memory before spilling
+                when dropping duplicates across ranges
+            quotechar (str): Quote character
+            read_kwargs (Optional[Dict[str, Any]]): Additional arguments for pd.read_csv
+            executor (Optional[Executor]): Process pool shared with other readers,
+                defaults to a pool of ``processes`` workers for this read
+
+        Raises:
+            ValueError: If a ``Dedupe`` stage is not the first stage
+        """
+        self.source = Path(source) if isinstance(source, str) else source
+        self.processes = max(processes, 1)
+        self.num_ranges = num_ranges
+        self.pipeline = pipeline or default_pipeline(max_memory_hashes=max_memory_hashes)
+        self.max_memory_hashes = max_memory_hashes
+        self.quotechar = quotechar.encode("utf-8")
+        self.read_kwargs = dict(read_kwargs or {}, quotechar=quotechar)
+        self.executor = executor
+        self.rows_read = 0
+        self.stats: Dict[str, ColumnStats] = {}
+
+        stages = self.pipeline.stages
+        if any(isinstance(stage, Dedupe) for stage in stages[1:]):
+            raise ValueError("A Dedupe stage must be the first stage for parallel reading")
+        self._dedupe: Optional[Dedupe] = (
+            stages[0] if stages and isinstance(stages[0], Dedupe) else None
+        )
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        buffer = _buffer(self.source)
+        try:
+            num_ranges = self.num_ranges or max(
+                1, min(self.processes * RANGES_PER_PROCESS, len(buffer) // MIN_RANGE_BYTES)
+            )
+            header_end, ranges = split_byte_ranges(buffer, num_ranges, quotechar=self.quotechar)
+            header = bytes(buffer[:header_end])
+            # Workers read files by path; other sources are sent range by range
+            path = str(self.source) if isinstance(self.source, Path) else None
+
+            def task(start: int, end: int) -> tuple:
+                data = None if path is not None else bytes(buffer[start:end])
+                return (
+                    path, start, end, data, header, self.pipeline,
+                    self._dedupe.subset if self._dedupe else None,
+                    self._dedupe is not None, self.read_kwargs,
+                )
+
+            if not ranges:
+                ranges = [(header_end, header_end)]
+            if self.processes == 1 or len(ranges) == 1:
+                results = (_parse_range(*task(start, end)) for start, end in ranges)
+                yield from self._merge(results)
+                return
+            if self.executor is not None:
+                yield from self._merge(self._submit_ordered(self.executor, ranges, task))
+                return
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                yield from self._merge(self._submit_ordered(executor, ranges, task))
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+    def _submit_ordered(self, executor: Executor, ranges, task) -> Iterator[tuple]:
+        # Keep a bounded window of ranges in flight so unsent data is not held in memory
+        pending: Deque[Future] = deque()
+        remaining = iter(ranges)
+        try:
+            for start, end in remaining:
+                pending.append(executor.submit(_parse_range, *task(start, end)))
+                if len(pending) >= self.processes * 2:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                for start, end in remaining:
+                    pending.append(executor.submit(_parse_range, *task(start, end)))
+                    break
+                yield result
+        finally:
+            # A shared pool outlives this read, so ranges nobody will consume are dropped
+            for future in pending:
+                future.cancel()
+
+    def _merge(self, results) -> Iterator[pd.DataFrame]:
+        spill_dir = self._dedupe.spill_dir if self._dedupe else None
+        with RowHashSet(max_memory_hashes=self.max_memory_hashes, spill_dir=spill_dir) as seen:
+            for frame, hashes, stats, rows in results:
+                self.rows_read += rows
+                if hashes is not None:
+                    is_new = seen.add_new(hashes)
+                    if not is_new.all():
+                        frame = frame[is_new].reset_index(drop=True)
+                        stats = frame_stats(frame)
+                self.stats = merge_frame_stats(self.stats, stats)
+                yield frame
+
+
+def read_csv_parallel(
+    source: Union[str, Path, IO[bytes]],
+    *,
+    processes: int,
+    pipeline: Optional[Pipeline] = None,
+    **kwargs,
+) -> Tuple[pd.DataFrame, Dict[str, ColumnStats]]:
+    """
+    Read and process one CSV file in parallel byte ranges.
+
+    Args:
+        source (Union[str, Path, IO[bytes]]): Path to CSV file or binary file object
+        processes (int): Worker processes
+        pipeline (Optional[Pipeline]): Processing pipeline, defaults to the default pipeline
+        **kwargs: Additional arguments for ``ParallelCSVReader``
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, ColumnStats]]: Processed rows and merged
+            statistics of the numeric columns
+    """
+    reader = ParallelCSVReader(source, processes=processes, pipeline=pipeline, **kwargs)
+    df = pd.concat(list(reader), ignore_index=True)
+    return df, reader.stats
@@ -0,0 +1,155 @@
+"""
+Out-of-core partitioned hash join module.
+
+Both inputs are read in chunks and hash-partitioned by the join key into
+spill files under the temp directory. Matching partitions are then joined
+one pair at a time, optionally across a process pool, and the joined rows
+are streamed to an output CSV file. Peak memory is bounded by the size of
+the largest partition pair instead of the size of the inputs, so the join
+scales with disk space rather than RAM.
+
+Rows are written partition by partition, so the output row order differs
+from ``pd.merge``; the set of rows is the same.
+"""
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.utils.deduplication import hash_rows
+from app.utils.platform import get_temp_dir
+
+# Default number of partitions each input is split into
+DEFAULT_NUM_PARTITIONS = 32
+
+# Default number of rows per chunk when reading the inputs
+DEFAULT_JOIN_CHUNK_SIZE = 500_000
+
+JoinKey = Union[str, Sequence[str]]
+
+
+def _partition_csv(
+    source: Path,
+    on: List[str],
+    num_partitions: int,
+    spill_dir: Path,
+    side: str,
+    chunksize: int,
+    read_kwargs: Dict,
+) -> pd.DataFrame:
+    # An empty frame with the input's columns and dtypes stands in for empty partitions
+    empty = pd.read_csv(source, nrows=0, **read_kwargs)
+    with pd.read_csv(source, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk_number, chunk in enumerate(reader):
+            if chunk_number == 0:
+                empty = chunk.iloc[:0]
+            # hash_rows hashes integral values as int64 whatever the column dtype, so
+            # int and float keys with the same value land in the same partition
+            partitions = hash_rows(chunk, subset=on) % np.uint64(num_partitions)
+            for partition, part in chunk.groupby(partitions, sort=False):
+                path = spill_dir / f"{side}-{int(partition):05d}-{chunk_number:06d}.pkl"
+                part.to_pickle(path)
+    return empty
+
+
+def _read_partition(
+    spill_dir: Path, side: str, partition: int, empty: pd.DataFrame
+) -> pd.DataFrame:
+    paths = sorted(spill_dir.glob(f"{side}-{partition:05d}-*.pkl"))
+    if not paths:
+        return empty
+    return pd.concat([pd.read_pickle(path) for path in paths], ignore_index=True)
+
+
+def _join_partition(
+    spill_dir: Path,
+    partition: int,
+    on: List[str],
+    how: str,
+    left_empty: pd.DataFrame,
+    right_empty: pd.DataFrame,
+) -> Tuple[Path, List[str], int]:
+    left = _read_partition(spill_dir, "left", partition, left_empty)
+    right = _read_partition(spill_dir, "right", partition, right_empty)
+    joined = pd.merge(left, right, on=on, how=how)
+    path = spill_dir / f"joined-{partition:05d}.csv"
+    joined.to_csv(path, index=False, header=False)
+    return path, list(joined.columns), len(joined)
+
+
+def partitioned_merge(
+    left_path: Union[str, Path],
+    right_path: Union[str, Path],
+    on: JoinKey,
+    output_path: Union[str, Path],
+    *,
+    how: str = "inner",
+    num_partitions: int = DEFAULT_NUM_PARTITIONS,
+    chunksize: int = DEFAULT_JOIN_CHUNK_SIZE,
+    processes: Optional[int] = None,
+    spill_dir: Optional[Union[str, Path]] = None,
+    read_kwargs: Optional[Dict] = None,
+) -> int:
+    """
+    Join two CSV files by hash-partitioning them on disk.
+
+    Args:
+        left_path (Union[str, Path]): Left CSV file
+        right_path (Union[str, Path]): Right CSV file
+        on (JoinKey): Join column or columns
+        output_path (Union[str, Path]): Output CSV file
+        how (str): Join type: ``inner``, ``left``, ``right`` or ``outer``
+        num_partitions (int): Number of partitions per input
+        chunksize (int): Rows per chunk when reading the inputs
+        processes (Optional[int]): Worker processes joining partitions
+            concurrently; None or 1 joins them in this process
+        spill_dir (Optional[Union[str, Path]]): Parent directory for spill files,
+            defaults to the application temp directory
+        read_kwargs (Optional[Dict]): Additional arguments for pd.read_csv
+
+    Returns:
+        int: Number of joined rows written
+    """
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"Unsupported join type {how!r}")
+    if num_partitions <= 0:
+        raise ValueError("num_partitions must be positive")
+    on = [on] if isinstance(on, str) else list(on)
+    read_kwargs = read_kwargs or {}
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    parent = Path(spill_dir) if spill_dir is not None else get_temp_dir()
+    parent.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix="join-", dir=parent))
+    try:
+        left_empty = _partition_csv(
+            Path(left_path), on, num_partitions, work_dir, "left", chunksize, read_kwargs
+        )
+        right_empty = _partition_csv(
+            Path(right_path), on, num_partitions, work_dir, "right", chunksize, read_kwargs
+        )
+
+        arguments = [
+            (work_dir, partition, on, how, left_empty, right_empty)
+            for partition in range(num_partitions)
+        ]
+        if processes is not None and processes > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(_join_partition, *zip(*arguments)))
+        else:
+            results = [_join_partition(*args) for args in arguments]
+
+        columns = results[0][1]
+        with open(output_path, "w", newline="", encoding="utf-8") as output:
+            pd.DataFrame(columns=columns).to_csv(output, index=False)
+            for path, _, _ in results:
+                with open(path, "r", newline="", encoding="utf-8") as part:
+                    shutil.copyfileobj(part, output)
+        return sum(rows for _, _, rows in results)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,450 @@
+"""
+Lazy DataFrame processing pipeline module.
+
+A ``Pipeline`` is an ordered list of stages that is only executed when it
+is run on a DataFrame or a stream of chunks. Before running, adjacent stages
+of the same kind are fused: consecutive filters become one expression,
+fill values and renames are merged, and casts of different columns are
+combined.
+
+Each chunk is processed in a single pass without intermediate frames:
+
+* Row stages (``Dedupe`` and ``Filter``) only narrow one shared boolean
+  mask, combined in place, and the rows are selected once, before the next
+  column stage or at the end, so column stages never see removed rows.
+* Column stages (``FillNA``, ``Cast``, ``Derive`` and ``Rename``) replace
+  or add individual columns on a shallow copy of the chunk. With
+  copy-on-write, untouched columns are shared with the input, and the
+  caller's DataFrame is never modified.
+
+So a chunk costs at most one full-frame copy, one row selection per group
+of consecutive row stages, plus one new array per changed column.
+"""
+from abc import ABC, abstractmethod
+from contextlib import ExitStack, closing
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from app.utils.deduplication import DEFAULT_MAX_MEMORY_HASHES, RowHashSet, hash_rows
+from app.utils.filter_expression import compile_filter
+
+RowStep = Callable[[pd.DataFrame, np.ndarray], None]
+ColumnStep = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+class _NoDefault:
+    # Unpickles to the module-level instance, so identity checks survive worker processes
+    def __reduce__(self) -> str:
+        return "_NO_DEFAULT"
+
+
+_NO_DEFAULT = _NoDefault()
+
+
+class PipelineError(ValueError):
+    """
+    Raised when a pipeline stage cannot be applied.
+    """
+
+
+class Stage(ABC):
+    """
+    Pipeline stage.
+    """
+    def fuse(self, following: "Stage") -> Optional["Stage"]:
+        """
+        Combine this stage with the stage that follows it.
+
+        Args:
+            following (Stage): Next stage in the pipeline
+
+        Returns:
+            Optional[Stage]: Equivalent single stage, or None if the stages cannot be fused
+        """
+        return None
+
+
+class RowStage(Stage):
+    """
+    Stage that removes rows by narrowing the row mask.
+    """
+    @abstractmethod
+    def compile(self, resources: ExitStack) -> RowStep:
+        """
+        Create the per-run step of this stage.
+
+        Args:
+            resources (ExitStack): Resources released when the run ends
+
+        Returns:
+            RowStep: Function clearing mask entries of removed rows in place
+        """
+
+
+class ColumnStage(Stage):
+    """
+    Stage that replaces, adds or renames columns.
+    """
+    @abstractmethod
+    def compile(self, resources: ExitStack) -> ColumnStep:
+        """
+        Create the per-run step of this stage.
+
+        Args:
+            resources (ExitStack): Resources released when the run ends
+
+        Returns:
+            ColumnStep: Function transforming the pipeline's private frame
+        """
+
+
+class Dedupe(RowStage):
+    """
+    Drop rows seen before, across all chunks of a run.
+
+    Attributes:
+        subset (Optional[List[str]]): Columns to consider, defaults to all
+        max_memory_hashes (int): Row hashes kept in memory before spilling
+        spill_dir (Optional[Path]): Parent directory for spill files
+    """
+    def __init__(
+        self,
+        subset: Optional[Sequence[str]] = None,
+        *,
+        max_memory_hashes: int = DEFAULT_MAX_MEMORY_HASHES,
+        spill_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.subset = list(subset) if subset is not None else None
+        self.max_memory_hashes = max_memory_hashes
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+
+    def compile(self, resources: ExitStack) -> RowStep:
+        seen = resources.enter_context(
+            RowHashSet(max_memory_hashes=self.max_memory_hashes, spill_dir=self.spill_dir)
+        )
+
+        def step(frame: pd.DataFrame, mask: np.ndarray) -> None:
+            # Only rows still selected take part, like drop_duplicates after a filter
+            positions = np.flatnonzero(mask)
+            hashes = hash_rows(frame, self.subset)
+            mask[positions[~seen.add_new(hashes[positions])]] = False
+
+        return step
+
+    def __repr__(self) -> str:
+        return f"Dedupe(subset={self.subset!r})"
+
+
+class Filter(RowStage):
+    """
+    Keep rows matching a filter expression.
+
+    Attributes:
+        expression (str): Filter expression, see ``app.utils.filter_expression``
+    """
+    def __init__(self, expression: str):
+        self.expression = expression
+        # Compile eagerly so invalid expressions fail when the pipeline is built
+        self._compiled = compile_filter(expression)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The compiled expression holds closures; recompile it after unpickling
+        return {"expression": self.expression}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["expression"])
+
+    def fuse(self, following: Stage) -> Optional[Stage]:
+        if isinstance(following, Filter):
+            return Filter(f"({self.expression}) and ({following.expression})")
+        return None
+
+    def compile(self, resources: ExitStack) -> RowStep:
+        def step(frame: pd.DataFrame, mask: np.ndarray) -> None:
+            np.logical_and(mask, self._compiled.mask(frame), out=mask)
+
+        return step
+
+    def __repr__(self) -> str:
+        return f"Filter({self.expression!r})"
+
+
+class FillNA(ColumnStage):
+    """
+    Replace missing values.
+
+    Attributes:
+        values (Dict[str, Any]): Fill value per column
+        default (Any): Fill value for all other columns, if any
+    """
+    def __init__(self, value: Any = 0, columns: Optional[Sequence[str]] = None):
+        """
+        Initialize stage.
+
+        Args:
+            value (Any): Fill value
+            columns (Optional[Sequence[str]]): Columns to fill, defaults to all
+        """
+        if columns is None:
+            self.values: Dict[str, Any] = {}
+            self.default = value
+        else:
+            self.values = {column: value for column in columns}
+            self.default = _NO_DEFAULT
+
+    def fuse(self, following: Stage) -> Optional[Stage]:
+        if not isinstance(following, FillNA):
+            return None
+        # Values filled first are no longer missing, so the first stage wins
+        if self.default is not _NO_DEFAULT:
+            return self
+        fused = FillNA()
+        fused.values = {**following.values, **self.values}
+        fused.default = following.default
+        return fused
+
+    def compile(self, resources: ExitStack) -> ColumnStep:
+        def step(frame: pd.DataFrame) -> pd.DataFrame:
+            for column in frame.columns:
+                value = self.values.get(column, self.default)
+                if value is _NO_DEFAULT:
+                    continue
+                series = frame[column]
+                # Only columns with missing values get a new array
+                if series.hasnans:
+                    frame[column] = series.fillna(value)
+            return frame
+
+        return step
+
+    def __repr__(self) -> str:
+        default = "" if self.default is _NO_DEFAULT else f"default={self.default!r}, "
+        return f"FillNA({default}values={self.values!r})"
+
+
+class Cast(ColumnStage):
+    """
+    Convert columns to other dtypes.
+
+    Attributes:
+        dtypes (Dict[str, Any]): Target dtype per column
+    """
+    def __init__(self, dtypes: Mapping[str, Any]):
+        self.dtypes = dict(dtypes)
+
+    def fuse(self, following: Stage) -> Optional[Stage]:
+        # Casting one column twice is not a single cast (e.g. float -> int -> float)
+        if isinstance(following, Cast) and not set(self.dtypes) & set(following.dtypes):
+            return Cast({**self.dtypes, **following.dtypes})
+        return None
+
+    def compile(self, resources: ExitStack) -> ColumnStep:
+        def step(frame: pd.DataFrame) -> pd.DataFrame:
+            missing = sorted(set(self.dtypes) - set(frame.columns))
+            if missing:
+                raise PipelineError(f"Cannot cast unknown columns: {missing}")
+            for column, dtype in self.dtypes.items():
+                try:
+                    frame[column] = frame[column].astype(dtype)
+                except (TypeError, ValueError) as e:
+                    raise PipelineError(f"Cannot cast column {column!r} to {dtype}: {e}") from e
+            return frame
+
+        return step
+
+    def __repr__(self) -> str:
+        return f"Cast({self.dtypes!r})"
+
+
+class Derive(ColumnStage):
+    """
+    Add or replace a column computed from other columns.
+
+    Attributes:
+        column (str): Output column
+        expression (Union[str, Callable[[pd.DataFrame], Any]]): ``DataFrame.eval``
+            expression such as ``"amount * rate"``, or a function of the frame
+    """
+    def __init__(
+        self, column: str, expression: Union[str, Callable[[pd.DataFrame], Any]]
+    ):
+        self.column = column
+        self.expression = expression
+
+    def compile(self, resources: ExitStack) -> ColumnStep:
+        def step(frame: pd.DataFrame) -> pd.DataFrame:
+            try:
+                if callable(self.expression):
+                    values = self.expression(frame)
+                else:
+                    values = frame.eval(self.expression)
+            except Exception as e:
+                raise PipelineError(f"Cannot derive column {self.column!r}: {e}") from e
+            frame[self.column] = values
+            return frame
+
+        return step
+
+    def __repr__(self) -> str:
+        return f"Derive({self.column!r}, {self.expression!r})"
+
+
+class Rename(ColumnStage):
+    """
+    Rename columns.
+
+    Attributes:
+        mapping (Dict[str, str]): Old to new column name mapping
+    """
+    def __init__(self, mapping: Mapping[str, str]):
+        self.mapping = dict(mapping)
+
+    def fuse(self, following: Stage) -> Optional[Stage]:
+        if not isinstance(following, Rename):
+            return None
+        mapping = {old: following.mapping.get(new, new) for old, new in self.mapping.items()}
+        produced = set(self.mapping.values())
+        for old, new in following.mapping.items():
+            # Columns renamed away by the first stage no longer exist under their old name
+            if old not in produced and old not in self.mapping:
+                mapping[old] = new
+        return Rename(mapping)
+
+    def compile(self, resources: ExitStack) -> ColumnStep:
+        def step(frame: pd.DataFrame) -> pd.DataFrame:
+            # Renaming only relabels the columns, the data is shared
+            return frame.rename(columns=self.mapping)
+
+        return step
+
+    def __repr__(self) -> str:
+        return f"Rename({self.mapping!r})"
+
+
+class Pipeline:
+    """
+    Lazy, composable sequence of processing stages.
+
+    Attributes:
+        stages (List[Stage]): Stages in the order they were added
+    """
+    def __init__(self, stages: Iterable[Stage] = ()):
+        """
+        Initialize pipeline.
+
+        Args:
+            stages (Iterable[Stage]): Stages to run in order
+        """
+        self.stages = list(stages)
+
+    def then(self, *stages: Stage) -> "Pipeline":
+        """
+        Create a pipeline with additional stages.
+
+        Args:
+            *stages (Stage): Stages to append
+
+        Returns:
+            Pipeline: New pipeline, this one is left unchanged
+        """
+        return Pipeline([*self.stages, *stages])
+
+    def plan(self) -> List[Stage]:
+        """
+        Fuse adjacent stages into the stages that are actually executed.
+
+        Returns:
+            List[Stage]: Execution plan
+        """
+        planned: List[Stage] = []
+        for stage in self.stages:
+            fused = planned[-1].fuse(stage) if planned else None
+            if fused is not None:
+                planned[-1] = fused
+            else:
+                planned.append(stage)
+        return planned
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run the pipeline on one DataFrame.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame, left unchanged
+
+        Returns:
+            pd.DataFrame: Processed DataFrame
+        """
+        with closing(self.run_chunks([df])) as chunks:
+            return next(chunks)
+
+    def run_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Run the pipeline on a stream of chunks.
+
+        Stateful stages such as ``Dedupe`` see all chunks of the stream.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): DataFrame chunks, left unchanged
+
+        Yields:
+            pd.DataFrame: Processed chunks
+        """
+        with ExitStack() as resources:
+            steps = [
+                (isinstance(stage, RowStage), stage.compile(resources)) for stage in self.plan()
+            ]
+            for chunk in chunks:
+                yield self._run_chunk(chunk, steps)
+
+    @staticmethod
+    def _run_chunk(chunk: pd.DataFrame, steps) -> pd.DataFrame:
+        # A shallow copy shares all column data; replacing a column never touches the input
+        frame = chunk.copy(deep=False)
+        mask: Optional[np.ndarray] = None
+        for is_row_step, step in steps:
+            if is_row_step:
+                if mask is None:
+                    mask = np.ones(len(frame), dtype=bool)
+                step(frame, mask)
+            else:
+                # Column stages only see the rows kept by the row stages before them
+                if mask is not None:
+                    if not mask.all():
+                        frame = frame[mask]
+                    mask = None
+                frame = step(frame)
+        if mask is not None and not mask.all():
+            frame = frame[mask]
+        return frame
+
+    def __repr__(self) -> str:
+        return f"Pipeline({self.stages!r})"
+
+
+def default_pipeline(max_memory_hashes: int = DEFAULT_MAX_MEMORY_HASHES) -> Pipeline:
+    """
+    Create the default processing pipeline: drop duplicate rows, then fill
+    missing values with 0.
+
+    Args:
+        max_memory_hashes (int): Row hashes kept in memory before spilling
+
+    Returns:
+        Pipeline: Default pipeline
+    """
+    return Pipeline([Dedupe(max_memory_hashes=max_memory_hashes), FillNA(0)])
@@ -0,0 +1,84 @@
+"""
+Shared worker process pool module.
+
+Parsing large CSV files and multi-file analyses run in worker processes.
+Each server process keeps one pool for all requests, so concurrent requests
+share a fixed number of worker processes instead of starting a pool each.
+Workers are started lazily, on first use, with the ``forkserver`` start
+method where available (``spawn`` elsewhere) rather than being forked from
+the multi-threaded server process. A pool broken by a crashed worker is
+replaced on the next submission.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+
+def _start_method() -> str:
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+class ProcessPool(Executor):
+    """
+    Lazily created process pool shared by the requests of one server process.
+
+    Attributes:
+        max_workers (int): Maximum worker processes
+    """
+    def __init__(self, max_workers: int):
+        """
+        Initialize pool.
+
+        Args:
+            max_workers (int): Maximum worker processes
+        """
+        self.max_workers = max(max_workers, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedule a call in a worker process.
+
+        Args:
+            fn (Callable[..., Any]): Picklable function
+            *args (Any): Positional arguments
+            **kwargs (Any): Keyword arguments
+
+        Returns:
+            Future: Result of the call
+        """
+        executor = self._get()
+        try:
+            return executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return self._get().submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the worker processes; the pool is recreated on next use.
+
+        Args:
+            wait (bool): Wait for running calls to finish
+            cancel_futures (bool): Cancel calls that have not started
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _get(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(_start_method()),
+                )
+            return self._executor
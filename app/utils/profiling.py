@@ -0,0 +1,144 @@
+"""
+Sampling profiler module.
+
+A background thread records the call stack of every thread of the process
+at a fixed interval. Unlike cProfile, which only traces the thread it was
+enabled in, this also covers the work that request handlers hand to worker
+threads with ``asyncio.to_thread``. Only stacks are sampled, so the
+profiled code runs at nearly full speed.
+
+Profiles are written in the speedscope file format, one profile per
+thread, which can be opened at https://www.speedscope.app or with the
+``speedscope`` command line tool.
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# Frame key: function name, file name and first line of the function
+Frame = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """
+    Profiler sampling the stacks of all threads.
+
+    Attributes:
+        interval (float): Seconds between samples, at least the interpreter's
+            thread switch interval for threads running Python code
+        duration (float): Seconds between start and stop
+    """
+    def __init__(self, interval: float = 0.001):
+        """
+        Initialize profiler.
+
+        Args:
+            interval (float): Seconds between samples
+        """
+        self.interval = interval
+        self.duration = 0.0
+        self._samples: Dict[str, Counter] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def start(self) -> None:
+        """
+        Start sampling in a background thread.
+        """
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling and wait for the sampling thread to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._start
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # A thread running Python code holds the GIL for up to the switch
+            # interval, so samples are weighted by the time actually elapsed
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                name = names.get(thread_id, str(thread_id))
+                self._samples.setdefault(name, Counter())[tuple(stack)] += elapsed
+
+    def speedscope(self, name: str) -> dict:
+        """
+        Get the samples in the speedscope file format.
+
+        Args:
+            name (str): Profile name shown by speedscope
+
+        Returns:
+            dict: Speedscope document with one sampled profile per thread
+        """
+        frames: List[Frame] = []
+        frame_index: Dict[Frame, int] = {}
+        profiles = []
+        for thread_name, stacks in sorted(self._samples.items()):
+            samples = []
+            weights = []
+            for stack, seconds in stacks.items():
+                indexes = []
+                for frame in stack:
+                    if frame not in frame_index:
+                        frame_index[frame] = len(frames)
+                        frames.append(frame)
+                    indexes.append(frame_index[frame])
+                samples.append(indexes)
+                weights.append(seconds)
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "app.utils.profiling",
+            "shared": {
+                "frames": [
+                    {"name": function, "file": filename, "line": line}
+                    for function, filename, line in frames
+                ],
+            },
+            "profiles": profiles,
+        }
+
+    def write(self, path: Path, name: str) -> None:
+        """
+        Write the samples as a speedscope file.
+
+        Args:
+            path (Path): Output file
+            name (str): Profile name shown by speedscope
+        """
+        path.write_text(json.dumps(self.speedscope(name)), encoding="utf-8")
@@ -0,0 +1,232 @@
+"""
+Random sampling module for fast profiling of large CSV files.
+
+Seekable files are sampled by byte offset: random positions are drawn
+across the file, and the line following each position is read, so only
+the sampled lines are parsed no matter how large the file is. Lines are
+picked with probability proportional to the length of the line before them,
+which is close to uniform for the fixed-width-ish rows typical of exports.
+A position inside a quoted field that spans lines yields a fragment of a
+record, which can parse cleanly into wrong values; if any sampled line has
+an unbalanced quote or a field count other than the header's, or the lines
+cannot be parsed, the file is reservoir sampled instead.
+
+Reservoir sampling (Algorithm R) reads every row once in chunks but keeps
+only the sample in memory, and is used for non-seekable sources and for
+inputs that are not CSV.
+"""
+import csv
+import io
+from statistics import NormalDist
+from typing import IO, Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Default number of rows drawn from a file
+DEFAULT_SAMPLE_SIZE = 10_000
+
+# Confidence level of the reported confidence intervals
+DEFAULT_CONFIDENCE = 0.95
+
+
+def reservoir_sample(
+    chunks: Iterable[pd.DataFrame], sample_size: int, rng: np.random.Generator
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Draw a uniform random sample of rows from DataFrame chunks.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks
+        sample_size (int): Number of rows to keep
+        rng (np.random.Generator): Random generator
+
+    Returns:
+        Tuple[pd.DataFrame, int]: Sampled rows and total number of rows seen
+    """
+    reservoir: Optional[pd.DataFrame] = None
+    seen = 0
+    for chunk in chunks:
+        chunk = chunk.reset_index(drop=True)
+        if reservoir is None or len(reservoir) < sample_size:
+            take = sample_size - (0 if reservoir is None else len(reservoir))
+            head = chunk.iloc[:take]
+            if reservoir is not None:
+                head = pd.concat([reservoir, head], ignore_index=True)
+            reservoir = head
+            seen = len(reservoir)
+            chunk = chunk.iloc[take:]
+        if chunk.empty:
+            continue
+        # Row i (0-based, global) replaces slot j ~ U[0, i] when j falls inside the reservoir;
+        # fancy assignment keeps the last write per slot, matching the sequential algorithm
+        slots = rng.integers(0, np.arange(seen, seen + len(chunk)) + 1)
+        replaced = np.flatnonzero(slots < sample_size)
+        if len(replaced):
+            order = np.full(sample_size, -1)
+            order[slots[replaced]] = replaced
+            # Row order within a sample is irrelevant, so replacing slots is a concat
+            reservoir = pd.concat(
+                [reservoir[order < 0], chunk.iloc[order[order >= 0]]], ignore_index=True
+            )
+        seen += len(chunk)
+    if reservoir is None:
+        reservoir = pd.DataFrame()
+    return reservoir, seen
+
+
+def _sample_lines(
+    source: IO[bytes], sample_size: int, rng: np.random.Generator
+) -> Tuple[bytes, list, int]:
+    source.seek(0)
+    header = source.readline()
+    data_start = source.tell()
+    source.seek(0, io.SEEK_END)
+    size = source.tell()
+    if size <= data_start:
+        return header, [], 0
+
+    lines: Dict[int, bytes] = {}
+    for offset in np.unique(rng.integers(data_start, size, sample_size)):
+        offset = int(offset)
+        if offset > data_start:
+            # Skip the rest of the line the offset landed in; when the previous
+            # byte is a newline this consumes only that byte
+            source.seek(offset - 1)
+            source.readline()
+        else:
+            source.seek(offset)
+        start = source.tell()
+        if start >= size or start in lines:
+            continue
+        line = source.readline()
+        lines[start] = line if line.endswith(b"\n") else line + b"\n"
+    return header, list(lines.values()), size - data_start
+
+
+def _whole_records(header: bytes, lines: Iterable[bytes]) -> bool:
+    fields = len(next(csv.reader([header.decode("utf-8-sig")])))
+    for line in lines:
+        if not line.strip():
+            continue
+        if line.count(b'"') % 2:
+            return False
+        if len(next(csv.reader([line.decode("utf-8")]))) != fields:
+            return False
+    return True
+
+
+def confidence_intervals(
+    df: pd.DataFrame, population_size: int, confidence: float = DEFAULT_CONFIDENCE
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Compute normal-approximation confidence intervals of numeric column means.
+
+    A finite population correction is applied, so the intervals shrink to the
+    sample mean when the sample covers the whole population.
+
+    Args:
+        df (pd.DataFrame): Sampled rows
+        population_size (int): (Estimated) number of rows in the population
+        confidence (float): Confidence level
+
+    Returns:
+        Dict[str, Dict[str, Optional[float]]]: Mean, lower and upper bound per column
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    intervals = {}
+    for column in df.select_dtypes(include="number").columns:
+        values = df[column].dropna()
+        n = len(values)
+        if n == 0:
+            continue
+        mean = float(values.mean())
+        if n > 1:
+            correction = (
+                np.sqrt(max(population_size - n, 0) / (population_size - 1))
+                if population_size > 1
+                else 0.0
+            )
+            margin = z * float(values.std(ddof=1)) / np.sqrt(n) * min(correction, 1.0)
+            lower, upper = float(mean - margin), float(mean + margin)
+        else:
+            lower = upper = None
+        intervals[column] = {"mean": mean, "lower": lower, "upper": upper}
+    return intervals
+
+
+def sample_csv(
+    source: IO[bytes],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    *,
+    seed: Optional[int] = None,
+    chunksize: int = 100_000,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Draw a random sample of rows from a CSV file.
+
+    Args:
+        source (IO[bytes]): Binary file object
+        sample_size (int): Number of rows to draw
+        seed (Optional[int]): Random seed for reproducible samples
+        chunksize (int): Rows per chunk when reservoir sampling
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Sampled rows and sampling details:
+            method, sample_rows, estimated_row_count and sampling_fraction
+    """
+    rng = np.random.default_rng(seed)
+    df: Optional[pd.DataFrame] = None
+    estimated_rows = 0
+
+    if source.seekable():
+        header, lines, data_bytes = _sample_lines(source, sample_size, rng)
+        if lines:
+            estimated_rows = round(data_bytes / (sum(map(len, lines)) / len(lines)))
+        # Small files are cheaper to read whole than to estimate
+        if lines and estimated_rows > 2 * sample_size:
+            try:
+                if _whole_records(header, lines):
+                    df = pd.read_csv(io.BytesIO(header + b"".join(lines)))
+            except (pd.errors.ParserError, UnicodeDecodeError):
+                df = None
+        source.seek(0)
+
+    if df is None:
+        with pd.read_csv(source, chunksize=chunksize) as reader:
+            return sample_chunks(reader, sample_size, rng=rng)
+    return df, _sampling_details("byte_offset", len(df), estimated_rows)
+
+
+def sample_chunks(
+    chunks: Iterable[pd.DataFrame],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    *,
+    seed: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Draw a random sample of rows from DataFrame chunks by reservoir sampling.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks
+        sample_size (int): Number of rows to draw
+        seed (Optional[int]): Random seed for reproducible samples
+        rng (Optional[np.random.Generator]): Random generator, overrides ``seed``
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Sampled rows and sampling details
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    df, row_count = reservoir_sample(chunks, sample_size, rng)
+    method = "full" if row_count <= sample_size else "reservoir"
+    return df, _sampling_details(method, len(df), row_count)
+
+
+def _sampling_details(method: str, sample_rows: int, estimated_rows: int) -> Dict[str, Any]:
+    return {
+        "method": method,
+        "sample_rows": sample_rows,
+        "estimated_row_count": estimated_rows,
+        "sampling_fraction": min(sample_rows / estimated_rows, 1.0) if estimated_rows else 1.0,
+    }
@@ -1,40 +1,47 @@
-"""
-Security utilities module.
-"""
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
-
-from jose import jwt
-from passlib.context import CryptContext
-
-from app.core.config import settings
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verify password.
-    
-    Args:
-        plain_password (str): Plain password
-        hashed_password (str): Hashed password
-        
-    Returns:
-        bool: True if password is valid, False otherwise
-    """
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """
-    Get password hash.
-    
-    Args:
-        password (str): Plain password
-        
-    Returns:
-        str: Hashed password
-    """
-    return pwd_context.hash(password)
+"""
+Security utilities module.
+
+passlib and bcrypt are imported when the first password is hashed or
+verified, not when the application starts.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    Get the password hashing context, creating it on first use.
+    
+    Returns:
+        CryptContext: Password hashing context
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify password.
+    
+    Args:
+        plain_password (str): Plain password
+        hashed_password (str): Hashed password
+        
+    Returns:
+        bool: True if password is valid, False otherwise
+    """
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """
+    Get password hash.
+    
+    Args:
+        password (str): Plain password
+        
+    Returns:
+        str: Hashed password
+    """
+    return get_pwd_context().hash(password)
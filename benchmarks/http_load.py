@@ -0,0 +1,804 @@
+#!/usr/bin/env python
+"""
+End-to-end HTTP benchmark script.
+
+Starts the application under uvicorn in a child process against local
+stand-ins for its databases, swapped in with FastAPI dependency overrides:
+SQLite through aiosqlite for PostgreSQL and mongomock-motor for MongoDB.
+Every route in ``app/api/routes`` is then driven over HTTP at each
+``--concurrency`` level, and requests per second, p50/p95/p99 latency,
+response status counts and the server's memory are reported.
+
+Every scenario sends the same number of requests on every run, so results
+of different commits on the same machine can be compared. The stand-ins
+have no network round trip, so the results measure the application, not
+the databases. ``POST /data-analysis/load-postgres/`` needs PostgreSQL's
+binary COPY and is skipped; ``/profiles`` is only mounted with profiling
+enabled and is not benchmarked.
+
+Usage:
+    python -m benchmarks.http_load --concurrency 1 8 32 --output http_load.json
+    python -m benchmarks.http_load --routes users logs --requests 200
+"""
+import argparse
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.serialization import generate_rows
+
+API = "/api/v1"
+
+# Routes that cannot run against the stand-ins
+SKIPPED_ROUTES = {
+    f"POST {API}/data-analysis/load-postgres/": "needs PostgreSQL binary COPY",
+}
+
+# Settings of the server process: databases stand-ins replace are never
+# reachable, so startup gives up on them quickly and readiness ignores them
+SERVER_ENV = {
+    "DB_STARTUP_TIMEOUT_SECONDS": "0.5",
+    "MONGODB_SERVER_SELECTION_TIMEOUT_MS": "200",
+    "READINESS_DATABASES": "[]",
+    "PROFILING_ENABLED": "false",
+    "METRICS_MULTIPROC_DIR": "",
+}
+
+GROUP_BY_SPEC = {"keys": ["entity"], "aggregations": {"amount": ["sum", "mean", "p95"]}}
+FILTER_EXPRESSION = "amount >= 2000 and entity in ('US01', 'DE01')"
+
+
+def serve(port: int, database: Path) -> None:
+    """
+    Run the application with database stand-ins; the child process entry point.
+
+    Args:
+        port (int): Port to listen on
+        database (Path): SQLite database file
+    """
+    import uvicorn
+    from mongomock_motor import AsyncMongoMockClient
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+    from sqlmodel import SQLModel
+
+    from app.core.config import settings
+    from app.db.instrumentation import instrument_engine
+    from app.db.mongodb import get_mongodb
+    from app.db.postgres import get_async_session
+    from app.main import app
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database}", connect_args={"timeout": 60}
+    )
+    # Queries are counted and timed as they are against PostgreSQL
+    instrument_engine(engine)
+    session_factory = async_sessionmaker(
+        bind=engine, expire_on_commit=False, class_=AsyncSession
+    )
+    mongodb = AsyncMongoMockClient()[settings.MONGODB_DB_NAME]
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            await conn.run_sync(SQLModel.metadata.create_all)
+        # Connections belong to this event loop; the server runs its own
+        await engine.dispose()
+
+    async def get_sqlite_session():
+        async with session_factory() as session:
+            yield session
+
+    async def get_mongomock():
+        yield mongodb
+
+    asyncio.run(create_tables())
+    app.dependency_overrides[get_async_session] = get_sqlite_session
+    app.dependency_overrides[get_mongodb] = get_mongomock
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def generate_csv(rows: int) -> bytes:
+    """
+    Generate a ledger CSV file.
+
+    Args:
+        rows (int): Number of rows
+
+    Returns:
+        bytes: CSV file contents
+    """
+    buffer = io.StringIO()
+    records = generate_rows(rows)
+    writer = csv.DictWriter(buffer, fieldnames=list(records[0]))
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue().encode()
+
+
+def user_payload(n: int) -> Dict[str, Any]:
+    """
+    Build a user creation payload with a unique email.
+
+    Args:
+        n (int): Unique number
+
+    Returns:
+        Dict[str, Any]: Request body
+    """
+    return {
+        "email": f"bench{n}@example.com",
+        "full_name": f"Bench User {n}",
+        "password": "password",
+        "hashed_password": "$2b$12$" + "x" * 53,
+    }
+
+
+def log_payload(n: int) -> Dict[str, Any]:
+    """
+    Build a log entry payload.
+
+    Args:
+        n (int): Unique number
+
+    Returns:
+        Dict[str, Any]: Request body
+    """
+    return {
+        "level": ("INFO", "WARNING", "ERROR")[n % 3],
+        "message": f"Request {n} completed",
+        "service": "api",
+        "metadata": {"request_id": n, "duration_ms": n % 250 + 0.5},
+        "tags": ["http", "api"],
+    }
+
+
+# Unique numbers for emails, messages and ID indexes across a run
+_numbers = itertools.count()
+
+
+def reserve_numbers(count: int) -> List[int]:
+    """
+    Reserve consecutive unique numbers.
+
+    Args:
+        count (int): Amount of numbers
+
+    Returns:
+        List[int]: Numbers
+    """
+    return list(itertools.islice(_numbers, count))
+
+
+# Creates the state requests need from the client and the number of requests
+Prepare = Callable[[httpx.AsyncClient, int], Awaitable[Dict[str, Any]]]
+
+
+class Scenario:
+    """
+    Requests to one route.
+
+    Attributes:
+        method (str): HTTP method
+        route (str): Route template
+        build (Callable[[Dict[str, Any], int], Dict[str, Any]]): Builds the
+            URL and keyword arguments of a request from the prepared state
+            and a unique request number
+        expected (Tuple[int, ...]): Status codes that are not errors
+        cost (int): Relative cost; the scenario sends ``--requests / cost`` requests
+        prepare (Optional[Prepare]): Creates the state the requests need, untimed
+    """
+    def __init__(
+        self,
+        method: str,
+        route: str,
+        build: Callable[[Dict[str, Any], int], Dict[str, Any]],
+        *,
+        expected: Tuple[int, ...] = (200,),
+        cost: int = 1,
+        prepare: Optional[Prepare] = None,
+    ):
+        """
+        Initialize scenario.
+
+        Args:
+            method (str): HTTP method
+            route (str): Route template
+            build (Callable[[Dict[str, Any], int], Dict[str, Any]]): Request builder
+            expected (Tuple[int, ...]): Status codes that are not errors
+            cost (int): Relative cost
+            prepare (Optional[Prepare]): Untimed preparation of the state
+        """
+        self.method = method
+        self.route = route
+        self.build = build
+        self.expected = expected
+        self.cost = cost
+        self.prepare = prepare
+
+    @property
+    def name(self) -> str:
+        """
+        Get the scenario name.
+
+        Returns:
+            str: Method and route template
+        """
+        return f"{self.method} {self.route}"
+
+
+async def gather_limited(calls: List[Callable[[], Awaitable[Any]]], limit: int = 16) -> List[Any]:
+    """
+    Await calls with bounded concurrency.
+
+    Args:
+        calls (List[Callable[[], Awaitable[Any]]]): Coroutine functions
+        limit (int): Calls awaited at once
+
+    Returns:
+        List[Any]: Results in call order
+
+    Raises:
+        Exception: The first exception raised by a call; calls not started
+            by then are skipped
+    """
+    semaphore = asyncio.Semaphore(limit)
+    errors: List[Exception] = []
+
+    async def run(call):
+        async with semaphore:
+            if errors:
+                return None
+            try:
+                return await call()
+            except Exception as e:
+                errors.append(e)
+
+    results = await asyncio.gather(*(run(call) for call in calls))
+    if errors:
+        raise errors[0]
+    return results
+
+
+async def create(client: httpx.AsyncClient, url: str, key: str, count: int, **kwargs) -> List[Any]:
+    """
+    Create resources through the API.
+
+    Args:
+        client (httpx.AsyncClient): Client
+        url (str): Creation URL
+        key (str): Response field holding the resource ID
+        count (int): Number of resources
+        kwargs: Request arguments per resource, as functions of a unique number
+
+    Returns:
+        List[Any]: Resource IDs
+    """
+    async def create_one(n: int):
+        response = await client.post(url, **{name: build(n) for name, build in kwargs.items()})
+        response.raise_for_status()
+        return response.json()[key]
+
+    return await gather_limited([lambda n=n: create_one(n) for n in reserve_numbers(count)])
+
+
+def once(prepare: Prepare) -> Prepare:
+    """
+    Share the state of a preparation between the scenarios and levels using it.
+
+    Args:
+        prepare (Prepare): Preparation
+
+    Returns:
+        Prepare: Preparation running only on its first call
+    """
+    state: Dict[str, Any] = {}
+
+    async def prepare_once(client: httpx.AsyncClient, count: int) -> Dict[str, Any]:
+        if not state:
+            state.update(await prepare(client, count))
+        return state
+
+    return prepare_once
+
+
+def build_scenarios(csv_bytes: bytes, seed: int) -> List[Scenario]:
+    """
+    Build the scenarios for all benchmarked routes.
+
+    Args:
+        csv_bytes (bytes): CSV file uploaded to the data analysis routes
+        seed (int): Number of users and log entries created for read and update routes
+
+    Returns:
+        List[Scenario]: Scenarios in run order
+    """
+    small_csv = generate_csv(20)
+    csv_file = {"file": ("ledger.csv", csv_bytes, "text/csv")}
+    data_analysis = f"{API}/data-analysis"
+
+    @once
+    async def users(client, count):
+        return {"ids": await create(client, f"{API}/users/", "id", seed, json=user_payload)}
+
+    async def users_to_delete(client, count):
+        return {"ids": await create(client, f"{API}/users/", "id", count, json=user_payload)}
+
+    @once
+    async def logs(client, count):
+        return {"ids": await create(client, f"{API}/logs/", "_id", seed, json=log_payload)}
+
+    async def logs_to_delete(client, count):
+        return {"ids": await create(client, f"{API}/logs/", "_id", count, json=log_payload)}
+
+    @once
+    async def dataset(client, count):
+        response = await client.post(
+            f"{data_analysis}/upload-csv/", files=csv_file, params={"cache": "true"}
+        )
+        response.raise_for_status()
+        return {"id": response.json()["dataset_id"]}
+
+    async def datasets_to_delete(client, count):
+        ids = await create(
+            client, f"{data_analysis}/upload-csv/", "dataset_id", count,
+            files=lambda n: {"file": ("small.csv", small_csv, "text/csv")},
+        )
+        return {"ids": ids}
+
+    @once
+    async def job(client, count):
+        response = await client.post(
+            f"{data_analysis}/upload-csv/", files=csv_file, params={"mode": "job"}
+        )
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+        while True:
+            status = (await client.get(f"{data_analysis}/jobs/{job_id}")).json()["status"]
+            if status in ("completed", "failed"):
+                return {"id": job_id}
+            await asyncio.sleep(0.05)
+
+    def by_index(template: str, **kwargs):
+        # Request numbers are consecutive, so each ID is used once when
+        # there are as many IDs as requests
+        return lambda state, n: {
+            "url": template.format(id=state["ids"][n % len(state["ids"])]), **kwargs
+        }
+
+    def fixed(url: str, **kwargs):
+        return lambda state, n: {"url": url, **kwargs}
+
+    return [
+        Scenario("GET", "/health/live", fixed("/health/live")),
+        Scenario("GET", "/health/ready", fixed("/health/ready")),
+        Scenario("GET", "/metrics", fixed("/metrics")),
+        Scenario("GET", f"{API}/users/", fixed(f"{API}/users/", params={"limit": 100}),
+                 prepare=users),
+        Scenario("POST", f"{API}/users/",
+                 lambda state, n: {"url": f"{API}/users/", "json": user_payload(n)},
+                 expected=(201,)),
+        Scenario("GET", f"{API}/users/{{user_id}}", by_index(f"{API}/users/{{id}}"),
+                 prepare=users),
+        Scenario("PUT", f"{API}/users/{{user_id}}",
+                 lambda state, n: {
+                     "url": f"{API}/users/{state['ids'][n % len(state['ids'])]}",
+                     "json": {"full_name": f"Renamed {n}"},
+                 },
+                 prepare=users),
+        Scenario("DELETE", f"{API}/users/{{user_id}}", by_index(f"{API}/users/{{id}}"),
+                 prepare=users_to_delete),
+        Scenario("GET", f"{API}/logs/", fixed(f"{API}/logs/", params={"limit": 100}),
+                 prepare=logs),
+        Scenario("POST", f"{API}/logs/",
+                 lambda state, n: {"url": f"{API}/logs/", "json": log_payload(n)},
+                 expected=(201,)),
+        Scenario("GET", f"{API}/logs/{{log_id}}", by_index(f"{API}/logs/{{id}}"),
+                 prepare=logs),
+        Scenario("PUT", f"{API}/logs/{{log_id}}",
+                 lambda state, n: {
+                     "url": f"{API}/logs/{state['ids'][n % len(state['ids'])]}",
+                     "json": {"message": f"Updated {n}"},
+                 },
+                 prepare=logs),
+        Scenario("DELETE", f"{API}/logs/{{log_id}}", by_index(f"{API}/logs/{{id}}"),
+                 expected=(204,), prepare=logs_to_delete),
+        Scenario("POST", f"{data_analysis}/upload-csv/",
+                 fixed(f"{data_analysis}/upload-csv/", files=csv_file, params={"cache": "false"}),
+                 cost=10),
+        Scenario("POST", f"{data_analysis}/upload-csv/batch/",
+                 fixed(f"{data_analysis}/upload-csv/batch/", files=[
+                     ("files", ("a.csv", csv_bytes, "text/csv")),
+                     ("files", ("b.csv", csv_bytes, "text/csv")),
+                 ]),
+                 cost=20),
+        Scenario("POST", f"{data_analysis}/filter/",
+                 fixed(f"{data_analysis}/filter/", files=csv_file,
+                       data={"expression": FILTER_EXPRESSION}),
+                 cost=10),
+        Scenario("POST", f"{data_analysis}/group-by/",
+                 fixed(f"{data_analysis}/group-by/", files=csv_file,
+                       data={"spec": json.dumps(GROUP_BY_SPEC)}),
+                 cost=10),
+        Scenario("GET", f"{data_analysis}/datasets/{{dataset_id}}",
+                 lambda state, n: {"url": f"{data_analysis}/datasets/{state['id']}"},
+                 cost=5, prepare=dataset),
+        Scenario("POST", f"{data_analysis}/datasets/{{dataset_id}}/filter",
+                 lambda state, n: {
+                     "url": f"{data_analysis}/datasets/{state['id']}/filter",
+                     "data": {"expression": FILTER_EXPRESSION},
+                 },
+                 cost=5, prepare=dataset),
+        Scenario("POST", f"{data_analysis}/datasets/{{dataset_id}}/group-by",
+                 lambda state, n: {
+                     "url": f"{data_analysis}/datasets/{state['id']}/group-by",
+                     "json": GROUP_BY_SPEC,
+                 },
+                 cost=5, prepare=dataset),
+        Scenario("DELETE", f"{data_analysis}/datasets/{{dataset_id}}",
+                 by_index(f"{data_analysis}/datasets/{{id}}"),
+                 expected=(204,), cost=5, prepare=datasets_to_delete),
+        Scenario("GET", f"{data_analysis}/jobs/{{job_id}}",
+                 lambda state, n: {"url": f"{data_analysis}/jobs/{state['id']}"},
+                 prepare=job),
+        Scenario("GET", f"{data_analysis}/jobs/{{job_id}}/export",
+                 lambda state, n: {"url": f"{data_analysis}/jobs/{state['id']}/export"},
+                 cost=10, prepare=job),
+    ]
+
+
+def server_memory(pid: int) -> Dict[str, Optional[int]]:
+    """
+    Get the resident memory of a process.
+
+    Args:
+        pid (int): Process ID
+
+    Returns:
+        Dict[str, Optional[int]]: Current and peak RSS in bytes, None if unavailable
+    """
+    memory = {"rss_bytes": None, "peak_rss_bytes": None}
+    status = Path(f"/proc/{pid}/status")
+    if not status.exists():
+        return memory
+    for line in status.read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            memory["rss_bytes"] = int(line.split()[1]) * 1024
+        elif line.startswith("VmHWM:"):
+            memory["peak_rss_bytes"] = int(line.split()[1]) * 1024
+    return memory
+
+
+def reset_peak_memory(pid: int) -> None:
+    """
+    Reset the peak RSS of a process to its current RSS, on Linux.
+
+    Args:
+        pid (int): Process ID
+    """
+    try:
+        Path(f"/proc/{pid}/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Get a percentile by the nearest-rank method.
+
+    Args:
+        sorted_values (List[float]): Values in ascending order
+        fraction (float): Percentile as a fraction, such as 0.95
+
+    Returns:
+        float: Percentile value
+    """
+    index = max(int(-(-fraction * len(sorted_values) // 1)) - 1, 0)
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    state: Dict[str, Any],
+    numbers: List[int],
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Send the requests of a scenario and measure them.
+
+    Args:
+        client (httpx.AsyncClient): Client
+        scenario (Scenario): Scenario
+        state (Dict[str, Any]): Prepared state
+        numbers (List[int]): Unique number of each request
+        concurrency (int): Requests in flight at once
+
+    Returns:
+        Dict[str, Any]: Throughput, latency percentiles and status counts
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    pending = iter(numbers)
+
+    async def worker() -> None:
+        for n in pending:
+            kwargs = scenario.build(state, n)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **kwargs)
+                await response.aread()
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(numbers)))))
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    expected = {str(code) for code in scenario.expected}
+    return {
+        "requests": len(numbers),
+        "errors": sum(count for status, count in statuses.items() if status not in expected),
+        "statuses": statuses,
+        "seconds": round(seconds, 4),
+        "requests_per_second": round(len(numbers) / seconds, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def check_coverage(client: httpx.AsyncClient, scenarios: List[Scenario]) -> List[str]:
+    """
+    Find API routes that have neither a scenario nor a reason to be skipped.
+
+    Args:
+        client (httpx.AsyncClient): Client
+        scenarios (List[Scenario]): All scenarios
+
+    Returns:
+        List[str]: Uncovered routes as method and path template
+    """
+    schema = (await client.get(f"{API}/openapi.json")).json()
+    covered = {scenario.name for scenario in scenarios} | set(SKIPPED_ROUTES)
+    routes = [
+        f"{method.upper()} {path}"
+        for path, operations in schema["paths"].items()
+        for method in operations
+    ]
+    return [route for route in routes if route not in covered and route != "GET /"]
+
+
+async def wait_for_server(client: httpx.AsyncClient, process: subprocess.Popen) -> None:
+    """
+    Wait until the server answers its liveness check.
+
+    Args:
+        client (httpx.AsyncClient): Client
+        process (subprocess.Popen): Server process
+
+    Raises:
+        RuntimeError: If the server exits or does not start within a minute
+    """
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if (await client.get("/health/live")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start within 60 seconds")
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    args: argparse.Namespace,
+    pid: int,
+) -> Dict[str, Any]:
+    """
+    Prepare and measure one scenario at one concurrency level.
+
+    Args:
+        client (httpx.AsyncClient): Client used only for this level
+        scenario (Scenario): Scenario
+        requests (int): Measured requests
+        concurrency (int): Concurrent requests
+        args (argparse.Namespace): Command line arguments
+        pid (int): Server process ID
+
+    Returns:
+        Dict[str, Any]: Result, with an ``error`` entry if preparation failed
+    """
+    total = requests + args.warmup
+    try:
+        state = await scenario.prepare(client, total) if scenario.prepare else {}
+    except httpx.HTTPError as e:
+        error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        return {
+            "route": scenario.name,
+            "concurrency": concurrency,
+            "error": f"preparation failed: {error}",
+        }
+    numbers = reserve_numbers(total)
+    if args.warmup:
+        await run_scenario(client, scenario, state, numbers[:args.warmup], concurrency)
+    reset_peak_memory(pid)
+    measured = await run_scenario(client, scenario, state, numbers[args.warmup:], concurrency)
+    return {
+        "route": scenario.name,
+        "concurrency": concurrency,
+        **measured,
+        **server_memory(pid),
+    }
+
+
+async def run(args: argparse.Namespace, base_url: str, process: subprocess.Popen) -> Dict[str, Any]:
+    """
+    Run all selected scenarios at every concurrency level.
+
+    A scenario whose preparation fails is reported with the error and
+    skipped, so one broken route does not hide the results of the others.
+
+    Args:
+        args (argparse.Namespace): Command line arguments
+        base_url (str): Server URL
+        process (subprocess.Popen): Server process
+
+    Returns:
+        Dict[str, Any]: Results
+    """
+    def connect(concurrency: int) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120)
+
+    async with connect(1) as client:
+        await wait_for_server(client, process)
+        scenarios = build_scenarios(generate_csv(args.rows), args.seed)
+        uncovered = await check_coverage(client, scenarios)
+    for route in uncovered:
+        print(f"warning: no scenario for {route}", file=sys.stderr)
+    if args.routes:
+        scenarios = [
+            scenario for scenario in scenarios
+            if any(pattern in scenario.name for pattern in args.routes)
+        ]
+
+    results = []
+    pid = process.pid
+    idle = server_memory(pid)
+    print(f"{'Route':<58} {'Conc':>4} {'Req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'Errors':>6} {'Peak MB':>8}")
+    for scenario in scenarios:
+        requests = max(args.requests // scenario.cost, 1)
+        for concurrency in args.concurrency:
+            # A fresh client per level: the server drops keep-alive connections
+            # after errors, and a dead pooled connection would fail the next
+            # scenario's preparation
+            async with connect(concurrency) as client:
+                result = await run_level(client, scenario, requests, concurrency, args, pid)
+            results.append(result)
+            if "error" in result:
+                print(f"{scenario.name:<58} {concurrency:>4} {result['error']}")
+                continue
+            print(f"{scenario.name:<58} {concurrency:>4} {result['requests_per_second']:>9.1f} "
+                  f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                  f"{result['p99_ms']:>8.2f} {result['errors']:>6} "
+                  f"{(result['peak_rss_bytes'] or 0) / 1e6:>8.1f}")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "rows": args.rows,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "idle_rss_bytes": idle["rss_bytes"],
+        "skipped": SKIPPED_ROUTES,
+        "uncovered": uncovered,
+        "results": results,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """
+    Get the commit of the working tree.
+
+    Returns:
+        Optional[str]: Abbreviated commit hash, None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port() -> int:
+    """
+    Get a free local TCP port.
+
+    Returns:
+        int: Port number
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32],
+                        help="Requests in flight at once, one run per level")
+    parser.add_argument("--requests", type=int, default=1000,
+                        help="Requests per route and level, divided by the route's cost")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests first")
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows of uploaded CSV files")
+    parser.add_argument("--seed", type=int, default=200,
+                        help="Users and log entries created for read and update routes")
+    parser.add_argument("--routes", nargs="+", help="Only routes containing one of these")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--database", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.database)
+        return 0
+
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-http-") as directory:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.http_load",
+             "--serve", str(port), "--database", str(Path(directory) / "bench.db")],
+            env={**os.environ, **SERVER_ENV},
+        )
+        try:
+            results = asyncio.run(run(args, f"http://127.0.0.1:{port}", process))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    failed = any(result.get("errors", 1) for result in results["results"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+Input format benchmark script.
+
+Writes the same generated dataset as CSV, JSON Lines, Parquet and Arrow IPC
+(Feather), then loads each file through ``read_input_chunks`` in a fresh
+process and reports file size, parse time and peak memory.
+
+Usage:
+    python -m benchmarks.input_formats --rows 1000000 --output results.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMATS = {
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+
+def generate_dataset(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a ledger-like dataset.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Generated dataset
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "entity": rng.choice(["US01", "US02", "DE01", "JP01"], rows),
+        "account": rng.integers(1000, 9999, rows),
+        "amount": rng.normal(1000, 250, rows).round(2),
+        "posted_at": pd.Timestamp("2024-01-01") + pd.to_timedelta(
+            rng.integers(0, 365 * 24 * 3600, rows), unit="s"
+        ),
+    })
+
+
+def write_dataset(df: pd.DataFrame, directory: Path) -> dict:
+    """
+    Write the dataset in every benchmarked format.
+
+    Args:
+        df (pd.DataFrame): Dataset
+        directory (Path): Output directory
+
+    Returns:
+        dict: Format to file path mapping
+    """
+    paths = {name: directory / f"dataset{suffix}" for name, suffix in FORMATS.items()}
+    df.to_csv(paths["csv"], index=False)
+    df.to_json(paths["jsonl"], orient="records", lines=True, date_format="iso")
+    df.to_parquet(paths["parquet"], index=False)
+    df.to_feather(paths["arrow"])
+    return paths
+
+
+def _peak_rss_bytes():
+    # ru_maxrss survives exec on Linux and would include the parent's peak;
+    # VmHWM belongs to this process's address space only
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _current_rss_bytes():
+    try:
+        import psutil
+    except ImportError:
+        return _peak_rss_bytes()
+    return psutil.Process().memory_info().rss
+
+
+def run_one(path: Path) -> dict:
+    """
+    Load one file and measure parse time and peak memory in this process.
+
+    Args:
+        path (Path): Input file
+
+    Returns:
+        dict: Rows, seconds and peak RSS
+    """
+    from app.utils.input_formats import detect_format, read_input_chunks
+
+    if detect_format(path) not in ("csv", "jsonl"):
+        # Import pyarrow before the baseline so only the data is measured
+        import pyarrow.parquet  # noqa: F401
+
+    baseline = _current_rss_bytes()
+    started = time.perf_counter()
+    df = pd.concat(read_input_chunks(path), ignore_index=True)
+    seconds = time.perf_counter() - started
+    peak = _peak_rss_bytes()
+    return {
+        "rows": len(df),
+        "seconds": round(seconds, 4),
+        "peak_rss_bytes": peak,
+        "peak_rss_increase_bytes": None if peak is None else peak - baseline,
+    }
+
+
+def main() -> int:
+    """
+    Run the benchmark.
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--run-one", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one)))
+        return 0
+
+    results = {"rows": args.rows, "formats": {}}
+    with tempfile.TemporaryDirectory(prefix="bench-formats-") as directory:
+        paths = write_dataset(generate_dataset(args.rows), Path(directory))
+        for name, path in paths.items():
+            runs = []
+            for _ in range(args.repeat):
+                # A fresh process per run keeps peak memory from leaking between formats
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.input_formats", "--run-one", str(path)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                runs.append(json.loads(output))
+            best = min(runs, key=lambda run: run["seconds"])
+            results["formats"][name] = {"file_bytes": path.stat().st_size, **best}
+            print(
+                f"{name:8} {path.stat().st_size / 1e6:9.1f} MB {best['seconds']:8.3f} s "
+                f"{(best['peak_rss_increase_bytes'] or 0) / 1e6:9.1f} MB peak"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,769 @@
+#!/usr/bin/env python
+"""
+Microbenchmark harness script.
+
+Times hot paths in isolation: MongoDB document conversion, user repository
+queries, the ``app.utils.data_processing`` functions on 1,000 to 10,000,000
+rows, and password hashing. Each case is timed with ``timeit``: the number
+of calls per measurement is chosen so a measurement takes at least 0.2 s,
+and the best and median time per call and the interquartile range (IQR) of
+``--repeat`` measurements are reported.
+
+``run --baseline-ref REF`` checks for regressions: it checks out ``REF``
+into a temporary git worktree and times every case in the working tree and
+in that checkout in alternation, one measurement each per round, in two
+worker processes. Drift of the machine during the run then slows both
+alike, and a case regressed if its time per call in the working tree
+exceeds that of ``REF`` by more than ``--threshold`` in three of four
+rounds. The exit status is 1 if a case regressed.
+
+``run`` also writes the results with the machine and library versions to a
+JSON file, and ``compare`` prints the changes between two such files,
+marking cases that changed by more than ``--threshold`` and by more than
+three times the larger IQR of the two runs. Separate runs drift by more
+than that on shared machines, so these comparisons only report changes;
+they need at least ``MIN_REPEAT`` measurements per case in both files.
+
+Usage:
+    python -m benchmarks.micro run --baseline-ref main
+    python -m benchmarks.micro run --output micro.json
+    python -m benchmarks.micro run --cases data_processing --max-rows 10000000
+    python -m benchmarks.micro compare benchmarks/baselines/micro.json micro.json
+    python -m benchmarks.micro run --compare benchmarks/baselines/micro.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.input_formats import generate_dataset
+
+# Data sizes of the data processing cases
+ROW_COUNTS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Documents converted per MongoDB repository case, as in pages of results
+DOCUMENT_COUNTS = (100, 1_000, 10_000)
+
+# Users in the database of the user repository cases
+USER_COUNT = 10_000
+
+# Packages whose versions are recorded with the results
+PACKAGES = ("pandas", "numpy", "pydantic", "sqlalchemy", "sqlmodel", "passlib", "bcrypt")
+
+DEFAULT_THRESHOLD = 0.10
+
+# Repository root, the working directory of worker processes
+ROOT = Path(__file__).resolve().parent.parent
+
+# Measurements per case needed to estimate its spread for a comparison
+MIN_REPEAT = 10
+
+# Interquartile ranges a case must slow down by to count as a regression
+NOISE_IQRS = 3
+
+# Builds the function to time; called once, untimed
+Setup = Callable[[], Callable[[], Any]]
+
+
+def generate_frame(rows: int) -> pd.DataFrame:
+    """
+    Generate a ledger dataset with duplicate rows and missing amounts.
+
+    Every 100th row repeats its predecessor and every 100th amount is
+    missing, so deduplication and filling have work to do.
+
+    Args:
+        rows (int): Number of rows
+
+    Returns:
+        pd.DataFrame: Generated dataset
+    """
+    source = np.arange(rows)
+    source[1::100] -= 1
+    df = generate_dataset(rows).iloc[source].reset_index(drop=True)
+    df.loc[df.index % 100 == 50, "amount"] = np.nan
+    return df
+
+
+def data_processing_cases(max_rows: int) -> Dict[str, Setup]:
+    """
+    Build the data processing cases.
+
+    Args:
+        max_rows (int): Largest data size
+
+    Returns:
+        Dict[str, Setup]: Case name and setup
+    """
+    from app.utils.data_processing import (
+        filter_dataframe,
+        group_and_aggregate,
+        merge_dataframes,
+        process_dataframe,
+    )
+
+    accounts = pd.DataFrame({"account": np.arange(1000, 9999)})
+    accounts["name"] = "Account " + accounts["account"].astype(str)
+    frames: Dict[int, pd.DataFrame] = {}
+
+    def frame(rows: int) -> pd.DataFrame:
+        # One dataset per size, kept while the cases of that size run
+        if rows not in frames:
+            frames.clear()
+            frames[rows] = generate_frame(rows)
+        return frames[rows]
+
+    cases = {}
+    for rows in (count for count in ROW_COUNTS if count <= max_rows):
+        cases.update({
+            f"data_processing.process_dataframe[{rows}]":
+                lambda rows=rows: lambda df=frame(rows): process_dataframe(df),
+            f"data_processing.filter_dataframe[{rows}]":
+                lambda rows=rows: lambda df=frame(rows): filter_dataframe(df, "entity", "US01"),
+            f"data_processing.group_and_aggregate[entity,{rows}]":
+                lambda rows=rows: lambda df=frame(rows): group_and_aggregate(
+                    df, "entity", "amount", "sum"
+                ),
+            f"data_processing.group_and_aggregate[account,{rows}]":
+                lambda rows=rows: lambda df=frame(rows): group_and_aggregate(
+                    df, "account", "amount", "mean"
+                ),
+            f"data_processing.merge_dataframes[{rows}]":
+                lambda rows=rows: lambda df=frame(rows): merge_dataframes(
+                    df, accounts, on="account"
+                ),
+        })
+    return cases
+
+
+def mongodb_repository_cases() -> Dict[str, Setup]:
+    """
+    Build the MongoDB document conversion cases.
+
+    Documents are shallow-copied before conversion, since conversion
+    replaces their ``_id``; the copy is part of the measured time.
+
+    Returns:
+        Dict[str, Setup]: Case name and setup
+    """
+    from bson import ObjectId
+
+    from app.db.repositories.log_entry import LogEntryRepository
+
+    repository = LogEntryRepository()
+
+    def setup(count: int) -> Callable[[], Any]:
+        start = datetime.datetime(2024, 1, 1)
+        documents = [
+            {
+                "_id": ObjectId(),
+                "created_at": start + datetime.timedelta(seconds=i),
+                "updated_at": start + datetime.timedelta(seconds=i),
+                "level": ("INFO", "WARNING", "ERROR")[i % 3],
+                "message": f"Request {i} completed",
+                "service": "api",
+                "metadata": {"request_id": i, "duration_ms": i % 250 + 0.5},
+                "tags": ["http", "api"],
+            }
+            for i in range(count)
+        ]
+        return lambda: [repository.to_model(dict(document)) for document in documents]
+
+    return {
+        f"mongodb_repository.to_model[{count}]": lambda count=count: setup(count)
+        for count in DOCUMENT_COUNTS
+    }
+
+
+def user_repository_cases() -> Dict[str, Setup]:
+    """
+    Build the user repository cases.
+
+    The repository methods run against an in-memory SQLite database through
+    aiosqlite, so the times cover statement building, SQLAlchemy's
+    statement cache, ORM loading and the event loop round trip, but no
+    network. Compiling the repository's statements for PostgreSQL, as
+    happens on every statement cache miss, is measured separately.
+
+    Returns:
+        Dict[str, Setup]: Case name and setup
+    """
+    from sqlalchemy import insert
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.pool import StaticPool
+    from sqlmodel import SQLModel, select
+
+    from app.db.repositories.user import UserRepository
+    from app.models.user import User
+
+    repository = UserRepository()
+    state: Dict[str, Any] = {}
+
+    def session() -> Tuple[asyncio.AbstractEventLoop, AsyncSession]:
+        # One database for all cases, created on first use
+        if not state:
+            loop = asyncio.new_event_loop()
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            now = datetime.datetime.now(datetime.timezone.utc)
+
+            async def create() -> None:
+                async with engine.begin() as conn:
+                    await conn.run_sync(SQLModel.metadata.create_all)
+                    await conn.execute(insert(User), [
+                        {
+                            "email": f"user{i}@example.com",
+                            "full_name": f"User {i}",
+                            "hashed_password": "$2b$12$" + "x" * 53,
+                            "is_active": True,
+                            "is_superuser": False,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for i in range(USER_COUNT)
+                    ])
+
+            loop.run_until_complete(create())
+            state["loop"] = loop
+            state["session"] = AsyncSession(engine, expire_on_commit=False)
+        return state["loop"], state["session"]
+
+    def query(build: Callable[[AsyncSession, int], Any]) -> Callable[[], Any]:
+        loop, db = session()
+        counter = iter(range(sys.maxsize))
+
+        def call():
+            # Vary the looked-up user so results do not come from the identity map
+            result = loop.run_until_complete(build(db, next(counter) % USER_COUNT + 1))
+            db.expunge_all()
+            return result
+
+        return call
+
+    def compile_statements() -> None:
+        # The statements of get, get_by_email and get_all
+        dialect = postgresql.dialect()
+        for statement in (
+            select(User).where(User.id == 1),
+            select(User).where(User.email == "user1@example.com"),
+            select(User).offset(0).limit(100),
+        ):
+            statement.compile(dialect=dialect)
+
+    return {
+        "user_repository.get": lambda: query(lambda db, n: repository.get(db, n)),
+        "user_repository.get_by_email": lambda: query(
+            lambda db, n: repository.get_by_email(db, f"user{n}@example.com")
+        ),
+        "user_repository.get_all[100]": lambda: query(
+            lambda db, n: repository.get_all(db, skip=n % (USER_COUNT - 100), limit=100)
+        ),
+        "user_repository.compile_statements": lambda: compile_statements,
+    }
+
+
+def security_cases() -> Dict[str, Setup]:
+    """
+    Build the password hashing cases.
+
+    Returns:
+        Dict[str, Setup]: Case name and setup
+    """
+    from app.utils.security import get_password_hash, verify_password
+
+    def verify() -> Callable[[], Any]:
+        hashed = get_password_hash("correct horse battery staple")
+        return lambda: verify_password("correct horse battery staple", hashed)
+
+    return {
+        "security.get_password_hash": lambda: lambda: get_password_hash(
+            "correct horse battery staple"
+        ),
+        "security.verify_password": verify,
+    }
+
+
+def all_cases(max_rows: int) -> Dict[str, Setup]:
+    """
+    Build all cases.
+
+    Args:
+        max_rows (int): Largest data size of the data processing cases
+
+    Returns:
+        Dict[str, Setup]: Case name and setup, in run order
+    """
+    return {
+        **mongodb_repository_cases(),
+        **user_repository_cases(),
+        **data_processing_cases(max_rows),
+        **security_cases(),
+    }
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time a function.
+
+    Args:
+        function (Callable[[], Any]): Function to time
+        repeat (int): Number of measurements
+
+    Returns:
+        Dict[str, Any]: Best and median seconds per call, their interquartile
+            range, and calls per measurement
+    """
+    timer = timeit.Timer(function)
+    loops, _ = timer.autorange()
+    seconds = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+    return summarize(seconds, loops)
+
+
+def summarize(seconds: List[float], loops: int) -> Dict[str, Any]:
+    """
+    Summarize the measurements of a case.
+
+    Args:
+        seconds (List[float]): Seconds per call of each measurement
+        loops (int): Calls per measurement
+
+    Returns:
+        Dict[str, Any]: Best and median seconds per call, their interquartile
+            range, calls per measurement and the measurements
+    """
+    if len(seconds) > 1:
+        lower, _, upper = statistics.quantiles(seconds, n=4)
+    else:
+        lower = upper = seconds[0]
+    return {
+        "best_s": min(seconds),
+        "median_s": statistics.median(seconds),
+        "iqr_s": upper - lower,
+        "loops": loops,
+        "seconds": seconds,
+    }
+
+
+def machine_info() -> Dict[str, Any]:
+    """
+    Describe the machine and the library versions.
+
+    Returns:
+        Dict[str, Any]: Platform, CPU count, Python and package versions
+    """
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = version(name)
+        except PackageNotFoundError:
+            packages[name] = None
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "packages": packages,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """
+    Get the commit of the working tree.
+
+    Returns:
+        Optional[str]: Abbreviated commit hash, None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_seconds(seconds: float) -> str:
+    """
+    Format a duration with a readable unit.
+
+    Args:
+        seconds (float): Duration
+
+    Returns:
+        str: Duration in ns, µs, ms or s
+    """
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def run(cases: Dict[str, Setup], repeat: int) -> Dict[str, Any]:
+    """
+    Run cases.
+
+    Args:
+        cases (Dict[str, Setup]): Case name and setup
+        repeat (int): Measurements per case
+
+    Returns:
+        Dict[str, Any]: Results with machine information
+    """
+    results = {}
+    print(f"{'Case':<56} {'Best':>12} {'Median':>12} {'IQR':>12} {'Loops':>7}")
+    for name, setup in cases.items():
+        result = measure(setup(), repeat)
+        results[name] = result
+        print(f"{name:<56} {format_seconds(result['best_s']):>12} "
+              f"{format_seconds(result['median_s']):>12} "
+              f"{format_seconds(result['iqr_s']):>12} {result['loops']:>7}")
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "machine": machine_info(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def serve(max_rows: int, app_root: Optional[Path] = None) -> None:
+    """
+    Time cases on request, as a worker of ``run_interleaved``.
+
+    Reads one JSON request ``{"case": name, "loops": loops}`` per line from
+    stdin and answers on stdout with ``{"seconds": ...}``, the time per call
+    of one measurement of ``loops`` calls, or with ``{"loops": ...}``, the
+    calls per measurement chosen by ``timeit``, if ``loops`` is 0. Only the
+    requested case is kept set up. Output of the timed code goes to stderr.
+
+    Args:
+        max_rows (int): Largest data size of the data processing cases
+        app_root (Optional[Path]): Directory to import ``app`` from instead
+            of the working tree
+    """
+    if app_root is not None:
+        sys.path.insert(0, str(app_root))
+    answers = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    cases = all_cases(max_rows)
+    name, timer = None, None
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            if request["case"] != name:
+                # Release the previous case before setting up the next one
+                name, timer = None, None
+                timer = timeit.Timer(cases[request["case"]]())
+                name = request["case"]
+            if request["loops"]:
+                answer = {"seconds": timer.timeit(request["loops"]) / request["loops"]}
+            else:
+                answer = {"loops": timer.autorange()[0]}
+        except Exception as e:
+            answer = {"error": f"{type(e).__name__}: {e}"}
+        answers.write(json.dumps(answer) + "\n")
+        answers.flush()
+
+
+class Worker:
+    """
+    Worker process timing cases on request, see ``serve``.
+    """
+    def __init__(self, max_rows: int, app_root: Optional[Path] = None):
+        """
+        Start the worker.
+
+        Args:
+            max_rows (int): Largest data size of the data processing cases
+            app_root (Optional[Path]): Directory to import ``app`` from
+        """
+        command = [sys.executable, "-m", "benchmarks.micro", "serve", "--max-rows", str(max_rows)]
+        if app_root is not None:
+            command += ["--app-root", str(app_root)]
+        self.process = subprocess.Popen(
+            command, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+
+    def time(self, case: str, loops: int) -> Dict[str, Any]:
+        """
+        Time a case, see ``serve``.
+
+        Args:
+            case (str): Case name
+            loops (int): Calls per measurement, 0 to choose them
+
+        Returns:
+            Dict[str, Any]: Answer of the worker
+        """
+        self.process.stdin.write(json.dumps({"case": case, "loops": loops}) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Benchmark worker exited with status {self.process.wait()}")
+        return json.loads(line)
+
+    def close(self) -> None:
+        """
+        Stop the worker.
+        """
+        self.process.stdin.close()
+        self.process.wait()
+
+
+@contextmanager
+def checkout(ref: str) -> Iterator[Path]:
+    """
+    Check out a git ref into a temporary worktree.
+
+    Args:
+        ref (str): Commit, branch or tag
+
+    Yields:
+        Path: Worktree directory, removed on exit
+    """
+    with tempfile.TemporaryDirectory(prefix="micro-") as directory:
+        tree = Path(directory) / "tree"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", "--quiet", str(tree), ref],
+            cwd=ROOT, check=True,
+        )
+        try:
+            yield tree
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(tree)], cwd=ROOT)
+
+
+def run_interleaved(
+    names: List[str], ref: str, repeat: int, max_rows: int, threshold: float
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Time cases in the working tree and in a git ref in alternation.
+
+    Both trees get the same calls per measurement, chosen in the working
+    tree, and each round measures both, starting with a different one each
+    round. A case regressed if the ratio of its times in the working tree
+    and in ``ref`` exceeds ``1 + threshold`` in three of four rounds, i.e.
+    in the lower quartile of the ratios.
+
+    Args:
+        names (List[str]): Case names
+        ref (str): Git ref of the baseline
+        repeat (int): Rounds per case
+        max_rows (int): Largest data size of the data processing cases
+        threshold (float): Relative slowdown above which a case regressed
+
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: Results with the baseline results,
+            and names of regressed cases
+    """
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", ref], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.strip()
+    results: Dict[str, Any] = {}
+    baseline: Dict[str, Any] = {}
+    regressions = []
+    print(f"{'Case':<56} {ref[:12]:>12} {'Current':>12} {'Change':>8}")
+    with checkout(ref) as tree:
+        workers = {"baseline": Worker(max_rows, tree), "current": Worker(max_rows)}
+        try:
+            for name in names:
+                answers = {side: worker.time(name, 0) for side, worker in workers.items()}
+                errors = [answer["error"] for answer in answers.values() if "error" in answer]
+                if errors:
+                    print(f"{name:<56} skipped: {errors[0]}")
+                    continue
+                loops = answers["current"]["loops"]
+                seconds: Dict[str, List[float]] = {side: [] for side in workers}
+                for round_number in range(repeat):
+                    order = list(workers) if round_number % 2 else list(workers)[::-1]
+                    for side in order:
+                        seconds[side].append(workers[side].time(name, loops)["seconds"])
+                baseline[name] = summarize(seconds["baseline"], loops)
+                results[name] = summarize(seconds["current"], loops)
+
+                ratios = [
+                    after / before for before, after in zip(seconds["baseline"], seconds["current"])
+                ]
+                lower, median, upper = statistics.quantiles(ratios, n=4)
+                flag = ""
+                if lower > 1 + threshold:
+                    regressions.append(name)
+                    flag = "  REGRESSION"
+                elif upper < 1 - threshold:
+                    flag = "  improved"
+                print(f"{name:<56} {format_seconds(baseline[name]['median_s']):>12} "
+                      f"{format_seconds(results[name]['median_s']):>12} "
+                      f"{median - 1:>+8.1%}{flag}")
+        finally:
+            for worker in workers.values():
+                worker.close()
+    print(f"{len(regressions)} of the compared cases regressed by more than {threshold:.0%} "
+          f"in three of four rounds")
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "machine": machine_info(),
+        "repeat": repeat,
+        "results": results,
+        "baseline": {"ref": ref, "commit": commit, "results": baseline},
+    }, regressions
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    metric: str = "median_s",
+) -> List[str]:
+    """
+    Compare results with a baseline and print the changes.
+
+    Only cases present in both are compared. A case is marked if it got
+    slower than ``threshold`` and by more than ``NOISE_IQRS`` times the
+    larger interquartile range of its measurements in the two files.
+
+    Args:
+        baseline (Dict[str, Any]): Baseline results
+        current (Dict[str, Any]): Current results
+        threshold (float): Relative slowdown above which a case regressed
+        metric (str): Compared time, ``median_s`` or ``best_s``
+
+    Returns:
+        List[str]: Names of cases marked as slower
+
+    Raises:
+        ValueError: If either file has fewer than ``MIN_REPEAT`` measurements
+            per case or no measured spread
+    """
+    for results in (baseline, current):
+        if results.get("repeat", 0) < MIN_REPEAT:
+            raise ValueError(
+                f"comparisons need at least {MIN_REPEAT} measurements per case, "
+                f"got --repeat {results.get('repeat')}"
+            )
+        if any("iqr_s" not in result for result in results["results"].values()):
+            raise ValueError("results without a measured spread; record them again")
+    if baseline.get("machine") != current.get("machine"):
+        print("warning: results come from different machines or library versions",
+              file=sys.stderr)
+
+    regressions = []
+    print(f"{'Case':<56} {'Baseline':>12} {'Current':>12} {'Change':>8}")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name][metric]
+        after = result[metric]
+        change = after / before - 1
+        noise = NOISE_IQRS * max(baseline["results"][name]["iqr_s"], result["iqr_s"])
+        flag = ""
+        if change > threshold and after - before > noise:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif change < -threshold and before - after > noise:
+            flag = "  improved"
+        print(f"{name:<56} {format_seconds(before):>12} {format_seconds(after):>12} "
+              f"{change:>+8.1%}{flag}")
+    print(f"{len(regressions)} of the compared cases got slower by more than {threshold:.0%} "
+          f"and {NOISE_IQRS} IQRs")
+    print("note: separate runs drift; use run --baseline-ref to check for regressions",
+          file=sys.stderr)
+    return regressions
+
+
+def main() -> int:
+    """
+    Run the harness.
+
+    Returns:
+        int: Exit code, 1 if a case regressed against ``--baseline-ref``
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run cases")
+    run_parser.add_argument("--cases", nargs="+", help="Only cases containing one of these")
+    run_parser.add_argument("--max-rows", type=int, default=1_000_000,
+                            help="Largest data size of the data processing cases")
+    run_parser.add_argument("--repeat", type=int, default=MIN_REPEAT,
+                            help="Measurements per case")
+    run_parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    run_parser.add_argument("--compare", type=Path, metavar="BASELINE",
+                            help="Compare the results with this baseline file")
+    run_parser.add_argument("--baseline-ref", metavar="REF",
+                            help="Check for regressions against this git ref, timed in "
+                                 "alternation with the working tree")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare results with a baseline")
+    compare_parser.add_argument("baseline", type=Path, help="Baseline results file")
+    compare_parser.add_argument("current", type=Path, help="Current results file")
+
+    serve_parser = subparsers.add_parser("serve", help="Time cases on request from stdin")
+    serve_parser.add_argument("--max-rows", type=int, default=1_000_000,
+                              help="Largest data size of the data processing cases")
+    serve_parser.add_argument("--app-root", type=Path,
+                              help="Directory to import the application from")
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                               help="Relative slowdown flagged as a regression")
+        subparser.add_argument("--metric", choices=("median_s", "best_s"), default="median_s",
+                               help="Compared time per call of stored results")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.max_rows, args.app_root)
+        return 0
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        try:
+            compare(baseline, current, args.threshold, args.metric)
+        except ValueError as e:
+            parser.error(str(e))
+        return 0
+    if (args.compare or args.baseline_ref) and args.repeat < MIN_REPEAT:
+        parser.error(f"comparisons need --repeat {MIN_REPEAT} or more")
+
+    cases = all_cases(args.max_rows)
+    if args.cases:
+        cases = {
+            name: setup for name, setup in cases.items()
+            if any(pattern in name for pattern in args.cases)
+        }
+    if args.baseline_ref:
+        results, regressions = run_interleaved(
+            list(cases), args.baseline_ref, args.repeat, args.max_rows, args.threshold
+        )
+    else:
+        results, regressions = run(cases, args.repeat), []
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        try:
+            compare(baseline, results, args.threshold, args.metric)
+        except ValueError as e:
+            parser.error(str(e))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
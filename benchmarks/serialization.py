@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""
+Response serialization benchmark script.
+
+Serializes pages of log entries and users, as returned by ``GET /logs/``
+and ``GET /users/``, and pages of data analysis rows, and reports the time
+per 1,000 records for each strategy. Validation of the response model,
+which precedes serialization, is reported separately.
+
+- ``jsonable_encoder`` + stdlib ``json``: FastAPI's generic path for
+  content that has no response model, rendered by ``JSONResponse``
+- stdlib ``json``: the validated model dumped to Python objects, then
+  rendered by ``JSONResponse``
+- orjson: the same Python objects rendered by ``ORJSONResponse``
+- pydantic bytes: the validated model serialized straight to JSON bytes,
+  which FastAPI does for response models under ``ORJSONRoute``
+
+Usage:
+    python -m benchmarks.serialization --records 1000 --output serialization.json
+"""
+import argparse
+import datetime
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.core.responses import ORJSONResponse
+from app.models.document import LogEntry
+from app.models.user import User, UserRead
+
+_json_response = JSONResponse(None)
+_orjson_response = ORJSONResponse(None)
+
+
+def generate_logs(records: int) -> List[LogEntry]:
+    """
+    Generate log entries as the log repository returns them.
+
+    Args:
+        records (int): Number of log entries
+
+    Returns:
+        List[LogEntry]: Log entries
+    """
+    start = datetime.datetime(2024, 1, 1)
+    return [
+        LogEntry(
+            _id=str(ObjectId()),
+            created_at=start + datetime.timedelta(seconds=i),
+            updated_at=start + datetime.timedelta(seconds=i),
+            level=("INFO", "WARNING", "ERROR")[i % 3],
+            message=f"Request {i} completed",
+            service="api",
+            metadata={"request_id": i, "duration_ms": i % 250 + 0.5, "path": "/api/v1/users/"},
+            tags=["http", "api"],
+        )
+        for i in range(records)
+    ]
+
+
+def generate_users(records: int) -> List[User]:
+    """
+    Generate users as the user repository returns them.
+
+    Args:
+        records (int): Number of users
+
+    Returns:
+        List[User]: Users
+    """
+    return [
+        User(
+            id=i,
+            email=f"user{i}@example.com",
+            full_name=f"User {i}",
+            hashed_password="$2b$12$" + "x" * 53,
+        )
+        for i in range(records)
+    ]
+
+
+def generate_rows(records: int) -> List[Dict[str, Any]]:
+    """
+    Generate data analysis result rows.
+
+    Args:
+        records (int): Number of rows
+
+    Returns:
+        List[Dict[str, Any]]: Rows as returned by the filter and group-by routes
+    """
+    return [
+        {
+            "id": i,
+            "entity": ("US01", "US02", "DE01", "JP01")[i % 4],
+            "account": 1000 + i % 9000,
+            "amount": round(1000 + i * 0.37, 2),
+            "posted_at": f"2024-01-01T00:00:{i % 60:02d}",
+        }
+        for i in range(records)
+    ]
+
+
+def model_strategies(adapter: TypeAdapter, items: list) -> Dict[str, Callable[[], Any]]:
+    """
+    Build serialization strategies for a response model.
+
+    Response validation is measured on its own, since it runs before
+    every strategy; the strategies serialize the validated value.
+
+    Args:
+        adapter (TypeAdapter): Response model adapter
+        items (list): Items returned by the route
+
+    Returns:
+        Dict[str, Callable[[], Any]]: Strategy name and function
+    """
+    value = adapter.validate_python(items)
+    return {
+        "validation": lambda: adapter.validate_python(items),
+        "jsonable_encoder + json": lambda: _json_response.render(jsonable_encoder(value)),
+        "json": lambda: _json_response.render(
+            adapter.dump_python(value, mode="json", by_alias=True)
+        ),
+        "orjson": lambda: _orjson_response.render(
+            adapter.dump_python(value, mode="json", by_alias=True)
+        ),
+        "pydantic bytes": lambda: adapter.dump_json(value, by_alias=True),
+    }
+
+
+def dict_strategies(rows: List[Dict[str, Any]]) -> Dict[str, Callable[[], Any]]:
+    """
+    Build serialization strategies for content without a response model.
+
+    Args:
+        rows (List[Dict[str, Any]]): Rows returned by the route
+
+    Returns:
+        Dict[str, Callable[[], Any]]: Strategy name and function
+    """
+    content = {"row_count": len(rows), "rows": rows}
+    return {
+        "jsonable_encoder + json": lambda: _json_response.render(jsonable_encoder(content)),
+        "jsonable_encoder + orjson": lambda: _orjson_response.render(jsonable_encoder(content)),
+        "orjson": lambda: _orjson_response.render(content),
+    }
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    """
+    Measure the best time of several calls.
+
+    Args:
+        function (Callable[[], Any]): Function to measure
+        repeat (int): Number of calls
+
+    Returns:
+        float: Best time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """
+    Run the benchmark and print a summary.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=1000, help="Records per page")
+    parser.add_argument("--repeat", type=int, default=50, help="Calls per strategy")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    payloads = {
+        "logs": model_strategies(TypeAdapter(List[LogEntry]), generate_logs(args.records)),
+        "users": model_strategies(TypeAdapter(List[UserRead]), generate_users(args.records)),
+        "rows": dict_strategies(generate_rows(args.records)),
+    }
+    results = []
+    for payload, strategies in payloads.items():
+        for strategy, function in strategies.items():
+            seconds = measure(function, args.repeat)
+            results.append({
+                "payload": payload,
+                "strategy": strategy,
+                "ms_per_1000": seconds * 1000 * 1000 / args.records,
+            })
+
+    print(f"{'Payload':<8} {'Strategy':<28} {'ms / 1,000 records':>18}")
+    for result in results:
+        print(f"{result['payload']:<8} {result['strategy']:<28} "
+              f"{result['ms_per_1000']:>18.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"records": args.records, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Startup benchmark script.
+
+Imports the application module in fresh processes, as each server worker
+does, and reports the import wall time, the resident memory after import
+and which heavy packages were loaded. A separate run with
+``python -X importtime`` lists the packages with the largest cumulative
+import time.
+
+Usage:
+    python -m benchmarks.startup --repeat 5 --output startup.json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Packages whose presence after startup is reported
+HEAVY_PACKAGES = ("pandas", "numpy", "pyarrow", "passlib", "bcrypt", "jose")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+rss = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss = int(line.split()[1]) * 1024
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_bytes": rss,
+    "loaded": [name for name in {packages!r} if name in sys.modules],
+}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$")
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Dict[str, Any]: Import seconds, RSS after import and loaded heavy packages
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, packages=HEAVY_PACKAGES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def top_imports(module: str, top: int) -> List[Dict[str, Any]]:
+    """
+    Get the packages with the largest cumulative import time.
+
+    Args:
+        module (str): Module to import
+        top (int): Number of imports to report
+
+    Returns:
+        List[Dict[str, Any]]: Package name and cumulative milliseconds, slowest first
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # A package's own line includes its submodules; private modules are internals
+        if match and "." not in match.group(3) and not match.group(3).startswith("_"):
+            imports.append({
+                "package": match.group(3),
+                "cumulative_ms": int(match.group(2)) / 1000,
+            })
+    imports.sort(key=lambda entry: -entry["cumulative_ms"])
+    return imports[:top]
+
+
+def main() -> None:
+    """
+    Run the benchmark and print a summary.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes to measure")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    results = {
+        "module": args.module,
+        "python": sys.version.split()[0],
+        # Best of several runs filters out noise from other processes
+        "import_seconds": min(run["seconds"] for run in runs),
+        "rss_bytes": min(run["rss_bytes"] for run in runs),
+        "loaded_packages": runs[0]["loaded"],
+        "top_imports": top_imports(args.module, args.top),
+    }
+
+    print(f"import {results['module']}: {results['import_seconds']:.3f} s, "
+          f"RSS {results['rss_bytes'] / 1024 ** 2:.1f} MB")
+    print(f"heavy packages loaded: {', '.join(results['loaded_packages']) or 'none'}")
+    print(f"{'Package':<40} {'Cumulative':>12}")
+    for entry in results["top_imports"]:
+        print(f"{entry['package']:<40} {entry['cumulative_ms']:>9.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
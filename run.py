@@ -1,27 +1,24 @@
 #!/usr/bin/env python
 """
 Cross-platform launcher script for the FastAPI application.
+
+By default the application runs in one process that reloads on code
+changes. With ``--prod`` it runs several worker processes sized to the
+available CPUs, see ``app.core.server``.
 """
-import os
-import platform
+import argparse
 import subprocess
 import sys
-from pathlib import Path
 
 
 def run_app():
-    """Run the FastAPI application."""
+    """Run the FastAPI application with auto-reload for development."""
     # Get the Python interpreter path
     python_exe = sys.executable
-    
-    # Determine the command to run
-    if platform.system() == "Windows":
-        cmd = [python_exe, "-m", "uvicorn", "app.main:app", "--reload"]
-    else:
-        cmd = [python_exe, "-m", "uvicorn", "app.main:app", "--reload"]
-    
+    cmd = [python_exe, "-m", "uvicorn", "app.main:app", "--reload"]
+
     print(f"Starting FastAPI application with: {' '.join(cmd)}")
-    
+
     # Run the command
     try:
         subprocess.run(cmd, check=True)
@@ -32,5 +29,47 @@ def run_app():
         print("\nApplication stopped by user")
 
 
+def run_production(workers=None):
+    """
+    Run the FastAPI application with multiple worker processes.
+
+    On SIGTERM the workers stop accepting connections and finish in-flight
+    requests for up to ``SERVER_GRACEFUL_SHUTDOWN_SECONDS`` before exiting.
+
+    Args:
+        workers (Optional[int]): Worker processes, defaults to the available CPUs
+    """
+    import uvicorn
+
+    from app.core.config import settings
+    from app.core.server import configure_metrics_dir, production_options
+
+    # Workers inherit the metrics directory and aggregate their metrics there
+    configure_metrics_dir(settings)
+    options = production_options(settings, workers)
+    print(
+        f"Starting FastAPI application with {options['workers']} workers "
+        f"on {options['host']}:{options['port']}"
+    )
+    uvicorn.run("app.main:app", **options)
+
+
+def main():
+    """Parse command line arguments and run the application."""
+    parser = argparse.ArgumentParser(description="Run the FastAPI application.")
+    parser.add_argument(
+        "--prod", action="store_true", help="Run multiple workers without auto-reload"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes in production mode"
+    )
+    args = parser.parse_args()
+
+    if args.prod:
+        run_production(args.workers)
+    else:
+        run_app()
+
+
 if __name__ == "__main__":
-    run_app()
\ No newline at end of file
+    main()
@@ -0,0 +1,10 @@
+"""
+Shared test configuration.
+
+Test runs have no database servers, so database timeouts are kept short to
+bound the application startup in tests that run the lifespan handler.
+"""
+import os
+
+os.environ.setdefault("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "200")
+os.environ.setdefault("DB_STARTUP_TIMEOUT_SECONDS", "1")
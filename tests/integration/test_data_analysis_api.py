@@ -0,0 +1,328 @@
+"""
+Data analysis API integration test module.
+"""
+import gzip
+import io
+import time
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.api.routes.data_analysis import (
+    get_analysis_job_manager,
+    get_data_analysis_service,
+)
+from app.db.postgres import get_async_session
+from app.main import app
+
+
+async def get_test_session():
+    """
+    Get placeholder database session.
+
+    Yields:
+        None: The data analysis routes do not use the session
+    """
+    yield None
+
+
+app.dependency_overrides[get_async_session] = get_test_session
+client = TestClient(app)
+
+CSV_CONTENT = b"id,amount,account\n1,10.5,A\n2,,B\n1,10.5,A\n3,7.25,A\n"
+
+
+def test_upload_csv():
+    """
+    Test upload CSV drops duplicates and fills missing values.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/upload-csv/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+    )
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["row_count"] == 3
+    assert data["columns"] == ["id", "amount", "account"]
+    assert data["sample_data"][1]["amount"] == 0
+
+
+def test_query_cached_dataset():
+    """
+    Test filtering, grouping and deleting a dataset kept by upload CSV.
+    """
+    dataset_id = client.post(
+        "/api/v1/data-analysis/upload-csv/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+    ).json()["dataset_id"]
+    url = f"/api/v1/data-analysis/datasets/{dataset_id}"
+
+    described = client.get(url)
+    filtered = client.post(f"{url}/filter", data={"expression": "amount > 5"})
+    grouped = client.post(
+        f"{url}/group-by", json={"keys": ["account"], "aggregations": {"amount": "sum"}}
+    )
+    deleted = client.delete(url)
+
+    assert described.json()["row_count"] == 3
+    assert filtered.json()["match_count"] == 2
+    assert grouped.json()["group_count"] == 2
+    assert deleted.status_code == 204
+    assert client.get(url).status_code == 404
+
+
+def test_query_cached_dataset_errors(monkeypatch):
+    """
+    Test dataset queries report invalid specs as 400 and failures as 500.
+    """
+    dataset_id = client.post(
+        "/api/v1/data-analysis/upload-csv/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+    ).json()["dataset_id"]
+    url = f"/api/v1/data-analysis/datasets/{dataset_id}"
+
+    invalid = client.post(
+        f"{url}/group-by", json={"keys": ["id"], "aggregations": {"account": "mean"}}
+    )
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(get_data_analysis_service(), "aggregate", fail)
+    failed = client.post(
+        f"{url}/group-by", json={"keys": ["account"], "aggregations": {"amount": "sum"}}
+    )
+
+    assert invalid.status_code == 400
+    assert failed.status_code == 500
+    assert failed.json()["detail"] == "Error processing dataset: boom"
+    client.delete(url)
+
+
+def test_upload_csv_rejects_unsupported_formats():
+    """
+    Test upload CSV rejects binary files that are not Parquet or Arrow.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/upload-csv/",
+        files={"file": ("ledger.csv", b"PK\x03\x04\x14\x00\x00\x00\xff\xfe", "text/csv")},
+    )
+
+    assert response.status_code == 400
+
+
+def test_upload_parquet_detected_by_content():
+    """
+    Test upload CSV reads Parquet files regardless of their name.
+    """
+    buffer = io.BytesIO()
+    pd.read_csv(io.BytesIO(CSV_CONTENT)).to_parquet(buffer)
+
+    response = client.post(
+        "/api/v1/data-analysis/upload-csv/",
+        files={"file": ("ledger.bin", buffer.getvalue(), "application/octet-stream")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["row_count"] == 3
+
+
+def test_upload_csv_optimize():
+    """
+    Test upload CSV with dtype optimization reports memory usage.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/upload-csv/?optimize=true",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+    )
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["data_types"]["id"] == "uint8"
+    assert data["memory_usage"]["after_bytes"] < data["memory_usage"]["before_bytes"]
+
+
+def test_upload_csv_sample_mode():
+    """
+    Test upload CSV in sample mode reports sampling details.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/upload-csv/?mode=sample&sample_size=2&seed=1",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["sampling"]["estimated_row_count"] == 4
+    assert data["sampling"]["sample_rows"] == 2
+    assert data["sampling"]["sampling_fraction"] == 0.5
+    assert "amount" in data["confidence_intervals"]
+
+
+def test_upload_csv_job_mode(tmp_path, monkeypatch):
+    """
+    Test upload CSV in job mode returns a job that can be polled.
+    """
+    monkeypatch.setattr(get_analysis_job_manager(), "_jobs_dir", tmp_path)
+
+    with TestClient(app) as job_client:
+        response = job_client.post(
+            "/api/v1/data-analysis/upload-csv/?mode=job",
+            files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+        )
+
+        assert response.status_code == 202
+
+        job_id = response.json()["job_id"]
+        for _ in range(100):
+            job = job_client.get(f"/api/v1/data-analysis/jobs/{job_id}").json()
+            if job["status"] == "completed":
+                break
+            time.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert job["rows_processed"] == 4
+    assert job["result"]["row_count"] == 3
+
+
+def test_export_job(tmp_path, monkeypatch):
+    """
+    Test exporting a completed job as gzip CSV and Parquet.
+    """
+    monkeypatch.setattr(get_analysis_job_manager(), "_jobs_dir", tmp_path)
+
+    with TestClient(app) as job_client:
+        job_id = job_client.post(
+            "/api/v1/data-analysis/upload-csv/?mode=job",
+            files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+        ).json()["job_id"]
+        for _ in range(100):
+            job = job_client.get(f"/api/v1/data-analysis/jobs/{job_id}").json()
+            if job["status"] == "completed":
+                break
+            time.sleep(0.05)
+
+        csv_response = job_client.get(f"/api/v1/data-analysis/jobs/{job_id}/export")
+        parquet_response = job_client.get(
+            f"/api/v1/data-analysis/jobs/{job_id}/export?format=parquet&compression=gzip"
+        )
+
+    assert csv_response.status_code == 200
+    assert "ledger-processed.csv.gz" in csv_response.headers["content-disposition"]
+    exported = pd.read_csv(io.BytesIO(gzip.decompress(csv_response.content)))
+    assert list(exported["id"]) == [1, 2, 3]
+
+    assert parquet_response.status_code == 200
+    assert len(pd.read_parquet(io.BytesIO(parquet_response.content))) == 3
+
+
+def test_upload_csv_batch_concatenates_files(tmp_path, monkeypatch):
+    """
+    Test processing several files at once and exporting their concatenation.
+    """
+    monkeypatch.setattr(get_analysis_job_manager(), "_jobs_dir", tmp_path)
+    other = b"id,amount,entity\n4,1.5,X\n5,2.5,Y\n"
+
+    response = client.post(
+        "/api/v1/data-analysis/upload-csv/batch/?concatenate=true",
+        files=[
+            ("files", ("a.csv", CSV_CONTENT, "text/csv")),
+            ("files", ("b.csv", other, "text/csv")),
+        ],
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert [f["result"]["row_count"] for f in result["files"]] == [3, 2]
+    combined = result["combined"]
+    assert combined["row_count"] == 5
+    assert combined["columns"] == ["id", "amount", "account", "entity"]
+    assert combined["missing_columns"] == {"a.csv": ["entity"], "b.csv": ["account"]}
+    assert combined["summary_stats"]["id"]["max"] == 5
+
+    export = client.get(result["dataset_export_url"] + "?compression=none")
+    exported = pd.read_csv(io.BytesIO(export.content))
+    assert list(exported["id"]) == [1, 2, 3, 4, 5]
+    assert list(exported.columns) == combined["columns"]
+
+
+def test_export_unknown_job():
+    """
+    Test exporting an unknown job returns 404.
+    """
+    response = client.get(f"/api/v1/data-analysis/jobs/{'0' * 32}/export")
+
+    assert response.status_code == 404
+
+
+def test_read_unknown_job():
+    """
+    Test reading an unknown job returns 404.
+    """
+    response = client.get(f"/api/v1/data-analysis/jobs/{'0' * 32}")
+
+    assert response.status_code == 404
+
+
+def test_filter_csv():
+    """
+    Test filter CSV returns matching rows.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/filter/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+        data={"expression": "account = 'A' and amount > 8"},
+    )
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["row_count"] == 3
+    assert data["match_count"] == 1
+    assert data["rows"] == [{"id": 1, "amount": 10.5, "account": "A"}]
+
+
+def test_filter_csv_invalid_expression():
+    """
+    Test filter CSV rejects invalid expressions.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/filter/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+        data={"expression": "account ="},
+    )
+
+    assert response.status_code == 400
+
+
+def test_group_csv():
+    """
+    Test group-by CSV returns one row per group.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/group-by/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+        data={"spec": '{"keys": ["account"], "aggregations": {"amount": ["sum", "p50"]}}'},
+    )
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["group_count"] == 2
+    assert data["rows"][0] == {"account": "A", "amount_sum": 17.75, "amount_p50": 8.875}
+
+
+def test_group_csv_invalid_spec():
+    """
+    Test group-by CSV rejects invalid specs.
+    """
+    response = client.post(
+        "/api/v1/data-analysis/group-by/",
+        files={"file": ("ledger.csv", CSV_CONTENT, "text/csv")},
+        data={"spec": '{"keys": ["account"], "aggregations": {"amount": "mode"}}'},
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+"""
+Health check API integration test module.
+"""
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+def test_liveness():
+    """
+    Test the liveness probe answers without startup.
+    """
+    response = TestClient(app).get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_before_startup():
+    """
+    Test the readiness probe fails until startup has completed.
+    """
+    response = TestClient(app).get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+def test_readiness_after_startup(monkeypatch):
+    """
+    Test the readiness probe once started, with and without required databases.
+    """
+    with TestClient(app) as started_client:
+        monkeypatch.setattr(settings, "READINESS_DATABASES", [])
+        ready = started_client.get("/health/ready")
+        monkeypatch.setattr(settings, "READINESS_DATABASES", ["mongodb"])
+        unavailable = started_client.get("/health/ready")
+
+    assert ready.status_code == 200
+    assert ready.json() == {"status": "ready", "databases": {}}
+    assert unavailable.status_code == 503
+    assert unavailable.json()["databases"]["mongodb"]
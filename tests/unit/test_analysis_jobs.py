@@ -0,0 +1,106 @@
+import asyncio
+import io
+import os
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models.job import AnalysisJob, JobStatus
+from app.services.analysis_jobs import AnalysisJobManager, JobQueueFullError
+from app.services.data_analysis import DataAnalysisService
+
+CSV_CONTENT = b"id,amount\n1,10.5\n2,\n1,10.5\n3,7.25\n"
+
+
+@pytest.fixture
+def service():
+    return DataAnalysisService(chunk_size=2, max_memory_hashes=100)
+
+
+async def _wait_for(manager, job_id):
+    for _ in range(200):
+        job = manager.get(job_id)
+        if job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_job_and_persists_result(service, tmp_path):
+    manager = AnalysisJobManager(service, workers=1, queue_size=4, jobs_dir=tmp_path)
+    job = await manager.submit(io.BytesIO(CSV_CONTENT), filename="ledger.csv", options={})
+    try:
+        finished = await _wait_for(manager, job.id)
+    finally:
+        await manager.stop()
+
+    assert finished.status == JobStatus.COMPLETED
+    assert finished.rows_processed == 4
+    assert finished.result["row_count"] == 3
+    assert (tmp_path / job.id / "job.json").exists()
+    assert not (tmp_path / job.id / "upload").exists()
+
+    reloaded = AnalysisJobManager(service, workers=1, queue_size=4, jobs_dir=tmp_path)
+    assert reloaded.get(job.id).result == finished.result
+
+
+@pytest.mark.asyncio
+async def test_failed_job_reports_error(service, tmp_path):
+    manager = AnalysisJobManager(service, workers=1, queue_size=4, jobs_dir=tmp_path)
+    job = await manager.submit(io.BytesIO(b""), filename="empty.csv", options={})
+    try:
+        finished = await _wait_for(manager, job.id)
+    finally:
+        await manager.stop()
+
+    assert finished.status == JobStatus.FAILED
+    assert finished.error.startswith("Error processing file")
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_queue_full(service, tmp_path):
+    manager = AnalysisJobManager(service, workers=0, queue_size=1, jobs_dir=tmp_path)
+    await manager.submit(io.BytesIO(CSV_CONTENT), filename="a.csv", options={})
+    with pytest.raises(JobQueueFullError):
+        await manager.submit(io.BytesIO(CSV_CONTENT), filename="b.csv", options={})
+    await manager.stop()
+
+
+def test_get_unknown_job(service, tmp_path):
+    manager = AnalysisJobManager(service, workers=1, queue_size=1, jobs_dir=tmp_path)
+    assert manager.get("0" * 32) is None
+    assert manager.get("../etc") is None
+
+
+def _write_job(jobs_dir, job, modified):
+    job_dir = jobs_dir / job.id
+    job_dir.mkdir()
+    path = job_dir / "job.json"
+    path.write_text(job.model_dump_json(), encoding="utf-8")
+    os.utime(path, (modified, modified))
+
+
+@pytest.mark.asyncio
+async def test_start_fails_orphaned_and_removes_expired_jobs(service, tmp_path):
+    stale = time.time() - 3600
+    orphan = AnalysisJob(id=uuid.uuid4().hex, status=JobStatus.RUNNING)
+    expired = AnalysisJob(
+        id=uuid.uuid4().hex, status=JobStatus.COMPLETED, finished_at=datetime(2000, 1, 1)
+    )
+    recent = AnalysisJob(id=uuid.uuid4().hex, status=JobStatus.QUEUED)
+    _write_job(tmp_path, orphan, stale)
+    _write_job(tmp_path, expired, stale)
+    _write_job(tmp_path, recent, time.time())
+
+    manager = AnalysisJobManager(
+        service, workers=0, queue_size=1, jobs_dir=tmp_path, ttl=60, heartbeat_interval=10
+    )
+    await manager.start()
+    await manager.stop()
+
+    assert manager.get(orphan.id).status == JobStatus.FAILED
+    assert manager.get(expired.id) is None
+    assert manager.get(recent.id).status == JobStatus.QUEUED
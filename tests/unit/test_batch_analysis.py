@@ -0,0 +1,59 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.analysis_jobs import AnalysisJobManager
+from app.services.batch_analysis import BatchAnalysisService
+from app.services.data_analysis import DataAnalysisService
+from app.utils.export import iter_frame_parts
+
+
+@pytest.fixture
+def files():
+    rng = np.random.default_rng(0)
+    frames = [
+        pd.DataFrame({"id": np.arange(n), "amount": rng.normal(10, 3, n).round(2)})
+        for n in (500, 2_000, 50)
+    ]
+    return frames, [
+        (f"part{i}.csv", io.BytesIO(df.to_csv(index=False).encode()))
+        for i, df in enumerate(frames)
+    ]
+
+
+@pytest.fixture
+def service(tmp_path):
+    data_analysis = DataAnalysisService(1_000, 10_000)
+    job_manager = AnalysisJobManager(data_analysis, workers=1, queue_size=1, jobs_dir=tmp_path)
+    return BatchAnalysisService(data_analysis, job_manager, workers=2)
+
+
+def test_combined_stats_match_concatenated_files(service, files):
+    frames, uploads = files
+    combined = pd.concat(frames, ignore_index=True)
+
+    result = service.analyze_files(uploads)
+
+    assert [f["status"] for f in result["files"]] == ["completed"] * 3
+    assert [f["result"]["row_count"] for f in result["files"]] == [500, 2_000, 50]
+    stats = result["combined"]["summary_stats"]["amount"]
+    assert result["combined"]["row_count"] == len(combined)
+    assert stats["mean"] == pytest.approx(combined["amount"].mean())
+    assert stats["std"] == pytest.approx(combined["amount"].std())
+    assert "dataset_job_id" not in result
+
+
+def test_failed_file_is_reported_and_skipped(service, files):
+    _, uploads = files
+    uploads.append(("broken.csv", io.BytesIO(b'a,b\n1,"unterminated\n')))
+
+    result = service.analyze_files(uploads, concatenate=True)
+
+    assert result["files"][-1]["status"] == "failed"
+    assert result["combined"]["row_count"] == 2_550
+    export_dir = service.job_manager.export_dir(result["dataset_job_id"])
+    exported = pd.concat(iter_frame_parts(export_dir), ignore_index=True)
+    assert len(exported) == 2_550
+    assert list(exported["id"][:3]) == [0, 1, 2]
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from app.utils.dataset_cache import DatasetCache
+from app.utils.dtype_optimization import memory_usage_bytes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def frame(rows):
+    return pd.DataFrame({"value": range(rows)})
+
+
+def test_least_recently_used_dataset_is_evicted_over_budget():
+    evicted = []
+    cache = DatasetCache(memory_usage_bytes(frame(100)) * 2, 60, on_evict=evicted.append)
+    first = cache.put(frame(100))
+    second = cache.put(frame(100))
+
+    cache.get(first)
+    third = cache.put(frame(100))
+
+    assert evicted == [second]
+    assert cache.get(second) is None
+    assert cache.get(first) is not None and cache.get(third) is not None
+    assert cache.total_bytes == memory_usage_bytes(frame(100)) * 2
+
+
+def test_datasets_expire_after_idle_ttl():
+    clock = FakeClock()
+    evicted = []
+    cache = DatasetCache(10 ** 9, 60, on_evict=evicted.append, clock=clock)
+    idle = cache.put(frame(10))
+    used = cache.put(frame(10))
+
+    clock.now = 50
+    cache.get(used)
+    clock.now = 100
+
+    assert cache.get(idle) is None
+    assert cache.get(used) is not None
+    assert evicted == [idle]
+    assert len(cache) == 1
+
+
+def test_oversized_datasets_and_disabled_cache_are_not_kept():
+    assert DatasetCache(10, 60).put(frame(100)) is None
+    assert DatasetCache(0, 60).put(frame(0)) is None
+
+
+def test_remove_notifies_and_reports_unknown_ids():
+    evicted = []
+    cache = DatasetCache(10 ** 9, 60, on_evict=evicted.append)
+    dataset_id = cache.put(frame(10))
+
+    assert cache.remove(dataset_id)
+    assert not cache.remove(dataset_id)
+    assert evicted == [dataset_id]
+    assert cache.total_bytes == 0
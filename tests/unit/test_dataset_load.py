@@ -0,0 +1,144 @@
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.dataset_load import (
+    DatasetLoadError,
+    DatasetLoadService,
+    iter_record_batches,
+    postgres_type,
+)
+
+
+class FakeConnection:
+    def __init__(self, existing_columns=None):
+        self.existing_columns = existing_columns or []
+        self.statements = []
+        self.copies = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetch(self, query, *args):
+        return [{"column_name": column} for column in self.existing_columns]
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        self.copies.append((table_name, list(records), columns))
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "id": np.array([1, 2, 3], dtype="int32"),
+        "amount": [10.5, np.nan, 7.25],
+        "account": ["A", None, "B"],
+    })
+
+
+def test_postgres_type_maps_dtypes():
+    assert postgres_type(np.dtype("int16")) == "SMALLINT"
+    assert postgres_type(np.dtype("uint16")) == "INTEGER"
+    assert postgres_type(np.dtype("int64")) == "BIGINT"
+    assert postgres_type(np.dtype("uint64")) == "NUMERIC"
+    assert postgres_type(np.dtype("float32")) == "REAL"
+    assert postgres_type(np.dtype("float64")) == "DOUBLE PRECISION"
+    assert postgres_type(np.dtype("bool")) == "BOOLEAN"
+    assert postgres_type(np.dtype("datetime64[ns]")) == "TIMESTAMP"
+    assert postgres_type(pd.DatetimeTZDtype(tz="UTC")) == "TIMESTAMPTZ"
+    assert postgres_type(pd.CategoricalDtype(["a"])) == "TEXT"
+
+
+def test_iter_record_batches_converts_missing_values(df):
+    batches = list(iter_record_batches(df, batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[0] == [(1, 10.5, "A"), (2, None, None)]
+    assert all(type(value) is int for value, _, _ in batches[0])
+
+
+@pytest.mark.asyncio
+async def test_load_creates_table_and_copies_in_batches(df):
+    connection = FakeConnection()
+    service = DatasetLoadService(None, batch_size=2)
+
+    result = await service.load_with_connection(connection, df, "ledger")
+
+    assert connection.statements == [
+        'CREATE TABLE "ledger" ("id" INTEGER, "amount" DOUBLE PRECISION, "account" TEXT)'
+    ]
+    assert [len(records) for _, records, _ in connection.copies] == [2, 1]
+    assert connection.copies[0][2] == ["id", "amount", "account"]
+    assert result["rows"] == 3
+    assert result["table"] == "ledger"
+
+
+@pytest.mark.asyncio
+async def test_load_appends_to_existing_table(df):
+    connection = FakeConnection(existing_columns=["id", "amount", "account", "memo"])
+    service = DatasetLoadService(None, batch_size=10)
+
+    await service.load_with_connection(connection, df, "ledger", if_exists="append")
+
+    assert connection.statements == []
+    assert len(connection.copies) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_replaces_existing_table(df):
+    connection = FakeConnection(existing_columns=["other"])
+    service = DatasetLoadService(None, batch_size=10)
+
+    await service.load_with_connection(connection, df, "ledger", if_exists="replace")
+
+    assert connection.statements[0] == 'DROP TABLE "ledger"'
+    assert connection.statements[1].startswith('CREATE TABLE "ledger"')
+
+
+@pytest.mark.asyncio
+async def test_load_rejects_invalid_targets(df):
+    service = DatasetLoadService(None, batch_size=10)
+
+    with pytest.raises(DatasetLoadError):
+        await service.load_with_connection(FakeConnection(), df, "ledger; drop table users")
+    with pytest.raises(DatasetLoadError):
+        await service.load_with_connection(
+            FakeConnection(existing_columns=["id"]), df, "ledger", if_exists="fail"
+        )
+    with pytest.raises(DatasetLoadError):
+        await service.load_with_connection(
+            FakeConnection(existing_columns=["id"]), df, "ledger", if_exists="append"
+        )
+
+
+def test_iter_record_batches_casts_filled_text_to_str():
+    df = pd.DataFrame({"memo": ["paid", None, ""], "code": ["a", np.nan, "b"]}).fillna(
+        {"memo": 0}
+    )
+
+    assert list(iter_record_batches(df, batch_size=10)) == [
+        [("paid", "a"), ("0", None), ("", "b")]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_load_prefixes_tables_and_refuses_application_tables(df):
+    connection = FakeConnection()
+    service = DatasetLoadService(None, batch_size=10, table_prefix="dataset_")
+
+    result = await service.load_with_connection(connection, df, "users", if_exists="replace")
+
+    assert result["table"] == "dataset_users"
+    assert connection.statements[0].startswith('CREATE TABLE "dataset_users"')
+    assert connection.copies[0][0] == "dataset_users"
+
+    unprefixed = DatasetLoadService(None, batch_size=10, reserved_tables={"users"})
+    connection = FakeConnection(existing_columns=["id"])
+    with pytest.raises(DatasetLoadError):
+        await unprefixed.load_with_connection(connection, df, "users", if_exists="replace")
+    assert connection.statements == []
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.data_processing import process_dataframe, process_dataframe_chunks
+from app.utils.deduplication import RowHashSet, drop_duplicates_chunked, hash_rows
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "a": rng.integers(0, 20, 1000),
+        "b": rng.choice(["x", "y", "z"], 1000),
+        "c": rng.choice([1.5, np.nan], 1000),
+    })
+
+
+def _chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_drop_duplicates_chunked_matches_in_memory(df):
+    result = pd.concat(drop_duplicates_chunked(_chunks(df, 97)))
+    pd.testing.assert_frame_equal(result, df.drop_duplicates())
+
+
+def test_drop_duplicates_chunked_spills_to_disk(df, tmp_path):
+    with RowHashSet(max_memory_hashes=10, spill_dir=tmp_path) as seen:
+        kept = [chunk[seen.add_new(hash_rows(chunk))] for chunk in _chunks(df, 50)]
+        assert seen.spilled_runs > 0
+        spill_dir = seen.spill_dir
+        assert spill_dir.exists()
+    assert not spill_dir.exists()
+    pd.testing.assert_frame_equal(pd.concat(kept), df.drop_duplicates())
+
+
+def test_hash_rows_ignores_int_float_inference():
+    ints = pd.DataFrame({"a": [1, 2]})
+    floats = pd.DataFrame({"a": [1.0, np.nan]})
+    assert hash_rows(ints)[0] == hash_rows(floats)[0]
+
+
+def test_row_hash_set_add_new():
+    seen = RowHashSet()
+    assert seen.add_new(np.array([3, 1, 3], dtype=np.uint64)).tolist() == [True, True, False]
+    assert seen.add_new(np.array([1, 2], dtype=np.uint64)).tolist() == [False, True]
+    assert len(seen) == 3
+
+
+def test_process_dataframe_chunks_matches_process_dataframe(df):
+    result = pd.concat(process_dataframe_chunks(_chunks(df, 128)))
+    pd.testing.assert_frame_equal(result, process_dataframe(df))
+
+
+def test_hash_rows_keeps_large_integers_distinct():
+    df = pd.DataFrame({"id": [2**53, 2**53 + 1], "amt": [1, 1]})
+    assert len(process_dataframe(df)) == 2
+    assert hash_rows(df.astype({"amt": "float64"}))[0] == hash_rows(df)[0]
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.dtype_optimization import (
+    concat_optimized,
+    memory_usage_bytes,
+    optimize_dtypes,
+)
+
+
+def test_optimize_dtypes_downcasts_numerics():
+    df = pd.DataFrame({
+        "small": [1, 2, 3],
+        "negative": [-1, 0, 1000],
+        "filled": [1.0, 0.0, 3.0],
+        "fraction": [1.5, 0.0, 3.0],
+    })
+    result = optimize_dtypes(df)
+    assert result["small"].dtype == np.uint8
+    assert result["negative"].dtype == np.int16
+    assert result["filled"].dtype == np.uint8
+    assert result["fraction"].dtype == np.float64
+    assert (result.astype("float64") == df).all().all()
+
+
+def test_optimize_dtypes_keeps_floats_outside_int64_range():
+    df = pd.DataFrame({"big": [1e20, 0.0], "low": [-1e19, 1.0], "edge": [2.0**63, 0.0]})
+    result = optimize_dtypes(df)
+    assert (result.dtypes == np.float64).all()
+    assert result["big"].iloc[0] == 1e20
+
+
+def test_optimize_dtypes_categories_and_dates():
+    df = pd.DataFrame({
+        "account": ["A", "B", "A", "A"],
+        "reference": ["r1", "r2", "r3", "r4"],
+        "posted": ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"],
+    })
+    result = optimize_dtypes(df)
+    assert isinstance(result["account"].dtype, pd.CategoricalDtype)
+    assert not isinstance(result["reference"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(result["posted"])
+    assert memory_usage_bytes(result) < memory_usage_bytes(df)
+
+
+def test_concat_optimized_keeps_categories():
+    first = optimize_dtypes(pd.DataFrame({"account": ["A", "A", "A", "B"]}))
+    second = optimize_dtypes(pd.DataFrame({"account": ["C", "C", "C", "C"]}))
+    result = concat_optimized([first, second])
+    assert isinstance(result["account"].dtype, pd.CategoricalDtype)
+    assert result["account"].tolist() == ["A", "A", "A", "B", "C", "C", "C", "C"]
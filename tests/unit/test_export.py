@@ -0,0 +1,77 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from app.utils.export import (
+    ExportUnavailableError,
+    check_export_format,
+    iter_frame_parts,
+    stream_csv,
+    stream_parquet,
+    write_frame_parts,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "id": range(10),
+        "account": pd.Categorical(["A", "B"] * 5),
+        "memo": [None] * 5 + ["x"] * 5,
+    })
+
+
+def test_write_and_iter_frame_parts(df, tmp_path):
+    parts = write_frame_parts(df, tmp_path / "parts", rows_per_part=4)
+
+    frames = list(iter_frame_parts(tmp_path / "parts"))
+
+    assert parts == 3
+    assert [len(frame) for frame in frames] == [4, 4, 2]
+    pd.testing.assert_frame_equal(pd.concat(frames), df)
+
+
+def test_stream_csv_gzip_writes_one_header(df):
+    data = b"".join(stream_csv([df.iloc[:3], df.iloc[3:]], rows_per_chunk=2))
+
+    exported = pd.read_csv(io.BytesIO(gzip.decompress(data)))
+
+    assert list(exported["id"]) == list(range(10))
+
+
+def test_stream_csv_uncompressed(df):
+    data = b"".join(stream_csv([df], compression="none"))
+
+    assert data.startswith(b"id,account,memo\n0,A,\n")
+
+
+def test_stream_parquet_writes_row_group_per_chunk(df):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    # The first chunk has only missing memos, later chunks must keep its schema
+    data = b"".join(stream_parquet([df.iloc[:5], df.iloc[5:]], rows_per_chunk=4))
+
+    parquet_file = pq.ParquetFile(io.BytesIO(data))
+    assert parquet_file.metadata.num_row_groups == 4
+    assert parquet_file.read().num_rows == 10
+
+
+def test_stream_parquet_writes_mixed_object_columns_as_text():
+    pq = pytest.importorskip("pyarrow.parquet")
+    empty = pd.DataFrame({"memo": pd.Series([None, None], dtype=object)})
+    mixed = pd.DataFrame({"memo": pd.Series(["paid", 0], dtype=object)})
+
+    data = b"".join(stream_parquet([empty, mixed]))
+
+    table = pq.read_table(io.BytesIO(data))
+    assert str(table.schema.field("memo").type) == "string"
+    assert table.column("memo").to_pylist() == [None, None, "paid", "0"]
+
+
+def test_check_export_format_rejects_unknown_values():
+    with pytest.raises(ExportUnavailableError):
+        check_export_format("xlsx", "gzip")
+    with pytest.raises(ExportUnavailableError):
+        check_export_format("csv", "brotli")
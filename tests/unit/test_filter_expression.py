@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.data_processing import filter_dataframe_by_expression
+from app.utils.filter_expression import FilterExpressionError, compile_filter
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "amount": [5.0, 1500.0, np.nan, 2000.0],
+        "account": ["4000", "4100", "5000", None],
+        "posted": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01"]),
+    })
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("amount >= 1000", [False, True, False, True]),
+        ("amount = 5 or amount <> 5", [True, True, False, True]),
+        ("amount between 5 and 1500", [True, True, False, False]),
+        ("amount not between 5 and 1500", [False, False, True, True]),
+        ("account in ('4000', '4100')", [True, True, False, False]),
+        ("account not in ('4000')", [False, True, True, True]),
+        ("account is null", [False, False, False, True]),
+        ("amount is not null", [True, True, False, True]),
+        ("posted >= '2024-02-15'", [False, False, True, True]),
+        ("not (amount > 1000 or account = '5000')", [True, False, False, False]),
+        ("amount > 1000 AND account IS NOT NULL OR `account` = '5000'", [False, True, True, False]),
+    ],
+)
+def test_mask(df, expression, expected):
+    assert compile_filter(expression).mask(df).tolist() == expected
+
+
+def test_columns():
+    compiled = compile_filter("a > 1 and (b in (1, 2) or not `c d` is null)")
+    assert compiled.columns == {"a", "b", "c d"}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["amount >", "(amount > 1", "amount 5", "amount in ()", "amount > 1 and", "amount ~ 1"],
+)
+def test_invalid_syntax(expression):
+    with pytest.raises(FilterExpressionError):
+        compile_filter(expression)
+
+
+def test_invalid_evaluation(df):
+    with pytest.raises(FilterExpressionError):
+        compile_filter("missing = 1").mask(df)
+    with pytest.raises(FilterExpressionError):
+        compile_filter("amount > 'x'").mask(df)
+
+
+def test_filter_dataframe_by_expression(df):
+    result = filter_dataframe_by_expression(df, "amount > 1000 and account is not null")
+    pd.testing.assert_frame_equal(result, df.iloc[[1]])
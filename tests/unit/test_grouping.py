@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.grouping import AggregationSpecError, GroupIndexCache, aggregate_groups
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "entity": ["E1", "E1", "E1", "E2", "E2"],
+        "account": ["A", "A", "B", "A", "A"],
+        "amount": [10.0, 30.0, 5.0, 1.0, 3.0],
+        "qty": [1, 2, 3, 4, 5],
+    })
+
+
+def test_aggregate_groups_multiple_keys_and_functions(df):
+    result = aggregate_groups(
+        df,
+        ["entity", "account"],
+        {"amount": ["sum", "p50"], "qty": "max"},
+        {"lines": ("amount", "count")},
+    )
+    assert list(result.columns) == [
+        "entity", "account", "amount_sum", "amount_p50", "qty_max", "lines",
+    ]
+    assert result.values.tolist() == [
+        ["E1", "A", 40.0, 20.0, 2, 2],
+        ["E1", "B", 5.0, 5.0, 3, 1],
+        ["E2", "A", 4.0, 2.0, 5, 2],
+    ]
+
+
+def test_aggregate_groups_matches_group_and_aggregate(df):
+    from app.utils.data_processing import group_and_aggregate
+
+    expected = group_and_aggregate(df, "entity", "amount", "mean")
+    result = aggregate_groups(df, ["entity"], named_aggregations={"amount": ("amount", "mean")})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_group_index_cache_reuses_group_index(df):
+    cache = GroupIndexCache(max_entries=2)
+    first = cache.get("ds", df, ["entity"])
+    assert cache.get("ds", df, ["entity"]) is first
+    assert cache.get("ds", df.copy(), ["entity"]) is not first
+
+    aggregate_groups(df, ["entity"], {"amount": "sum"}, cache=cache, dataset_key="ds")
+    aggregate_groups(df, ["account"], {"amount": "sum"}, cache=cache, dataset_key="ds")
+    aggregate_groups(df, ["entity", "account"], {"amount": "sum"}, cache=cache, dataset_key="ds")
+    assert len(cache) == 2
+
+    cache.invalidate("ds")
+    assert len(cache) == 0
+
+
+def test_group_index_cache_is_thread_safe(df):
+    cache = GroupIndexCache(max_entries=3)
+    key_sets = [["entity"], ["account"], ["entity", "account"]]
+
+    def use(worker):
+        for i in range(200):
+            cache.get(f"ds{(worker + i) % 4}", df, key_sets[i % 3])
+            if i % 7 == 0:
+                cache.invalidate(f"ds{i % 4}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(use, range(8)))
+
+    assert len(cache) <= 3
+
+
+@pytest.mark.parametrize(
+    "keys, aggregations, named",
+    [
+        ([], {"amount": "sum"}, None),
+        (["entity"], {}, None),
+        (["entity"], {"amount": "mode"}, None),
+        (["entity"], {"amount": "p101"}, None),
+        (["missing"], {"amount": "sum"}, None),
+        (["entity"], {"amount": "sum"}, {"amount_sum": ("qty", "sum")}),
+        (["entity"], {"account": "mean"}, None),
+        (["entity"], {"account": "p95"}, None),
+    ],
+)
+def test_aggregate_groups_invalid_spec(df, keys, aggregations, named):
+    with pytest.raises(AggregationSpecError):
+        aggregate_groups(df, keys, aggregations, named)
+
+
+def test_aggregate_groups_percentiles_on_categories():
+    df = pd.DataFrame({
+        "account": pd.Categorical(["A", "B", "A"], categories=["A", "B", "C"]),
+        "amount": [1.0, 2.0, 3.0],
+    })
+    result = aggregate_groups(df, ["account"], {"amount": ["p100", "size"]})
+    assert result["amount_p100"].tolist() == [3.0, 2.0]
+    assert np.array_equal(result["amount_size"], [2, 1])
@@ -0,0 +1,74 @@
+import io
+
+import pandas as pd
+import pytest
+
+from app.utils.input_formats import (
+    ARROW,
+    ARROW_STREAM,
+    CSV,
+    JSONL,
+    PARQUET,
+    UnsupportedFormatError,
+    detect_format,
+    read_input_chunks,
+    sniff_format,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"id": range(10), "account": list("ABABABABAB")})
+
+
+def _encode(df, format):
+    pa = pytest.importorskip("pyarrow")
+    buffer = io.BytesIO()
+    if format == CSV:
+        buffer.write(df.to_csv(index=False).encode())
+    elif format == JSONL:
+        buffer.write(df.to_json(orient="records", lines=True).encode())
+    elif format == PARQUET:
+        df.to_parquet(buffer, row_group_size=3)
+    elif format == ARROW:
+        df.to_feather(buffer)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_stream(buffer, table.schema) as writer:
+            writer.write_table(table, max_chunksize=3)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("format", [CSV, JSONL, PARQUET, ARROW, ARROW_STREAM])
+def test_read_input_chunks_detects_format(df, format):
+    buffer = _encode(df, format)
+
+    assert detect_format(buffer) == format
+    assert buffer.tell() == 0
+    result = pd.concat(read_input_chunks(buffer, chunksize=4), ignore_index=True)
+    assert list(result["id"]) == list(range(10))
+    assert list(result["account"]) == list(df["account"])
+
+
+def test_read_input_chunks_memory_maps_arrow_files(df, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "ledger.arrow"
+    df.to_feather(path)
+
+    chunks = list(read_input_chunks(path))
+
+    assert len(chunks) == 1
+    assert list(chunks[0]["id"]) == list(range(10))
+
+
+def test_sniff_format_rejects_binary_and_empty_input():
+    with pytest.raises(UnsupportedFormatError):
+        sniff_format(b"PK\x03\x04\x14\x00\x00\x00\xff\xfe")
+    with pytest.raises(UnsupportedFormatError):
+        sniff_format(b"  \n")
+
+
+def test_sniff_format_distinguishes_json_lines_from_csv():
+    assert sniff_format(b'{"id": 1}\n{"id": 2}\n') == JSONL
+    assert sniff_format(b"id,memo\n1,{not json}\n") == CSV
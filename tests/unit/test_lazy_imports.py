@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def loaded_after(statement):
+    probe = (
+        f"import sys; {statement}; "
+        "print(','.join(n for n in ('pandas', 'numpy', 'passlib', 'jose') if n in sys.modules))"
+    )
+    return subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.mark.parametrize("statement", ["import app.main", "from app.utils import get_temp_dir"])
+def test_startup_does_not_load_heavy_packages(statement):
+    assert loaded_after(statement) == ""
+
+
+def test_utils_names_load_on_first_access():
+    assert loaded_after("from app.utils import process_dataframe") == "pandas,numpy"
@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.middleware.metrics import UNMATCHED_ROUTE, MetricsMiddleware, RouteTemplates
+
+ROOT = Path(__file__).resolve().parents[2]
+
+WORKER = """
+import asyncio
+from app.middleware.metrics import MetricsMiddleware
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+class Routes:
+    routes = []
+
+async def main():
+    middleware = MetricsMiddleware(app)
+    scope = {"type": "http", "method": "GET", "path": "/", "app": Routes()}
+    for _ in range({requests}):
+        await middleware(scope, None, lambda message: asyncio.sleep(0))
+
+asyncio.run(main())
+"""
+
+
+def make_app():
+    items = APIRouter()
+
+    @items.get("/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    @items.post("/")
+    async def create_item():
+        return {"created": True}
+
+    api = APIRouter()
+    api.include_router(items, prefix="/items")
+    app = FastAPI()
+    app.include_router(api, prefix="/api")
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_route_templates_include_router_prefixes():
+    templates = RouteTemplates(make_app().routes)
+
+    assert templates.resolve("GET", "/api/items/42") == "/api/items/{item_id}"
+    assert templates.resolve("POST", "/api/items/") == "/api/items/"
+    # Method not allowed is still attributed to the route
+    assert templates.resolve("DELETE", "/api/items/42") == "/api/items/{item_id}"
+    assert templates.resolve("GET", "/api/other") == UNMATCHED_ROUTE
+
+
+def test_middleware_records_requests_per_route():
+    client = TestClient(make_app())
+    route = "/api/items/{item_id}"
+    requests = sample("http_requests_total", method="GET", route=route, status="200")
+    latency = sample("http_request_duration_seconds_count", method="GET", route=route)
+    size = sample("http_response_size_bytes_sum", method="GET", route=route)
+    missing = sample("http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    for item_id in (1, 2, 3):
+        assert client.get(f"/api/items/{item_id}").status_code == 200
+    assert client.get("/api/missing").status_code == 404
+
+    assert sample(
+        "http_requests_total", method="GET", route=route, status="200"
+    ) == requests + 3
+    assert sample(
+        "http_request_duration_seconds_count", method="GET", route=route
+    ) == latency + 3
+    assert sample(
+        "http_response_size_bytes_sum", method="GET", route=route
+    ) == size + 3 * len(b'{"id":1}')
+    assert sample(
+        "http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404"
+    ) == missing + 1
+    assert sample("http_requests_in_progress", method="GET", route=route) == 0
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER.replace("{requests}", str(requests))],
+            cwd=ROOT,
+            env=env,
+        )
+        for requests in (3, 4)
+    ]
+    assert [worker.wait() for worker in workers] == [0, 0]
+
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from app.middleware.metrics import render_metrics; "
+            "print(render_metrics()[0].decode())",
+        ],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="200"} 7.0' in output
+    assert 'http_requests_in_progress{method="GET",route="<unmatched>"} 0.0' in output
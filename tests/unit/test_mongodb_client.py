@@ -0,0 +1,54 @@
+import importlib.util
+
+from app.core.config import Settings
+from app.db.mongodb import (
+    available_compressors,
+    close_mongodb,
+    create_mongodb_client,
+    get_mongodb_client,
+)
+
+
+def test_available_compressors_keeps_order_and_skips_missing_modules():
+    installed = [
+        name for name, module in [("zstd", "zstandard"), ("snappy", "snappy")]
+        if importlib.util.find_spec(module) is not None
+    ]
+
+    assert available_compressors(["zstd", "snappy", "zlib"]) == installed + ["zlib"]
+    assert available_compressors(["zlib", "unknown"]) == ["zlib"]
+    assert available_compressors([]) == []
+
+
+def test_create_mongodb_client_applies_settings():
+    settings = Settings(
+        MONGODB_MAX_POOL_SIZE=20,
+        MONGODB_MIN_POOL_SIZE=2,
+        MONGODB_WAIT_QUEUE_TIMEOUT_MS=1500,
+        MONGODB_SERVER_SELECTION_TIMEOUT_MS=2500,
+        MONGODB_COMPRESSORS=["zlib"],
+        MONGODB_ZLIB_COMPRESSION_LEVEL=3,
+    )
+    client = create_mongodb_client(settings)
+    try:
+        options = client.options
+        assert options.pool_options.max_pool_size == 20
+        assert options.pool_options.min_pool_size == 2
+        assert options.pool_options.wait_queue_timeout == 1.5
+        assert options.server_selection_timeout == 2.5
+        compression = options.pool_options._compression_settings
+        assert compression.compressors == ["zlib"]
+        assert compression.zlib_compression_level == 3
+    finally:
+        client.close()
+
+
+def test_close_mongodb_replaces_the_closed_client():
+    client = get_mongodb_client()
+    assert get_mongodb_client() is client
+
+    close_mongodb()
+    reopened = get_mongodb_client()
+    close_mongodb()
+
+    assert reopened is not client
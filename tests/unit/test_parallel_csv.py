@@ -0,0 +1,127 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_analysis import DataAnalysisService
+from app.utils.parallel_csv import (
+    ColumnStats,
+    ParallelCSVReader,
+    read_csv_parallel,
+    split_byte_ranges,
+)
+from app.utils.pipeline import Dedupe, FillNA, Filter, Pipeline, default_pipeline
+from app.utils.process_pool import ProcessPool
+
+
+@pytest.fixture
+def csv_bytes():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": rng.integers(0, 500, 5_000),
+        "amount": rng.choice([1.5, np.nan, 2.25, 10.0], 5_000),
+        "note": rng.choice(["plain", 'says "hi",\nthen leaves', "a,b"], 5_000),
+    })
+    return df.to_csv(index=False).encode()
+
+
+def test_split_byte_ranges_ends_on_records_outside_quotes():
+    data = b'id,note\n1,"x\ny\nz"\n2,plain\n3,"\n\n"\n4,"a ""quoted"" b"\n'
+
+    for num_ranges in range(1, 12):
+        header_end, ranges = split_byte_ranges(data, num_ranges)
+
+        assert data[:header_end] == b"id,note\n"
+        assert ranges[0][0] == header_end and ranges[-1][1] == len(data)
+        parsed = [pd.read_csv(io.BytesIO(data[:header_end] + data[s:e])) for s, e in ranges]
+        pd.testing.assert_frame_equal(
+            pd.concat(parsed, ignore_index=True), pd.read_csv(io.BytesIO(data))
+        )
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_read_csv_parallel_matches_sequential_pipeline(csv_bytes, processes):
+    expected = default_pipeline().run(pd.read_csv(io.BytesIO(csv_bytes)))
+
+    df, stats = read_csv_parallel(io.BytesIO(csv_bytes), processes=processes, num_ranges=9)
+
+    pd.testing.assert_frame_equal(df, expected.reset_index(drop=True))
+    assert stats["amount"].count == len(df)
+    assert stats["amount"].mean == pytest.approx(expected["amount"].mean())
+    assert stats["amount"].std == pytest.approx(expected["amount"].std())
+    assert stats["id"].min == expected["id"].min()
+    assert stats["id"].max == expected["id"].max()
+
+
+def test_read_csv_parallel_reads_paths(tmp_path, csv_bytes):
+    path = tmp_path / "data.csv"
+    path.write_bytes(csv_bytes)
+    pipeline = Pipeline([Dedupe(subset=["id"]), Filter("id > 100"), FillNA(-1)])
+    expected = pipeline.run(pd.read_csv(path)).reset_index(drop=True)
+
+    df, _ = read_csv_parallel(path, processes=2, num_ranges=5, pipeline=pipeline)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_parallel_reader_requires_dedupe_first():
+    with pytest.raises(ValueError):
+        ParallelCSVReader(io.BytesIO(b"a\n1\n"), processes=2, pipeline=Pipeline([
+            Filter("a > 0"), Dedupe(),
+        ]))
+
+
+def test_column_stats_merge_matches_whole_column():
+    values = pd.Series(np.random.default_rng(1).normal(5, 2, 1_001))
+
+    merged = ColumnStats()
+    for start in range(0, len(values), 150):
+        part = values.iloc[start:start + 150]
+        merged = merged.merge(ColumnStats.from_series(part))
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std == pytest.approx(values.std())
+
+
+def test_service_describes_parallel_load_like_sequential(csv_bytes):
+    parallel = DataAnalysisService(1_000, 10_000, parallel_workers=2, parallel_min_bytes=0)
+    sequential = DataAnalysisService(1_000, 10_000, parallel_workers=1)
+
+    result = parallel.analyze_csv(io.BytesIO(csv_bytes))
+    expected = sequential.analyze_csv(io.BytesIO(csv_bytes))
+
+    assert result["row_count"] == expected["row_count"]
+    for column, summary in expected["summary_stats"].items():
+        assert result["summary_stats"][column] == pytest.approx(summary)
+
+
+def test_read_csv_parallel_uses_shared_pool(csv_bytes):
+    pool = ProcessPool(2)
+    try:
+        first, _ = read_csv_parallel(
+            io.BytesIO(csv_bytes), processes=2, num_ranges=4, executor=pool
+        )
+        second, _ = read_csv_parallel(
+            io.BytesIO(csv_bytes), processes=2, num_ranges=4, executor=pool
+        )
+    finally:
+        pool.shutdown()
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_service_summary_skips_columns_numeric_in_some_ranges():
+    # Equal-length records, so the byte ranges split between numeric and text codes
+    numeric = [f"{i:03d},{1000 + i}\n" for i in range(51)]
+    text = [f"{i:03d},c{100 + i}\n" for i in range(51, 100)]
+    data = ("id,code\n" + "".join(numeric + text)).encode()
+    service = DataAnalysisService(1_000, 10_000)
+    reader = ParallelCSVReader(io.BytesIO(data), processes=1, num_ranges=2)
+    df = pd.concat(list(reader), ignore_index=True)
+
+    result = service.describe(df, reader.stats)
+
+    assert "code" in reader.stats
+    assert list(result["summary_stats"]) == ["id"]
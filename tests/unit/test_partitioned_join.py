@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.data_processing import merge_csv_files
+from app.utils.partitioned_join import partitioned_merge
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    rng = np.random.default_rng(0)
+    left = pd.DataFrame({
+        "account": rng.integers(0, 50, 400),
+        "entity": rng.choice(["E1", "E2"], 400),
+        "amount": rng.random(400).round(4),
+    })
+    right = pd.DataFrame({
+        "account": np.arange(0, 60, 2),
+        "name": [f"Account {i}" for i in range(0, 60, 2)],
+    })
+    left_path, right_path = tmp_path / "left.csv", tmp_path / "right.csv"
+    left.to_csv(left_path, index=False)
+    right.to_csv(right_path, index=False)
+    return left, right, left_path, right_path
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_partitioned_merge_matches_pd_merge(inputs, tmp_path, how):
+    left, right, left_path, right_path = inputs
+    output_path = tmp_path / "out" / "joined.csv"
+
+    rows = partitioned_merge(
+        left_path, right_path, "account", output_path,
+        how=how, num_partitions=7, chunksize=64, spill_dir=tmp_path,
+    )
+
+    expected = pd.merge(left, right, on="account", how=how)
+    result = pd.read_csv(output_path)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(_sorted(result), _sorted(expected), check_dtype=False)
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith("join-")] == []
+
+
+def test_merge_csv_files_with_process_pool(inputs, tmp_path):
+    left, right, left_path, right_path = inputs
+    output_path = tmp_path / "joined.csv"
+
+    rows = merge_csv_files(
+        left_path, right_path, ["account"], output_path, num_partitions=4, processes=2
+    )
+
+    expected = pd.merge(left, right, on="account")
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(
+        _sorted(pd.read_csv(output_path)), _sorted(expected), check_dtype=False
+    )
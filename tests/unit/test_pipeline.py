@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.data_processing import process_dataframe
+from app.utils.filter_expression import FilterExpressionError
+from app.utils.pipeline import (
+    Cast,
+    Dedupe,
+    Derive,
+    FillNA,
+    Filter,
+    Pipeline,
+    PipelineError,
+    Rename,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "id": [1, 2, 1, 3, 4],
+        "amount": [10.5, np.nan, 10.5, 7.25, np.nan],
+        "account": ["A", "B", "A", None, "B"],
+    })
+
+
+def test_process_dataframe_matches_drop_duplicates_then_fillna(df):
+    pd.testing.assert_frame_equal(process_dataframe(df), df.drop_duplicates().fillna(0))
+
+
+def test_pipeline_leaves_input_unchanged(df):
+    original = df.copy()
+
+    Pipeline([FillNA(0), Cast({"id": "int32"}), Rename({"id": "key"})]).run(df)
+
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_pipeline_runs_all_stage_kinds(df):
+    pipeline = Pipeline([
+        Dedupe(),
+        FillNA(0),
+        Filter("amount > 0"),
+        Derive("amount_cents", "amount * 100"),
+        Cast({"amount_cents": "int64"}),
+        Rename({"amount_cents": "cents"}),
+    ])
+
+    result = pipeline.run(df)
+
+    assert list(result.columns) == ["id", "amount", "account", "cents"]
+    assert list(result["id"]) == [1, 3]
+    assert list(result["cents"]) == [1050, 725]
+    assert result["cents"].dtype == np.int64
+
+
+def test_dedupe_spans_chunks_and_ignores_filtered_rows(df):
+    pipeline = Pipeline([Filter("id != 2"), Dedupe(subset=["account"])])
+
+    chunks = list(pipeline.run_chunks([df.iloc[:2], df.iloc[2:]]))
+
+    # Row 2 (account B) is filtered out, so row 5 is the first B seen
+    assert [list(chunk["id"]) for chunk in chunks] == [[1], [3, 4]]
+
+
+def test_column_stages_skip_filtered_rows(df):
+    pipeline = Pipeline([Filter("amount is not null"), Cast({"amount": "int64"})])
+
+    result = pipeline.run(df)
+
+    assert list(result["id"]) == [1, 1, 3]
+    assert list(result["amount"]) == [10, 10, 7]
+
+
+def test_plan_fuses_adjacent_stages():
+    pipeline = Pipeline([
+        Filter("id > 1"),
+        Filter("amount < 10"),
+        FillNA(0, columns=["amount"]),
+        FillNA(""),
+        Cast({"id": "int32"}),
+        Cast({"amount": "float32"}),
+        Rename({"id": "key"}),
+        Rename({"key": "row_id", "amount": "value"}),
+    ])
+
+    plan = pipeline.plan()
+
+    assert [type(stage) for stage in plan] == [Filter, FillNA, Cast, Rename]
+    assert plan[0].expression == "(id > 1) and (amount < 10)"
+    assert plan[1].values == {"amount": 0} and plan[1].default == ""
+    assert plan[2].dtypes == {"id": "int32", "amount": "float32"}
+    assert plan[3].mapping == {"id": "row_id", "amount": "value"}
+
+
+def test_plan_keeps_repeated_casts_of_one_column():
+    plan = Pipeline([Cast({"amount": "int64"}), Cast({"amount": "float64"})]).plan()
+
+    assert len(plan) == 2
+
+
+def test_fused_fillna_keeps_first_value(df):
+    result = Pipeline([FillNA(-1, columns=["amount"]), FillNA(0)]).run(df)
+
+    assert list(result["amount"]) == [10.5, -1.0, 10.5, 7.25, -1.0]
+    assert result["account"].tolist() == ["A", "B", "A", 0, "B"]
+
+
+def test_pipeline_copies_only_changed_columns(df):
+    df = df.fillna({"account": "?"})
+
+    result = Pipeline([FillNA(0), Rename({"id": "key"})]).run(df)
+
+    assert np.shares_memory(result["key"].to_numpy(), df["id"].to_numpy())
+    assert not np.shares_memory(result["amount"].to_numpy(), df["amount"].to_numpy())
+
+
+def test_then_returns_new_pipeline():
+    base = Pipeline([Dedupe()])
+
+    extended = base.then(FillNA(0))
+
+    assert len(base.stages) == 1
+    assert len(extended.stages) == 2
+
+
+def test_invalid_stages_raise():
+    with pytest.raises(FilterExpressionError):
+        Filter("amount >")
+    with pytest.raises(PipelineError):
+        Pipeline([Cast({"missing": "int64"})]).run(pd.DataFrame({"id": [1]}))
+    with pytest.raises(PipelineError):
+        Pipeline([Cast({"id": "int64"})]).run(pd.DataFrame({"id": ["x"]}))
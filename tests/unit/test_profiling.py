@@ -0,0 +1,105 @@
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import profiles
+from app.core.config import settings
+from app.middleware.profiling import (
+    PROFILE_SUFFIX,
+    ProfilingMiddleware,
+    remove_old_profiles,
+)
+from app.utils.profiling import SamplingProfiler
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_app(output_dir, allowed_hosts=("testclient",)):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        # Work in worker threads is sampled as well
+        await asyncio.to_thread(busy_work, 0.05)
+        return {"ok": True}
+
+    app.include_router(profiles.router, prefix="/profiles")
+    app.add_middleware(
+        ProfilingMiddleware,
+        allowed_hosts=allowed_hosts,
+        output_dir=output_dir,
+        interval=0.001,
+        max_files=2,
+    )
+    return app
+
+
+def test_sampling_profiler_writes_speedscope_profiles(tmp_path):
+    profiler = SamplingProfiler(0.001)
+    profiler.start()
+    busy_work(0.05)
+    profiler.stop()
+    profiler.write(tmp_path / "profile.json", "busy work")
+
+    document = json.loads((tmp_path / "profile.json").read_text())
+    frame_names = [frame["name"] for frame in document["shared"]["frames"]]
+    main = next(profile for profile in document["profiles"] if profile["name"] == "MainThread")
+    busy = frame_names.index("busy_work")
+
+    assert document["name"] == "busy work"
+    assert main["type"] == "sampled"
+    assert len(main["samples"]) == len(main["weights"])
+    assert sum(weight for stack, weight in zip(main["samples"], main["weights"])
+               if busy in stack) > 0.01
+    assert profiler.duration >= 0.05
+
+
+def test_middleware_profiles_flagged_requests_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiles, "get_profiles_dir", lambda: tmp_path)
+    monkeypatch.setattr(settings, "PROFILING_ALLOWED_HOSTS", ["testclient"])
+    client = TestClient(make_app(tmp_path))
+
+    assert "x-profile-url" not in client.get("/slow").headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get("/slow", headers={"X-Profile": "1"})
+    url = response.headers["x-profile-url"]
+    assert url.startswith("http://testserver/profiles/") and url.endswith(PROFILE_SUFFIX)
+
+    download = client.get(url)
+    assert download.status_code == 200
+    frame_names = [frame["name"] for frame in download.json()["shared"]["frames"]]
+    assert "busy_work" in frame_names
+
+    assert "x-profile-url" in client.get("/slow?profile=1").headers
+    assert client.get("/profiles/../../etc/passwd").status_code == 404
+
+
+def test_middleware_ignores_hosts_outside_allowlist(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiles, "get_profiles_dir", lambda: tmp_path)
+    client = TestClient(make_app(tmp_path, allowed_hosts=["10.0.0.1"]))
+
+    response = client.get("/slow", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert "x-profile-url" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+    # Profiles are not served outside the allowlist either
+    assert client.get(f"/profiles/20240101-000000-0123abcd{PROFILE_SUFFIX}").status_code == 403
+
+
+def test_remove_old_profiles_keeps_newest(tmp_path):
+    names = [f"2024010{day}-000000-0123abcd{PROFILE_SUFFIX}" for day in range(1, 5)]
+    for name in names:
+        (tmp_path / name).write_text("{}")
+
+    remove_old_profiles(tmp_path, 2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == names[2:]
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.db.instrumentation import (
+    MAX_STATEMENT_LENGTH,
+    MongoCommandListener,
+    SlowQueryLog,
+    current_request_stats,
+    instrument_engine,
+    start_request_stats,
+    stop_request_stats,
+)
+from app.middleware.query_timing import QueryTimingMiddleware
+
+
+def make_engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    return engine
+
+
+def test_slow_query_log_threshold_and_sampling(caplog):
+    samples = iter([0.05, 0.5])
+    log = SlowQueryLog(0.1, 0.2, sample=lambda: next(samples))
+    statements = []
+
+    def statement():
+        statements.append(1)
+        return "SELECT *\n  FROM users " + "x" * MAX_STATEMENT_LENGTH
+
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        assert not log.observe("postgres", statement, 0.05)
+        assert log.observe("postgres", statement, 0.25)
+        assert not log.observe("postgres", statement, 0.25)
+
+    # The statement is only built for logged queries
+    assert len(statements) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Slow postgres query (250.0 ms): SELECT * FROM users x")
+    assert message.endswith("...")
+
+
+def test_engine_statements_are_recorded_per_request():
+    engine = make_engine()
+    token = start_request_stats()
+    try:
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        stats = current_request_stats()
+    finally:
+        stop_request_stats(token)
+
+    assert stats.counts == {"postgres": 3}
+    assert stats.seconds["postgres"] > 0
+    assert current_request_stats() is None
+
+
+def test_mongo_listener_records_commands():
+    listener = MongoCommandListener()
+    token = start_request_stats()
+    try:
+        for request_id, name in enumerate(["find", "insert"]):
+            listener.started(SimpleNamespace(
+                command={name: "logs", "filter": {}}, command_name=name, request_id=request_id
+            ))
+        listener.succeeded(SimpleNamespace(
+            command_name="find", database_name="app", request_id=0, duration_micros=1500
+        ))
+        listener.failed(SimpleNamespace(
+            command_name="insert", database_name="app", request_id=1, duration_micros=500
+        ))
+        stats = current_request_stats()
+    finally:
+        stop_request_stats(token)
+
+    assert stats.counts == {"mongodb": 2}
+    assert stats.seconds["mongodb"] == 0.002
+    assert listener._collections == {}
+
+
+def test_middleware_adds_server_timing_and_warns_on_many_queries(caplog):
+    engine = make_engine()
+
+    def run_queries(count):
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("SELECT 1"))
+
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(count: int = 1):
+        # Queries in worker threads are attributed to the request
+        await asyncio.to_thread(run_queries, count)
+        return {"ok": True}
+
+    app.add_middleware(QueryTimingMiddleware, server_timing=True, query_count_warning=3)
+    client = TestClient(app)
+
+    with caplog.at_level(logging.WARNING, logger="app.middleware.query_timing"):
+        single = client.get("/items").headers["server-timing"]
+        many = client.get("/items", params={"count": 4}).headers["server-timing"]
+
+    assert single.startswith("postgres;dur=")
+    assert 'desc="1 query", total;dur=' in single
+    assert 'desc="4 queries", total;dur=' in many
+    assert [record.getMessage() for record in caplog.records] == [
+        "GET /items issued 4 database queries: {'postgres': 4}"
+    ]
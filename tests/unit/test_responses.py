@@ -0,0 +1,93 @@
+import datetime
+import decimal
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+from bson import ObjectId
+from fastapi import APIRouter, FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.responses import ORJSONResponse, ORJSONRoute, dumps
+from app.models.document import LogEntry
+
+
+def test_dumps_converts_data_layer_types():
+    object_id = ObjectId()
+    content = {
+        "id": object_id,
+        "at": pd.Timestamp("2024-01-02 03:04:05"),
+        "missing_at": pd.NaT,
+        "mean": np.float64("nan"),
+        "count": np.int64(3),
+        "half": np.float16(0.5),
+        "values": np.array([1.5, 2.5]),
+        "ratio": float("inf"),
+        "amount": decimal.Decimal("1.25"),
+        "whole": decimal.Decimal("4"),
+        "took": datetime.timedelta(seconds=1.5),
+        "tags": {"a"},
+        1: "non-string key",
+    }
+
+    assert orjson.loads(dumps(content)) == {
+        "id": str(object_id),
+        "at": "2024-01-02T03:04:05",
+        "missing_at": None,
+        "mean": None,
+        "count": 3,
+        "half": 0.5,
+        "values": [1.5, 2.5],
+        "ratio": None,
+        "amount": 1.25,
+        "whole": 4,
+        "took": 1.5,
+        "tags": ["a"],
+        "1": "non-string key",
+    }
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_orjson_route_keeps_model_fast_path_and_explicit_classes():
+    router = APIRouter(route_class=ORJSONRoute)
+    log = LogEntry(
+        _id=str(ObjectId()),
+        level="INFO",
+        message="started",
+        service="api",
+        created_at=datetime.datetime(2024, 1, 2, 3, 4, 5),
+    )
+
+    @router.get("/model", response_model=LogEntry)
+    async def model_route():
+        return log
+
+    @router.get("/dict")
+    async def dict_route():
+        return {"mean": float("nan"), "at": datetime.datetime(2024, 1, 2)}
+
+    @router.get("/text", response_class=PlainTextResponse)
+    async def text_route():
+        return "ok"
+
+    routes = {route.path: route for route in router.routes}
+
+    assert isinstance(routes["/model"].response_class, DefaultPlaceholder)
+    assert routes["/dict"].response_class.value is ORJSONResponse
+    assert routes["/text"].response_class is PlainTextResponse
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    body = client.get("/model").json()
+    assert body["_id"] == log.id
+    assert body["created_at"] == "2024-01-02T03:04:05"
+    assert client.get("/dict").json() == {"mean": None, "at": "2024-01-02T00:00:00"}
+    assert client.get("/text").text == "ok"
@@ -0,0 +1,90 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.sampling import confidence_intervals, reservoir_sample, sample_csv
+
+
+@pytest.fixture
+def csv_bytes():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": np.arange(50_000),
+        "amount": rng.normal(100, 15, 50_000).round(2),
+    })
+    return df.to_csv(index=False).encode()
+
+
+class UnseekableBytesIO(io.BytesIO):
+    def seekable(self):
+        return False
+
+
+def test_sample_csv_by_byte_offset(csv_bytes):
+    sample, sampling = sample_csv(io.BytesIO(csv_bytes), 1_000, seed=1)
+
+    assert sampling["method"] == "byte_offset"
+    assert 900 < len(sample) <= 1_000
+    assert sample["id"].is_unique
+    assert abs(sampling["estimated_row_count"] - 50_000) < 2_500
+    expected_fraction = len(sample) / sampling["estimated_row_count"]
+    assert sampling["sampling_fraction"] == pytest.approx(expected_fraction)
+
+
+def test_sample_csv_by_reservoir_for_unseekable_source(csv_bytes):
+    sample, sampling = sample_csv(UnseekableBytesIO(csv_bytes), 1_000, seed=1, chunksize=7_000)
+
+    assert sampling["method"] == "reservoir"
+    assert len(sample) == 1_000
+    assert sample["id"].is_unique
+    assert sampling["estimated_row_count"] == 50_000
+    # A uniform sample spreads over the whole file, not just its first chunk
+    assert sample["id"].max() > 40_000
+
+
+def test_sample_csv_falls_back_to_reservoir_for_multiline_fields():
+    rows = [
+        f'{i},"part one\npart two",{i % 100}.5\n' if i % 10 == 0
+        else f"{i},plain,{i % 100}.5\n"
+        for i in range(50_000)
+    ]
+    data = ("id,memo,amount\n" + "".join(rows)).encode()
+
+    for seed in range(5):
+        sample, sampling = sample_csv(io.BytesIO(data), 1_000, seed=seed)
+
+        assert sampling["method"] == "reservoir"
+        assert sampling["estimated_row_count"] == 50_000
+        assert sample["id"].dtype == np.int64
+        assert sample["amount"].notna().all()
+
+
+def test_sample_csv_reads_small_files_whole():
+    sample, sampling = sample_csv(io.BytesIO(b"a,b\n1,2\n3,4\n"), 100, seed=1)
+
+    assert sampling["method"] == "full"
+    assert sampling["sampling_fraction"] == 1.0
+    assert list(sample["a"]) == [1, 3]
+
+
+def test_reservoir_sample_keeps_dtypes():
+    chunks = [pd.DataFrame({"n": [i, i + 1], "s": ["x", "y"]}) for i in range(0, 20, 2)]
+
+    sample, seen = reservoir_sample(chunks, 5, np.random.default_rng(0))
+
+    assert seen == 20
+    assert len(sample) == 5
+    assert sample["n"].dtype == np.int64
+
+
+def test_confidence_intervals_cover_mean_and_collapse_for_full_population():
+    df = pd.DataFrame({"amount": [1.0, 2.0, 3.0, 4.0], "name": list("abcd")})
+
+    partial = confidence_intervals(df, population_size=1_000)
+    full = confidence_intervals(df, population_size=4)
+
+    assert set(partial) == {"amount"}
+    assert partial["amount"]["lower"] < 2.5 < partial["amount"]["upper"]
+    assert full["amount"]["lower"] == full["amount"]["upper"] == 2.5
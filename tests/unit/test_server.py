@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from app.core.config import Settings
+from app.core.server import (
+    available_cpus,
+    cgroup_cpu_limit,
+    configure_metrics_dir,
+    default_workers,
+    production_options,
+)
+
+
+@pytest.fixture
+def affinity():
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+
+
+def test_cgroup_v2_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+
+    assert cgroup_cpu_limit(tmp_path) == 2.5
+
+
+def test_cgroup_v2_unlimited(tmp_path):
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+
+    assert cgroup_cpu_limit(tmp_path) == 0.5
+    assert available_cpus(tmp_path) == 1
+
+
+def test_available_cpus_without_cgroup_uses_affinity(tmp_path, affinity):
+    assert available_cpus(tmp_path) == affinity
+
+
+def test_web_concurrency_overrides_detection(tmp_path, monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "6")
+
+    assert default_workers(tmp_path) == 6
+
+
+def test_production_options():
+    options = production_options(Settings(SERVER_MAX_REQUESTS=0), workers=3)
+
+    assert options["workers"] == 3
+    assert options["limit_max_requests"] is None
+    assert options["timeout_keep_alive"] == 75
+    assert options["loop"] in ("uvloop", "asyncio")
+
+
+def test_configure_metrics_dir_clears_values_of_earlier_runs(tmp_path, monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    metrics_dir = tmp_path / "metrics"
+    metrics_dir.mkdir()
+    (metrics_dir / "counter_123.db").write_bytes(b"stale")
+
+    path = configure_metrics_dir(Settings(METRICS_MULTIPROC_DIR=str(metrics_dir)))
+
+    assert path == metrics_dir
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(metrics_dir)
+    assert list(metrics_dir.iterdir()) == []
+
+
+def test_configure_metrics_dir_disabled(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    assert configure_metrics_dir(Settings(METRICS_ENABLED=False)) is None
+    assert "PROMETHEUS_MULTIPROC_DIR" not in os.environ
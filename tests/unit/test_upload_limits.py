@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+
+from app.middleware.uploads import (
+    UploadBudget,
+    UploadLimitMiddleware,
+    remove_stale_temp_files,
+    upload_spooling,
+)
+
+
+def _create_app(max_request_bytes=1_000, budget_bytes=10_000):
+    app = FastAPI()
+    app.add_middleware(
+        UploadLimitMiddleware,
+        max_request_bytes=max_request_bytes,
+        budget_bytes=budget_bytes,
+    )
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return app
+
+
+def test_upload_within_limits_is_processed():
+    client = TestClient(_create_app())
+
+    response = client.post("/upload", files={"file": ("a.csv", b"x" * 10)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 10}
+
+
+def test_upload_over_request_limit_is_rejected():
+    client = TestClient(_create_app(max_request_bytes=1_000))
+
+    response = client.post("/upload", files={"file": ("a.csv", b"x" * 5_000)})
+
+    assert response.status_code == 413
+
+
+def test_upload_body_larger_than_declared_is_rejected():
+    async def app(scope, receive, send):
+        # Read the whole body like a form parser, then fail on the disconnect
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        await send({"type": "http.response.start", "status": 400, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    chunks = [b"x" * 30, b"x" * 30, b"x" * 30]
+
+    async def receive():
+        return {"type": "http.request", "body": chunks.pop(), "more_body": bool(chunks)}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"transfer-encoding", b"chunked")]}
+    middleware = UploadLimitMiddleware(app, max_request_bytes=50, budget_bytes=1_000)
+    asyncio.run(middleware(scope, receive, send))
+
+    assert messages[0]["status"] == 413
+    assert len(messages) == 2
+    assert middleware.budget.in_use_bytes == 0
+
+
+def test_upload_over_budget_is_rejected_with_429():
+    async def app(scope, receive, send):
+        raise AssertionError("application must not be called")
+
+    middleware = UploadLimitMiddleware(app, max_request_bytes=100, budget_bytes=150)
+    middleware.budget.try_acquire(100)
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"content-length", b"80")]}
+    asyncio.run(middleware(scope, None, send))
+
+    assert messages[0]["status"] == 429
+    assert (b"retry-after", b"1") in messages[0]["headers"]
+    assert middleware.budget.in_use_bytes == 100
+
+
+def test_upload_budget_acquire_and_release():
+    budget = UploadBudget(10)
+
+    assert budget.try_acquire(6)
+    assert not budget.try_acquire(5)
+    budget.release(6)
+    assert budget.try_acquire(10)
+    assert budget.in_use_bytes == 10
+
+
+def test_remove_stale_temp_files(tmp_path):
+    stale_file = tmp_path / "stale.tmp"
+    stale_dir = tmp_path / "dedupe-stale"
+    active_dir = tmp_path / "dedupe-active"
+    fresh_file = tmp_path / "fresh.tmp"
+    stale_file.write_bytes(b"x")
+    for directory in (stale_dir, active_dir):
+        directory.mkdir()
+        (directory / "run-00000.npy").write_bytes(b"x")
+    # Another worker is still adding runs to this directory
+    (active_dir / "run-00001.npy").write_bytes(b"x")
+    fresh_file.write_bytes(b"x")
+    old = time.time() - 3600
+    for path in (
+        stale_file, stale_dir / "run-00000.npy", stale_dir,
+        active_dir / "run-00000.npy", active_dir,
+    ):
+        os.utime(path, (old, old))
+
+    removed = remove_stale_temp_files(tmp_path, max_age_seconds=60)
+
+    assert removed == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["dedupe-active", "fresh.tmp"]
+
+
+def test_upload_spooling_is_restored(tmp_path):
+    previous = (MultiPartParser.spool_max_size, tempfile.tempdir)
+
+    with upload_spooling(123, tmp_path / "spool"):
+        assert MultiPartParser.spool_max_size == 123
+        assert tempfile.gettempdir() == str(tmp_path / "spool")
+
+    assert (MultiPartParser.spool_max_size, tempfile.tempdir) == previous
+
+
+@pytest.mark.parametrize("header", [b"abc", b"-"])
+def test_invalid_content_length_is_rejected(header):
+    client = TestClient(_create_app())
+
+    response = client.post("/upload", content=b"", headers={"content-length": header.decode()})
+
+    assert response.status_code == 400